@@ -42,6 +42,25 @@ if (POSTGRES_HOSTNAME is None or
     POSTGRES_PASSWORD is None):
     raise ConfigurationException("Not all database parameters have been configured.")
 
+POSTGRES_POOL_ENABLED=getenv("POSTGRES_POOL_ENABLED") or "true"
+POSTGRES_POOL_MAX_CONNECTIONS=getenv("POSTGRES_POOL_MAX_CONNECTIONS") or "20"
+POSTGRES_POOL_STALE_TIMEOUT=getenv("POSTGRES_POOL_STALE_TIMEOUT") or "300"
+POSTGRES_POOL_TIMEOUT=getenv("POSTGRES_POOL_TIMEOUT") or "10"
+
+# Comma-separated host[:port] list, reads are served by the primary if empty
+POSTGRES_REPLICA_HOSTS=getenv("POSTGRES_REPLICA_HOSTS") or ""
+POSTGRES_REPLICA_MAX_LAG_SECONDS=getenv("POSTGRES_REPLICA_MAX_LAG_SECONDS") or "5"
+POSTGRES_REPLICA_CHECK_INTERVAL_SECONDS=getenv("POSTGRES_REPLICA_CHECK_INTERVAL_SECONDS") or "5"
+
+QUERY_REPEAT_WARNING_THRESHOLD=getenv("QUERY_REPEAT_WARNING_THRESHOLD") or "5"
+SLOW_QUERY_THRESHOLD_MS=getenv("SLOW_QUERY_THRESHOLD_MS") or "200"
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE=getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE") or "0.1"
+SLOW_QUERY_LOG_SIZE=getenv("SLOW_QUERY_LOG_SIZE") or "100"
+
+ASYNC_DATABASE_ENABLED=getenv("ASYNC_DATABASE_ENABLED") or "false"
+ASYNC_POSTGRES_POOL_MIN_SIZE=getenv("ASYNC_POSTGRES_POOL_MIN_SIZE") or "1"
+ASYNC_POSTGRES_POOL_MAX_SIZE=getenv("ASYNC_POSTGRES_POOL_MAX_SIZE") or "10"
+
 # Redis
 REDIS_HOSTNAME=getenv("REDIS_HOSTNAME")
 REDIS_PORT=getenv("REDIS_PORT")
@@ -52,6 +71,8 @@ if (REDIS_HOSTNAME is None or
     REDIS_PASSWORD is None):
     raise ConfigurationException("Redis password have not been configured.")
 
+REDIS_RECONNECT_MAX_DELAY_SECONDS=getenv("REDIS_RECONNECT_MAX_DELAY_SECONDS") or "30"
+
 # Jwt
 JWT_KEY=getenv("JWT_KEY")
 JWT_ACCESS_EXPIRE_MINUTES=getenv("JWT_ACCESS_EXPIRE_MINUTES")
@@ -59,12 +80,84 @@ JWT_REFRESH_EXPIRE_MINUTES=getenv("JWT_REFRESH_EXPIRE_MINUTES")
 JWT_ISSUER=getenv("JWT_ISSUER")
 JWT_AUDIENCE=getenv("JWT_AUDIENCE")
 JWT_ALGORITHM=getenv("JWT_ALGORITHM") or "HS256"
+JWT_KEYS_DIR=getenv("JWT_KEYS_DIR")
+JWT_ACTIVE_KID=getenv("JWT_ACTIVE_KID")
 
-if (JWT_KEY is None or
-    JWT_ACCESS_EXPIRE_MINUTES is None or
+if JWT_ALGORITHM.startswith("HS"):
+    if JWT_KEY is None:
+        raise ConfigurationException("JWT key has not been configured.")
+elif JWT_KEYS_DIR is None or JWT_ACTIVE_KID is None:
+    raise ConfigurationException(
+        "Asymmetric JWT algorithms require JWT_KEYS_DIR and JWT_ACTIVE_KID."
+    )
+
+if (JWT_ACCESS_EXPIRE_MINUTES is None or
     JWT_REFRESH_EXPIRE_MINUTES is None or
     JWT_ISSUER is None or
     JWT_AUDIENCE is None or
     JWT_ALGORITHM is None
     ):
     raise ConfigurationException("Not all JWT parameters have been configured.")
+
+# Token cache
+TOKEN_CACHE_MAX_SIZE=getenv("TOKEN_CACHE_MAX_SIZE") or "10000"
+TOKEN_CACHE_TTL_SECONDS=getenv("TOKEN_CACHE_TTL_SECONDS") or "60"
+TOKEN_BATCH_MAX_SIZE=getenv("TOKEN_BATCH_MAX_SIZE") or "500"
+
+# Account cache
+ACCOUNT_CACHE_TTL_SECONDS=getenv("ACCOUNT_CACHE_TTL_SECONDS") or "300"
+
+# Account termination, terminations missed by a worker are picked up within the interval
+TERMINATION_SYNC_INTERVAL_SECONDS=getenv("TERMINATION_SYNC_INTERVAL_SECONDS") or "30"
+
+# Roles, unknown roles are looked up in the database again after the TTL
+ROLE_MISSING_CACHE_TTL_SECONDS=getenv("ROLE_MISSING_CACHE_TTL_SECONDS") or "60"
+
+# Password hashing
+HASHING_POOL_WORKERS=getenv("HASHING_POOL_WORKERS") or "2"
+HASHING_QUEUE_SIZE=getenv("HASHING_QUEUE_SIZE") or "32"
+HASHING_ROUTE_LIMITS=getenv("HASHING_ROUTE_LIMITS") or "login:16,registration:8"
+HASHING_RETRY_AFTER_SECONDS=getenv("HASHING_RETRY_AFTER_SECONDS") or "1"
+PASSWORD_HASH_SCHEME=getenv("PASSWORD_HASH_SCHEME") or "bcrypt"
+BCRYPT_ROUNDS=getenv("BCRYPT_ROUNDS") or "12"
+ARGON2_TIME_COST=getenv("ARGON2_TIME_COST") or "2"
+ARGON2_MEMORY_COST=getenv("ARGON2_MEMORY_COST") or "102400"
+ARGON2_PARALLELISM=getenv("ARGON2_PARALLELISM") or "8"
+
+if PASSWORD_HASH_SCHEME not in ("bcrypt", "argon2"):
+    raise ConfigurationException("Password hash scheme must be either bcrypt or argon2.")
+
+# Cameras
+CAMERA_PAGE_SIZE=getenv("CAMERA_PAGE_SIZE") or "10"
+CAMERA_PAGE_MAX_SIZE=getenv("CAMERA_PAGE_MAX_SIZE") or "100"
+CAMERA_COUNT_CACHE_TTL_SECONDS=getenv("CAMERA_COUNT_CACHE_TTL_SECONDS") or "3600"
+READINGS_PAGE_SIZE=getenv("READINGS_PAGE_SIZE") or "1000"
+READINGS_PAGE_MAX_SIZE=getenv("READINGS_PAGE_MAX_SIZE") or "10000"
+READINGS_IMPORT_MAX_ROWS=getenv("READINGS_IMPORT_MAX_ROWS") or "100000"
+READINGS_MAX_CLOCK_SKEW_SECONDS=getenv("READINGS_MAX_CLOCK_SKEW_SECONDS") or "300"
+READINGS_MAX_AGE_DAYS=getenv("READINGS_MAX_AGE_DAYS") or "3650"
+SERIES_POINTS=getenv("SERIES_POINTS") or "1000"
+SERIES_MAX_POINTS=getenv("SERIES_MAX_POINTS") or "10000"
+
+# Anomaly detection
+ANOMALY_EWMA_ALPHA=getenv("ANOMALY_EWMA_ALPHA") or "0.1"
+ANOMALY_Z_THRESHOLD=getenv("ANOMALY_Z_THRESHOLD") or "4"
+ANOMALY_WARMUP_READINGS=getenv("ANOMALY_WARMUP_READINGS") or "30"
+ANOMALIES_PAGE_SIZE=getenv("ANOMALIES_PAGE_SIZE") or "100"
+ANOMALIES_PAGE_MAX_SIZE=getenv("ANOMALIES_PAGE_MAX_SIZE") or "1000"
+
+# Contamination analytics
+ANALYTICS_BUCKET_SECONDS=getenv("ANALYTICS_BUCKET_SECONDS") or "3600"
+ANALYTICS_MIN_BUCKET_SECONDS=getenv("ANALYTICS_MIN_BUCKET_SECONDS") or "60"
+ANALYTICS_MAX_BUCKET_SECONDS=getenv("ANALYTICS_MAX_BUCKET_SECONDS") or "31622400"
+ANALYTICS_MAX_BUCKETS=getenv("ANALYTICS_MAX_BUCKETS") or "2000"
+ANALYTICS_CACHE_SIZE=getenv("ANALYTICS_CACHE_SIZE") or "10000"
+ANALYTICS_CACHE_TTL_SECONDS=getenv("ANALYTICS_CACHE_TTL_SECONDS") or "600"
+
+# Login throttling
+LOGIN_THROTTLE_WINDOW_SECONDS=getenv("LOGIN_THROTTLE_WINDOW_SECONDS") or "300"
+LOGIN_THROTTLE_USERNAME_LIMIT=getenv("LOGIN_THROTTLE_USERNAME_LIMIT") or "10"
+LOGIN_THROTTLE_IP_LIMIT=getenv("LOGIN_THROTTLE_IP_LIMIT") or "50"
+
+# Metrics, only disable authentication when /metrics is not reachable from outside
+METRICS_AUTH_ENABLED=getenv("METRICS_AUTH_ENABLED") or "true"
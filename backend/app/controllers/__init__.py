@@ -2,11 +2,23 @@
 Initializes all controllers.
 """
 import logging
-from fastapi import FastAPI
-from .user import UserController
+from fastapi import FastAPI, Depends
+from fastapi.responses import PlainTextResponse
+from backend.app.config import ASYNC_DATABASE_ENABLED, METRICS_AUTH_ENABLED
+from backend.app.services.auth import AuthService
+from backend.app.utils.metrics.registry import REGISTRY
+from backend.app.utils.security.permissions import Permission
+from .user import (
+    UserController,
+    UserAdministrationController,
+    UserProfileController,
+    AsyncUserProfileController
+)
 from .auth import AuthController
-from .camera import CameraController
+from .camera import CameraController, AsyncCameraController, CameraReadingController
 from .storage import StorageController
+from .diagnostics import DiagnosticsController
+from .analytics import AnalyticsController
 
 def add_controllers(app: FastAPI):
     """Add all controllers to the app."""
@@ -18,8 +30,32 @@ def add_controllers(app: FastAPI):
         """
         return "healthy"
 
+    metrics_dependencies = []
+    if METRICS_AUTH_ENABLED == "true":
+        metrics_dependencies.append(Depends(AuthService.authorize(Permission.ADMIN)))
+
+    @app.get("/metrics", tags=["System"], response_class=PlainTextResponse,
+        dependencies=metrics_dependencies)
+    def metrics():
+        """
+        Exposes application metrics in the Prometheus text format.
+        Requires the admin permission unless METRICS_AUTH_ENABLED is "false".
+        """
+        return REGISTRY.render()
+
     logging.info("Adding controllers...")
     app.include_router(UserController.create_router())
+    app.include_router(UserAdministrationController.create_router())
     app.include_router(AuthController.create_router())
-    app.include_router(CameraController.create_router())
+
+    # Read-heavy routes can be served without occupying threadpool threads
+    if ASYNC_DATABASE_ENABLED == "true":
+        app.include_router(AsyncUserProfileController.create_router())
+        app.include_router(AsyncCameraController.create_router())
+    else:
+        app.include_router(UserProfileController.create_router())
+        app.include_router(CameraController.create_router())
+    app.include_router(CameraReadingController.create_router())
+    app.include_router(AnalyticsController.create_router())
     app.include_router(StorageController.create_router())
+    app.include_router(DiagnosticsController.create_router())
@@ -0,0 +1,32 @@
+"""
+Controller for statistics of contamination readings.
+"""
+import logging
+from datetime import datetime
+from typing import Annotated
+from fastapi_controllers import Controller, get
+from fastapi import Depends
+from backend.app.dtos.auth_service.dtos import UserAccount
+from backend.app.dtos.analytics_service.responses import ContaminationAnalyticsResponse
+from backend.app.services.auth import AuthService
+from backend.app.services.analytics import AnalyticsService
+from backend.app.utils.security.permissions import Permission
+
+logger = logging.getLogger(__name__)
+
+class AnalyticsController(Controller):
+    """Controller for statistics of contamination readings."""
+    tags=["Analytics"]
+
+    @get("/analytics/contamination", response_model=ContaminationAnalyticsResponse)
+    def get_contamination(self, start: datetime, end: datetime,
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.CAMERA_READ))],
+        bucket_seconds: int | None = None,
+        camera_id: int | None = None
+    ) -> ContaminationAnalyticsResponse:
+        """
+        Retrieves statistics of contamination of a camera, or of all cameras,
+        over a period and for every bucket of it.
+        """
+        logger.info("User %s is retrieving contamination statistics", user.username)
+        return AnalyticsService.get_contamination(start, end, bucket_seconds, camera_id)
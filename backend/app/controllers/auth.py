@@ -1,30 +1,40 @@
 """
 Controller for authentication.
 """
-
-from fastapi_controllers import Controller, post
+import logging
+from typing import Annotated
+from fastapi import Request, Depends
+from fastapi_controllers import Controller, get, post
 from backend.app.services.auth import AuthService
+from backend.app.dtos.auth_service.dtos import UserAccount
 from backend.app.dtos.auth_service.requests import (
     RefreshTokenRequest,
     ValidateAccessTokenRequest,
-    LoginRequest
+    ValidateAccessTokensRequest,
+    LoginRequest,
+    ChangePasswordRequest
 )
 from backend.app.dtos.auth_service.responses import (
     RefreshTokenResponse,
     ValidateAccessTokenResponse,
-    LoginResponse
+    ValidateAccessTokensResponse,
+    LoginResponse,
+    JwksResponse,
+    RevokedSaltsResponse
 )
 
+logger = logging.getLogger(__name__)
+
 class AuthController(Controller):
     """Controller for authentication"""
     tags=["Auth"]
 
     @post("/login", response_model=LoginResponse)
-    def login(self, data: LoginRequest, ) -> LoginResponse:
+    def login(self, data: LoginRequest, request: Request) -> LoginResponse:
         """
         Allows user to login.
         """
-        return AuthService.login(data)
+        return AuthService.login(data, request.client.host if request.client else None)
 
     @post("/validateAccessToken", response_model=ValidateAccessTokenResponse)
     def validate_access_token(
@@ -34,9 +44,52 @@ class AuthController(Controller):
         """
         return AuthService.validate_access_token(data)
 
+    @post("/validateAccessTokens", response_model=ValidateAccessTokensResponse)
+    def validate_access_tokens(
+        self, data: ValidateAccessTokensRequest) -> ValidateAccessTokensResponse:
+        """
+        Validate a batch of access tokens.
+        """
+        return AuthService.validate_access_tokens(data)
+
     @post("/refreshToken", response_model=RefreshTokenResponse)
     def refresh_token(self, data: RefreshTokenRequest) -> RefreshTokenResponse:
         """
         Allows user to receive new access and refresh tokens.
         """
         return AuthService.refresh_tokens(data)
+
+    @post("/changePassword", response_model=RefreshTokenResponse)
+    def change_password(self, data: ChangePasswordRequest,
+        user: Annotated[UserAccount, Depends(AuthService.authenticate)]
+    ) -> RefreshTokenResponse:
+        """
+        Changes the password of the user and revokes all of their tokens.
+        New tokens are returned for the current session.
+        """
+        return AuthService.change_password(user.id, data)
+
+    @post("/logoutAll", response_model=bool)
+    def logout_all(self,
+        user: Annotated[UserAccount, Depends(AuthService.authenticate)]
+    ) -> bool:
+        """
+        Revokes all tokens of the user.
+        """
+        logger.info("User %s is logging out of all sessions", user.username)
+        AuthService.rotate_token_salt(user.id)
+        return True
+
+    @get("/.well-known/jwks.json", response_model=JwksResponse)
+    def get_jwks(self) -> JwksResponse:
+        """
+        Public keys for verifying access tokens locally.
+        """
+        return AuthService.get_jwks()
+
+    @get("/revokedSalts", response_model=RevokedSaltsResponse)
+    def get_revoked_salts(self, since: float = 0) -> RevokedSaltsResponse:
+        """
+        Token salts revoked after the given timestamp.
+        """
+        return AuthService.get_revoked_salts(since)
@@ -2,14 +2,24 @@
 Controller for operations with cameras.
 """
 import logging
+from datetime import datetime
 from typing import Annotated
-from fastapi_controllers import Controller, get
-from fastapi import Depends
+from fastapi_controllers import Controller, get, post
+from fastapi import Depends, UploadFile
 from backend.app.dtos.auth_service.dtos import UserAccount
 from backend.app.services.auth import AuthService
+from backend.app.utils.security.permissions import Permission
 from backend.app.services.camera import CameraService
+from backend.app.services.reading import ReadingService
+from backend.app.services.anomaly import AnomalyService
 from backend.app.dtos.camera_service.dtos import Camera
-from backend.app.dtos.camera_service.responses import CamerasResponse
+from backend.app.dtos.camera_service.requests import RecordReadingsRequest
+from backend.app.dtos.camera_service.responses import (
+    CamerasResponse,
+    ReadingsResponse,
+    SeriesResponse,
+    AnomaliesResponse
+)
 
 logger = logging.getLogger(__name__)
 
@@ -19,17 +29,21 @@ class CameraController(Controller):
 
     @get("/cameras", response_model=CamerasResponse)
     def get_cameras(self,
-        user: Annotated[UserAccount, Depends(AuthService.authenticate)]) -> CamerasResponse:
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.CAMERA_READ))],
+        cursor: str | None = None,
+        limit: int | None = None
+    ) -> CamerasResponse:
         """
-        Retrieves the first page containing 10 cameras.
-        Includes the total number of pages.
+        Retrieves the page of cameras following the cursor, or the first page.
+        Includes the total number of pages and the cursor of the next page.
         """
         logger.info("User %s is retrieving cameras", user.username)
-        return CameraService.get_cameras()
+        return CameraService.get_cameras(cursor, limit)
 
     @get("/cameras/{camera_id}", response_model=Camera)
     def get_camera(self, camera_id,
-        user: Annotated[UserAccount, Depends(AuthService.authenticate)]) -> Camera:
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.CAMERA_READ))]
+    ) -> Camera:
         """
         Retrieve info for a particular camera.
         """
@@ -38,9 +52,115 @@ class CameraController(Controller):
 
     @get("/cameras/pages/{page}", response_model=CamerasResponse)
     def get_cameras_page(self, page,
-        user: Annotated[UserAccount, Depends(AuthService.authenticate)]) -> CamerasResponse:
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.CAMERA_READ))]
+    ) -> CamerasResponse:
         """
         Retrieves a certain page of cameras.
         """
         logger.info("User %s is retrieving cameras page %s", user.username, page)
-        return CameraService.get_cameras(page)
+        return CameraService.get_cameras_page(page)
+
+class AsyncCameraController(Controller):
+    """
+    Controller for operations with cameras.
+    Serves the same routes as CameraController from the async database pool.
+    """
+    tags=["Camera"]
+
+    @get("/cameras", response_model=CamerasResponse)
+    async def get_cameras(self,
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.CAMERA_READ))],
+        cursor: str | None = None,
+        limit: int | None = None
+    ) -> CamerasResponse:
+        """
+        Retrieves the page of cameras following the cursor, or the first page.
+        Includes the total number of pages and the cursor of the next page.
+        """
+        logger.info("User %s is retrieving cameras", user.username)
+        return await CameraService.get_cameras_async(cursor, limit)
+
+    @get("/cameras/{camera_id}", response_model=Camera)
+    async def get_camera(self, camera_id,
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.CAMERA_READ))]
+    ) -> Camera:
+        """
+        Retrieve info for a particular camera.
+        """
+        logger.info("User %s is retrieving camera %s", user.username, camera_id)
+        return await CameraService.get_camera_async(camera_id)
+
+    @get("/cameras/pages/{page}", response_model=CamerasResponse)
+    async def get_cameras_page(self, page,
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.CAMERA_READ))]
+    ) -> CamerasResponse:
+        """
+        Retrieves a certain page of cameras.
+        """
+        logger.info("User %s is retrieving cameras page %s", user.username, page)
+        return await CameraService.get_cameras_page_async(page)
+
+class CameraReadingController(Controller):
+    """Controller for operations with contamination readings of cameras."""
+    tags=["Camera"]
+
+    @post("/cameras/readings", response_model=int)
+    def record_readings(self, request: RecordReadingsRequest,
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.CAMERA_WRITE))]
+    ) -> int:
+        """
+        Stores contamination readings of cameras and updates their latest readings.
+        Returns the number of stored readings.
+        """
+        logger.info("User %s is recording %s readings", user.username, len(request.readings))
+        return ReadingService.record_readings(request.readings)
+
+    @post("/cameras/readings/import", response_model=int)
+    def import_readings(self, file: UploadFile,
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.CAMERA_WRITE))]
+    ) -> int:
+        """
+        Stores contamination readings from a CSV or NDJSON file
+        with camera_id, taken_at and contamination of every reading.
+        Returns the number of stored readings.
+        """
+        logger.info("User %s is importing readings from %s", user.username, file.filename)
+        return ReadingService.import_readings(file.file.read(), file.content_type, file.filename)
+
+    @get("/cameras/{camera_id}/readings", response_model=ReadingsResponse)
+    def get_readings(self, camera_id: int, start: datetime, end: datetime,
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.CAMERA_READ))],
+        limit: int | None = None
+    ) -> ReadingsResponse:
+        """
+        Retrieves readings of a camera taken from start up to end, oldest first.
+        Includes the start of the period for retrieving the following readings.
+        """
+        logger.info("User %s is retrieving readings of camera %s", user.username, camera_id)
+        return ReadingService.get_readings(camera_id, start, end, limit)
+
+    @get("/cameras/{camera_id}/series", response_model=SeriesResponse)
+    def get_series(self, camera_id: int, start: datetime, end: datetime,
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.CAMERA_READ))],
+        points: int | None = None
+    ) -> SeriesResponse:
+        """
+        Retrieves contamination of a camera over a period for a chart of at most
+        the given number of points, aggregated by hour or day if needed.
+        """
+        logger.info("User %s is retrieving series of camera %s", user.username, camera_id)
+        return ReadingService.get_series(camera_id, start, end, points)
+
+    @get("/anomalies", response_model=AnomaliesResponse)
+    def get_anomalies(self,
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.CAMERA_READ))],
+        camera_id: int | None = None,
+        before_id: int | None = None,
+        limit: int | None = None
+    ) -> AnomaliesResponse:
+        """
+        Retrieves contamination readings far from the usual readings of their camera,
+        of a camera or of all cameras, newest first.
+        """
+        logger.info("User %s is retrieving anomalies", user.username)
+        return AnomalyService.get_anomalies(camera_id, before_id, limit)
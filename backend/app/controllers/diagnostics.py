@@ -0,0 +1,39 @@
+"""
+Controller for inspecting the state of the application.
+"""
+import logging
+from typing import Annotated
+from fastapi_controllers import Controller, get, post
+from fastapi import Depends
+from backend.app.dtos.auth_service.dtos import UserAccount
+from backend.app.dtos.diagnostics_service.responses import SlowQueriesResponse
+from backend.app.services.auth import AuthService
+from backend.app.services.diagnostics import DiagnosticsService
+from backend.app.utils.security.permissions import Permission
+
+logger = logging.getLogger(__name__)
+
+class DiagnosticsController(Controller):
+    """Controller for inspecting the state of the application."""
+    tags=["Diagnostics"]
+
+    @get("/admin/slowQueries", response_model=SlowQueriesResponse)
+    def get_slow_queries(self,
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.ADMIN))]
+    ) -> SlowQueriesResponse:
+        """
+        Retrieves the most recent slow queries of the worker with their plans.
+        """
+        logger.info("User %s is retrieving slow queries", user.username)
+        return DiagnosticsService.get_slow_queries()
+
+    @post("/admin/slowQueries/clear", response_model=bool)
+    def clear_slow_queries(self,
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.ADMIN))]
+    ) -> bool:
+        """
+        Drops the slow queries captured by the worker.
+        """
+        logger.info("User %s is clearing slow queries", user.username)
+        DiagnosticsService.clear_slow_queries()
+        return True
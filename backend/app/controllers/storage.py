@@ -9,6 +9,7 @@ from fastapi_controllers import Controller, get, post
 from fastapi import UploadFile, Depends
 from backend.app.services.s3 import S3Service
 from backend.app.services.auth import AuthService
+from backend.app.utils.security.permissions import Permission
 from backend.app.dtos.auth_service.dtos import UserAccount
 
 logger = logging.getLogger(__name__)
@@ -21,7 +22,7 @@ class StorageController(Controller):
 
     @post("/s3/{bucket}/{destination}", response_model=bool)
     def put_file(self, bucket: str, destination: str, file: UploadFile,
-        user: Annotated[UserAccount, Depends(AuthService.authenticate)]
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.STORAGE_WRITE))]
     ) -> bool:
         """
         Upload file to S3 storage.
@@ -39,7 +40,8 @@ class StorageController(Controller):
 
     @get("/s3/{bucket}/{source}", response_class=FileResponse)
     def get_file(self, bucket: str, source: str,
-        user: Annotated[UserAccount, Depends(AuthService.authenticate)]) -> FileResponse:
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.STORAGE_READ))]
+    ) -> FileResponse:
         """
         Get file from S3 storage.
         """
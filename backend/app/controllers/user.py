@@ -1,6 +1,7 @@
 """
 Controller for user actions.
 """
+import logging
 from typing import Annotated
 from fastapi_controllers import Controller, get, post
 from fastapi import Depends
@@ -8,7 +9,8 @@ from backend.app.dtos.auth_service.dtos import UserAccount
 from backend.app.dtos.user_service.requests import (
     BeginRegistrationRequest,
     CheckRegistrationCodeRequest,
-    CompleteRegistrationRequest
+    CompleteRegistrationRequest,
+    TerminateUserRequest
 )
 from backend.app.dtos.user_service.responses import (
     BeginRegistrationResponse,
@@ -18,6 +20,9 @@ from backend.app.dtos.user_service.responses import (
 from backend.app.dtos.user_service.dtos import UserProfile
 from backend.app.services.user import UserService
 from backend.app.services.auth import AuthService
+from backend.app.utils.security.permissions import Permission
+
+logger = logging.getLogger(__name__)
 
 class UserController(Controller):
     """Controller for operations with users."""
@@ -41,8 +46,64 @@ class UserController(Controller):
         """Register user."""
         return UserService.complete_registration(data)
 
+class UserAdministrationController(Controller):
+    """Controller for administration of users."""
+    tags=["Users"]
+
+    @post("/admin/users/{user_id}/terminate", response_model=bool)
+    def terminate_user(self, user_id: int, data: TerminateUserRequest,
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.ADMIN))]
+    ) -> bool:
+        """
+        Terminates the user account and revokes all of its tokens.
+        """
+        logger.info("User %s is terminating user %s", user.username, user_id)
+        AuthService.terminate_user(user_id, data.reason)
+        return True
+
+    @post("/admin/users/{user_id}/restore", response_model=bool)
+    def restore_user(self, user_id: int,
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.ADMIN))]
+    ) -> bool:
+        """
+        Lifts the termination of the user account.
+        """
+        logger.info("User %s is restoring user %s", user.username, user_id)
+        AuthService.restore_user(user_id)
+        return True
+
+    @post("/admin/users/{user_id}/revokeTokens", response_model=bool)
+    def revoke_user_tokens(self, user_id: int,
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.ADMIN))]
+    ) -> bool:
+        """
+        Revokes all tokens of the user.
+        """
+        logger.info("User %s is revoking tokens of user %s", user.username, user_id)
+        AuthService.rotate_token_salt(user_id)
+        return True
+
+class UserProfileController(Controller):
+    """Controller for user profiles."""
+    tags=["Users"]
+
     @get("/profile", response_model=UserProfile)
     def get_user_profile(self,
-        user: Annotated[UserAccount, Depends(AuthService.authenticate)]) -> UserProfile:
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.PROFILE_READ))]
+    ) -> UserProfile:
         """Get user profile."""
         return UserService.get_user_profile(user.id)
+
+class AsyncUserProfileController(Controller):
+    """
+    Controller for user profiles.
+    Serves the same routes as UserProfileController from the async database pool.
+    """
+    tags=["Users"]
+
+    @get("/profile", response_model=UserProfile)
+    async def get_user_profile(self,
+        user: Annotated[UserAccount, Depends(AuthService.authorize(Permission.PROFILE_READ))]
+    ) -> UserProfile:
+        """Get user profile."""
+        return await UserService.get_user_profile_async(user.id)
@@ -0,0 +1,3 @@
+"""
+AnalyticsService DTOs.
+"""
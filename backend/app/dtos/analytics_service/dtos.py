@@ -0,0 +1,30 @@
+"""
+Data transfer objects for contamination analytics.
+"""
+from datetime import datetime
+from pydantic import BaseModel
+
+class ContaminationStats(BaseModel):
+    """
+    Data transfer object for statistics of contamination readings.
+    All values but count are None if there are no readings.\n
+    count - number of readings;\n
+    min - lowest contamination;\n
+    max - highest contamination;\n
+    mean - mean contamination;\n
+    p50, p90, p99 - contamination percentiles;\n
+    """
+    count: int
+    min: float | None = None
+    max: float | None = None
+    mean: float | None = None
+    p50: float | None = None
+    p90: float | None = None
+    p99: float | None = None
+
+class ContaminationBucket(ContaminationStats):
+    """
+    Data transfer object for statistics of contamination readings of a time bucket.\n
+    start - start of the bucket;\n
+    """
+    start: datetime
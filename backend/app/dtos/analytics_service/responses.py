@@ -0,0 +1,24 @@
+"""
+Responses related to the analytics service.
+"""
+from datetime import datetime
+from pydantic import BaseModel
+
+from .dtos import ContaminationStats, ContaminationBucket
+
+class ContaminationAnalyticsResponse(BaseModel):
+    """
+    Response for retrieving contamination statistics over a period.\n
+    camera_id - id of the camera, None for all cameras;\n
+    start - start of the period, aligned to the buckets;\n
+    end - end of the period, aligned to the buckets;\n
+    bucket_seconds - duration of a bucket;\n
+    summary - statistics of the whole period, percentiles are estimated;\n
+    buckets - statistics of every bucket, oldest first\n
+    """
+    camera_id: int | None
+    start: datetime
+    end: datetime
+    bucket_seconds: int
+    summary: ContaminationStats
+    buckets: list[ContaminationBucket]
@@ -2,7 +2,7 @@
 Requests related to the auth service.
 """
 from pydantic import BaseModel
-from backend.app.utils.validation.pydantic_integration import Username
+from backend.app.utils.validation.pydantic_integration import Username, Password
 
 class LoginRequest(BaseModel, str_strip_whitespace=True):
     """
@@ -22,3 +22,18 @@ class ValidateAccessTokenRequest(BaseModel, str_strip_whitespace=True):
     Data transfer object for validate auth token request.
     """
     access_token: str
+
+class ValidateAccessTokensRequest(BaseModel, str_strip_whitespace=True):
+    """
+    Data transfer object for batch access token validation request.
+    """
+    access_tokens: list[str]
+
+class ChangePasswordRequest(BaseModel, str_strip_whitespace=True):
+    """
+    Data transfer object for password change request.
+
+    New password must follow the same rules as on registration.
+    """
+    current_password: str
+    new_password: Password
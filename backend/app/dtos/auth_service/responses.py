@@ -2,6 +2,7 @@
 Responses related to the auth service.
 """
 from pydantic import BaseModel
+from .dtos import UserAccount
 
 class RefreshTokenResponse(BaseModel):
     """
@@ -17,7 +18,37 @@ class ValidateAccessTokenResponse(BaseModel):
     """
     is_valid: bool
 
+class TokenValidationResult(BaseModel):
+    """
+    Result of validating a single token in a batch.
+    account is only present if the token is valid.
+    """
+    is_valid: bool
+    account: UserAccount | None = None
+
+class ValidateAccessTokensResponse(BaseModel):
+    """
+    Data transfer object for batch access token validation response.
+    Results are in the same order as the requested tokens.
+    """
+    results: list[TokenValidationResult]
+
 class LoginResponse(RefreshTokenResponse):
     """
     Data transfer object for login request.
     """
+
+class JwksResponse(BaseModel):
+    """
+    JSON Web Key Set with the public keys used to sign tokens.
+    """
+    keys: list[dict]
+
+class RevokedSaltsResponse(BaseModel):
+    """
+    Salts revoked since the requested timestamp.\n
+    salts - revoked salts, tokens carrying them are invalid;\n
+    cursor - timestamp to pass as since in the next request\n
+    """
+    salts: list[str]
+    cursor: float
@@ -12,6 +12,7 @@ class Camera(BaseModel):
     contamination - contamination percentage;\n
     date - date when last photo was captured;\n
     url - url to the photo;\n
+    last_anomaly_at - time of the latest anomalous reading, None if there was none;\n
     """
     id: int
     name: str
@@ -19,3 +20,58 @@ class Camera(BaseModel):
     contamination: float
     date: datetime
     url: str | None
+    last_anomaly_at: datetime | None = None
+
+class Reading(BaseModel):
+    """
+    Data transfer object for a contamination reading of a camera.\n
+    taken_at - time when the reading was taken, UTC if no timezone is given;\n
+    contamination - contamination percentage;\n
+    """
+    taken_at: datetime
+    contamination: float
+
+class CameraReading(Reading):
+    """
+    Data transfer object for a contamination reading of a particular camera.\n
+    camera_id - id of the camera;\n
+    """
+    camera_id: int
+
+class SeriesPoint(BaseModel):
+    """
+    Data transfer object for contamination readings of a camera aggregated over time.\n
+    start - start of the aggregated time, or the time of a single reading;\n
+    readings - number of aggregated readings;\n
+    mean - mean contamination;\n
+    min - lowest contamination;\n
+    max - highest contamination;\n
+    last - contamination of the latest reading;\n
+    """
+    start: datetime
+    readings: int
+    mean: float
+    min: float
+    max: float
+    last: float
+
+class Anomaly(BaseModel):
+    """
+    Data transfer object for a contamination reading far from the usual readings of its camera.\n
+    id - id of the anomaly;\n
+    camera_id - id of the camera;\n
+    camera_name - camera name;\n
+    taken_at - time when the reading was taken;\n
+    contamination - contamination percentage;\n
+    expected - moving mean of the readings of the camera before it;\n
+    score - distance from the mean in standard deviations;\n
+    detected_at - time when the anomaly was detected;\n
+    """
+    id: int
+    camera_id: int
+    camera_name: str
+    taken_at: datetime
+    contamination: float
+    expected: float
+    score: float
+    detected_at: datetime
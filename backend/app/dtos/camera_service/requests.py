@@ -0,0 +1,13 @@
+"""
+Requests related to the camera service.
+"""
+from pydantic import BaseModel
+
+from .dtos import CameraReading
+
+class RecordReadingsRequest(BaseModel):
+    """
+    Data transfer object for recording contamination readings.\n
+    readings - readings of any cameras, in any order;\n
+    """
+    readings: list[CameraReading]
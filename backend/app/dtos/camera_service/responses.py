@@ -1,17 +1,52 @@
 """
 Responses related to the camera service.
 """
+from datetime import datetime
 from pydantic import BaseModel
 
-from .dtos import Camera
+from .dtos import Camera, Reading, SeriesPoint, Anomaly
 
 class CamerasResponse(BaseModel):
     """
     Response for retrieving a page of cameras.\n
     page - the current page number;\n
-    cameras - the list of cameras on the page (up to 10);\n
-    total_pages - the total number of existing pages\n
+    cameras - the list of cameras on the page;\n
+    total_pages - the total number of existing pages;\n
+    next_cursor - token for retrieving the next page, None on the last page\n
     """
     page: int
     cameras: list[Camera]
     total_pages: int
+    next_cursor: str | None = None
+
+class ReadingsResponse(BaseModel):
+    """
+    Response for retrieving contamination readings of a camera over a period.\n
+    camera_id - id of the camera;\n
+    readings - the readings, oldest first;\n
+    next_start - start of the period for retrieving the following readings,
+    None if there are no more readings in the period\n
+    """
+    camera_id: int
+    readings: list[Reading]
+    next_start: datetime | None = None
+
+class SeriesResponse(BaseModel):
+    """
+    Response for retrieving contamination of a camera over a period for a chart.\n
+    camera_id - id of the camera;\n
+    resolution - "reading", "hour" or "day", the time every point stands for;\n
+    points - the points, oldest first\n
+    """
+    camera_id: int
+    resolution: str
+    points: list[SeriesPoint]
+
+class AnomaliesResponse(BaseModel):
+    """
+    Response for retrieving anomalous contamination readings.\n
+    anomalies - the anomalies, newest first;\n
+    next_before_id - id for retrieving the following anomalies, None if there are no more\n
+    """
+    anomalies: list[Anomaly]
+    next_before_id: int | None = None
@@ -0,0 +1,18 @@
+"""
+DiagnosticsService DTOs.
+"""
+from datetime import datetime
+from pydantic import BaseModel
+
+class SlowQuery(BaseModel):
+    """
+    Data transfer object for a slow SQL query.\n
+    sql - the statement with placeholders;\n
+    duration_ms - execution time in milliseconds;\n
+    captured_at - when the query finished;\n
+    plan - EXPLAIN (ANALYZE, BUFFERS) output, None if the query was not sampled;\n
+    """
+    sql: str
+    duration_ms: float
+    captured_at: datetime
+    plan: str | None = None
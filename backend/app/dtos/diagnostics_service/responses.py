@@ -0,0 +1,12 @@
+"""
+Responses related to the diagnostics service.
+"""
+from pydantic import BaseModel
+from .dtos import SlowQuery
+
+class SlowQueriesResponse(BaseModel):
+    """
+    Response for retrieving slow queries.\n
+    queries - the most recent slow queries, newest first;\n
+    """
+    queries: list[SlowQuery]
@@ -1,7 +1,7 @@
 """
 Requests related to the user service.
 """
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 from backend.app.utils.validation.pydantic_integration import (
     Name,
@@ -47,3 +47,11 @@ class CompleteRegistrationRequest(BaseModel, str_strip_whitespace=True):
     name: Name
     surname: Name
     patronymic: Name | None = None
+
+class TerminateUserRequest(BaseModel, str_strip_whitespace=True):
+    """
+    Data transfer object for user termination request.
+
+    Reason is optional and must not exceed 1000 characters.
+    """
+    reason: str | None = Field(default=None, max_length=1000)
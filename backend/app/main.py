@@ -2,16 +2,26 @@
 This module serves as the entry point for the backend application.
 """
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
-from backend.app import config, controllers
+from backend.app import config, controllers, middlewares
 from backend.app.utils.logging.filters.fastapi_healthcheck import FastAPIHealthCheckFilter
-from backend.app import models
+from backend.app.models.base import async_db, replica_router
+from backend.app.services.auth import AuthService
+from backend.app.services.analytics import AnalyticsService
+from backend.app.services.role import RoleService
 
-models.create_database()
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """
+    Releases connections of the async database pool on shutdown.
+    """
+    yield
+    await async_db.close()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.title = "Espada - Backend API"
 app.summary = "Backend API for Nickelhack"
 app.contact = {"name": "Github", "url": "https://github.com/EspadaKomanda/dirty-business"}
@@ -40,8 +50,15 @@ def main():
         allow_headers=["*"],
     )
 
+    middlewares.add_middlewares(app)
     controllers.add_controllers(app)
 
+    AuthService.start_token_invalidation_listener()
+    AuthService.start_termination_listener()
+    RoleService.reload()
+    AnalyticsService.start_invalidation_listener()
+    replica_router.start_health_checks()
+
     uvicorn.run(app, host="0.0.0.0", port=8000, log_config=None)
 
 if __name__ == "__main__":
@@ -0,0 +1,13 @@
+"""
+Initializes all middlewares.
+"""
+import logging
+from fastapi import FastAPI
+from .database import DatabaseConnectionMiddleware
+from .query_stats import QueryInstrumentationMiddleware
+
+def add_middlewares(app: FastAPI):
+    """Add all middlewares to the app."""
+    logging.info("Adding middlewares...")
+    app.add_middleware(DatabaseConnectionMiddleware)
+    app.add_middleware(QueryInstrumentationMiddleware)
@@ -0,0 +1,32 @@
+"""
+Middleware that binds database connections to requests.
+"""
+from playhouse.pool import PooledDatabase
+from starlette.types import ASGIApp, Receive, Scope, Send
+from backend.app.models.base import db, replicas
+from backend.app.utils.database.state import connection_scope
+from backend.app.utils.database.identity_map import identity_scope
+from backend.app.utils.database.replicas import routing_scope
+
+class DatabaseConnectionMiddleware:
+    """
+    Gives every request its own connection scope. A connection is acquired
+    on the first query of the request and released after the response has
+    been sent, so idle requests never hold a connection.
+    Only pooled databases are scoped, connections of the others stay bound to
+    threads, so that they are not opened again for every request.
+    Every request also gets its own identity map and replica routing state.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.databases = [
+            database for database in (db, *replicas) if isinstance(database, PooledDatabase)
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with connection_scope(*self.databases), identity_scope(), routing_scope():
+            await self.app(scope, receive, send)
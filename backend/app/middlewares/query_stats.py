@@ -0,0 +1,66 @@
+"""
+Middleware that reports the SQL queries of every request.
+"""
+import logging
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from backend.app.config import ENVIRONMENT_TYPE, QUERY_REPEAT_WARNING_THRESHOLD
+from backend.app.utils.database.instrumentation import query_stats_scope
+from backend.app.utils.metrics.registry import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+queries_per_request = Histogram(
+    "db_queries_per_request",
+    "Number of SQL queries executed by a request",
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100))
+query_time_per_request = Histogram(
+    "db_query_seconds_per_request",
+    "Time spent executing SQL queries by a request")
+repeated_statements = Counter(
+    "db_repeated_statements_total",
+    "Requests that executed the same statement more times than allowed")
+
+class QueryInstrumentationMiddleware:
+    """
+    Collects the SQL queries executed by every request.
+    In development the number and duration of queries are returned in the
+    X-DB-Query-Count and X-DB-Query-Time headers, otherwise they are exported
+    as metrics. Statements repeated within a request, a sign of N+1 queries,
+    are logged.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.expose_headers = ENVIRONMENT_TYPE == "development"
+        self.threshold = int(QUERY_REPEAT_WARNING_THRESHOLD)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with query_stats_scope() as stats:
+            async def send_with_stats(message: Message):
+                if message["type"] == "http.response.start" and self.expose_headers:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Query-Count"] = str(stats.count)
+                    headers["X-DB-Query-Time"] = f"{stats.duration * 1000:.2f}ms"
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                self._report(scope, stats)
+
+    def _report(self, scope: Scope, stats):
+        queries_per_request.observe(stats.count)
+        query_time_per_request.observe(stats.duration)
+
+        repeated = stats.repeated(self.threshold)
+        if repeated:
+            repeated_statements.inc()
+            for statement, count in repeated:
+                logger.warning(
+                    "%s %s executed the same statement %s times: %s",
+                    scope["method"], scope["path"], count, statement
+                )
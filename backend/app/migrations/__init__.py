@@ -0,0 +1,105 @@
+"""
+Versioned schema migrations.
+
+Migrations are modules of the versions package named m<version>_<name>,
+where version is a zero-padded four digit number. They are applied in order
+of their versions and recorded in the schema_migrations table, so each of
+them runs once per database.
+
+Every migration module defines up(database) and may set TRANSACTIONAL to
+False for statements that cannot run inside a transaction, such as
+CREATE INDEX CONCURRENTLY.
+
+Run with python -m backend.app.migrations.
+"""
+import logging
+import pkgutil
+import importlib
+from types import ModuleType
+import pendulum as pnd
+from backend.app.models.base import db
+from backend.app.models.schema_migration import SchemaMigration
+from backend.app.services.camera import CameraService
+from . import versions
+
+logger = logging.getLogger(__name__)
+
+# Key of the advisory lock held while migrating, so that concurrent runs
+# wait for each other instead of applying the same migration twice
+MIGRATION_LOCK_ID = 5_170_014
+
+def discover_migrations() -> list[ModuleType]:
+    """
+    Returns all migration modules in order of their versions.
+    """
+    names = sorted(
+        module.name for module in pkgutil.iter_modules(versions.__path__)
+        if module.name.startswith("m")
+    )
+    return [importlib.import_module(f"{versions.__name__}.{name}") for name in names]
+
+def _split_name(module: ModuleType) -> tuple[str, str]:
+    """
+    Returns the version and the name of a migration module.
+    """
+    version, name = module.__name__.rsplit(".", 1)[1][1:].split("_", 1)
+    return version, name
+
+def _apply(module: ModuleType):
+    version, name = _split_name(module)
+    logger.info("Applying migration %s (%s)...", version, name)
+    module.up(db)
+    SchemaMigration.create(version=version, name=name, applied_at=pnd.now())
+
+def run_migrations() -> list[str]:
+    """
+    Applies all pending migrations. Returns the versions that have been applied.
+    """
+    applied_now = []
+    with db.connection_context():
+        db.execute_sql("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+        try:
+            db.create_tables([SchemaMigration], safe=True)
+            applied = {
+                migration.version
+                for migration in SchemaMigration.select(SchemaMigration.version)
+            }
+
+            for module in discover_migrations():
+                version, _ = _split_name(module)
+                if version in applied:
+                    continue
+
+                if getattr(module, "TRANSACTIONAL", True):
+                    with db.atomic():
+                        _apply(module)
+                else:
+                    _apply(module)
+                applied_now.append(version)
+        finally:
+            db.execute_sql("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+
+    if applied_now:
+        logger.info("Applied migrations: %s", ", ".join(applied_now))
+        # Migrations may insert or delete cameras
+        CameraService.invalidate_count()
+    else:
+        logger.info("Database schema is up to date")
+    return applied_now
+
+def pending_migrations() -> list[str]:
+    """
+    Returns the versions of migrations that have not been applied yet.
+    """
+    with db.connection_context():
+        if not db.table_exists(SchemaMigration._meta.table_name):  # pylint: disable=protected-access
+            applied = set()
+        else:
+            applied = {
+                migration.version
+                for migration in SchemaMigration.select(SchemaMigration.version)
+            }
+    return [
+        version for version, _ in map(_split_name, discover_migrations())
+        if version not in applied
+    ]
@@ -0,0 +1,35 @@
+"""
+Applies pending schema migrations.
+
+Run once per deployment, before starting the application:
+python -m backend.app.migrations
+"""
+import sys
+import logging
+import argparse
+from backend.app.migrations import run_migrations, pending_migrations
+
+def main():
+    """
+    Entrypoint function
+    """
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations.")
+    parser.add_argument("--check", action="store_true",
+        help="only list pending migrations, exit with 1 if there are any")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    if args.check:
+        pending = pending_migrations()
+        for version in pending:
+            print(version)
+        sys.exit(1 if pending else 0)
+
+    run_migrations()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Schema operations shared by migrations.
+"""
+import logging
+import peewee as pw
+
+logger = logging.getLogger(__name__)
+
+def quote(name: str) -> str:
+    """
+    Quotes a Postgres identifier.
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+def create_index_concurrently(database: pw.Database, name: str,
+    fields: list[pw.Field], unique: bool = False):
+    """
+    Creates an index without locking the table against writes.
+    Must run outside of a transaction. An index left invalid by an
+    interrupted build is dropped and built again.
+    """
+    invalid = database.execute_sql(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = %s AND NOT i.indisvalid",
+        (name,)
+    ).fetchone()
+    if invalid:
+        logger.warning("Rebuilding invalid index %s", name)
+        database.execute_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {quote(name)}")
+
+    table = fields[0].model._meta.table_name  # pylint: disable=protected-access
+    columns = ", ".join(quote(field.column_name) for field in fields)
+    database.execute_sql(
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS "
+        f"{quote(name)} ON {quote(table)} ({columns})"
+    )
@@ -0,0 +1,202 @@
+"""
+Initial schema: the tables created by create_tables before migrations
+existed, the default roles and the demo cameras.
+Existing databases already have all of them, so this migration only
+records the baseline for them.
+The schema is a frozen copy of what the models of that time created, so
+later changes to the models do not change it.
+"""
+import peewee as pw
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS "role" ('
+    '"id" SERIAL NOT NULL PRIMARY KEY, '
+    '"created_at" TIMESTAMP NOT NULL, '
+    '"updated_at" TIMESTAMP NOT NULL, '
+    '"name" VARCHAR(18) NOT NULL'
+    ')',
+    'CREATE UNIQUE INDEX IF NOT EXISTS "role_name" ON "role" ("name")',
+    'CREATE TABLE IF NOT EXISTS "user" ('
+    '"id" SERIAL NOT NULL PRIMARY KEY, '
+    '"created_at" TIMESTAMP NOT NULL, '
+    '"updated_at" TIMESTAMP NOT NULL, '
+    '"registration_date" TIMESTAMP NOT NULL'
+    ')',
+    # user_id of the user tables was a deferred foreign key, created without a constraint
+    'CREATE TABLE IF NOT EXISTS "userlogindata" ('
+    '"id" SERIAL NOT NULL PRIMARY KEY, '
+    '"created_at" TIMESTAMP NOT NULL, '
+    '"updated_at" TIMESTAMP NOT NULL, '
+    '"username" VARCHAR(18) NOT NULL, '
+    '"email" VARCHAR(50) NOT NULL, '
+    '"password_hash" VARCHAR(60) NOT NULL, '
+    '"auth_token_salt" VARCHAR(36), '
+    '"is_email_confirmed" BOOLEAN NOT NULL, '
+    '"confirmation_code" VARCHAR(6), '
+    '"confirmation_gen_time" BIGINT, '
+    '"recovery_token" VARCHAR(36), '
+    '"recovery_gen_time" BIGINT, '
+    '"user_id" INTEGER NOT NULL'
+    ')',
+    'CREATE UNIQUE INDEX IF NOT EXISTS "userlogindata_username" '
+    'ON "userlogindata" ("username")',
+    'CREATE UNIQUE INDEX IF NOT EXISTS "userlogindata_email" ON "userlogindata" ("email")',
+    'CREATE UNIQUE INDEX IF NOT EXISTS "userlogindata_recovery_token" '
+    'ON "userlogindata" ("recovery_token")',
+    'CREATE INDEX IF NOT EXISTS "userlogindata_user_id" ON "userlogindata" ("user_id")',
+    'CREATE TABLE IF NOT EXISTS "userprofile" ('
+    '"id" SERIAL NOT NULL PRIMARY KEY, '
+    '"created_at" TIMESTAMP NOT NULL, '
+    '"updated_at" TIMESTAMP NOT NULL, '
+    '"name" VARCHAR(100) NOT NULL, '
+    '"surname" VARCHAR(100) NOT NULL, '
+    '"patronymic" VARCHAR(100), '
+    '"avatar_url" VARCHAR(100), '
+    '"user_id" INTEGER NOT NULL'
+    ')',
+    'CREATE INDEX IF NOT EXISTS "userprofile_user_id" ON "userprofile" ("user_id")',
+    'CREATE TABLE IF NOT EXISTS "userrole" ('
+    '"id" SERIAL NOT NULL PRIMARY KEY, '
+    '"created_at" TIMESTAMP NOT NULL, '
+    '"updated_at" TIMESTAMP NOT NULL, '
+    '"role_id" INTEGER NOT NULL REFERENCES "role" ("id") ON DELETE CASCADE, '
+    '"user_id" INTEGER NOT NULL'
+    ')',
+    'CREATE INDEX IF NOT EXISTS "userrole_role_id" ON "userrole" ("role_id")',
+    'CREATE INDEX IF NOT EXISTS "userrole_user_id" ON "userrole" ("user_id")',
+    'CREATE TABLE IF NOT EXISTS "usertermination" ('
+    '"id" SERIAL NOT NULL PRIMARY KEY, '
+    '"created_at" TIMESTAMP NOT NULL, '
+    '"updated_at" TIMESTAMP NOT NULL, '
+    '"user_id" INTEGER NOT NULL REFERENCES "user" ("id") ON DELETE CASCADE, '
+    '"reason" VARCHAR(1000), '
+    '"termination_date" BIGINT NOT NULL'
+    ')',
+    'CREATE UNIQUE INDEX IF NOT EXISTS "usertermination_user_id" '
+    'ON "usertermination" ("user_id")',
+    'CREATE TABLE IF NOT EXISTS "camera" ('
+    '"id" SERIAL NOT NULL PRIMARY KEY, '
+    '"created_at" TIMESTAMP NOT NULL, '
+    '"updated_at" TIMESTAMP NOT NULL, '
+    '"name" VARCHAR(100) NOT NULL, '
+    '"description" VARCHAR(500), '
+    '"contamination" REAL NOT NULL, '
+    '"date" TIMESTAMP NOT NULL, '
+    '"url" VARCHAR(500)'
+    ')',
+    'CREATE UNIQUE INDEX IF NOT EXISTS "camera_name" ON "camera" ("name")'
+]
+
+ROLES = ["user", "admin"]
+
+CAMERAS = [
+    {
+        "name": "Dummy 1",
+        "description": "Located in room 12",
+        "contamination": 0.5,
+        "date": "2024-01-01",
+        "url": "https://t4.ftcdn.net/jpg/03/10/07/45/360_F_310074598_rBt50O0nwjydPjWStjdzyNdm0Oh1nAyV.jpg"
+    },
+    {
+        "name": "Dummy 2",
+        "description": "Located in room 15",
+        "contamination": 0.3,
+        "date": "2024-01-01",
+        "url": "https://t4.ftcdn.net/jpg/05/00/56/83/360_F_500568328_HdltBEmUOLBcRfIQTzjSslOsfuH06OCh.jpg"
+    },
+    {
+        "name": "Dummy 3",
+        "description": "Located in room 17",
+        "contamination": 0.13,
+        "date": "2022-01-01",
+        "url": "https://media.istockphoto.com/id/1141324902/photo/real-lens-flare-shot-in-studio-over-black-background-easy-to-add-as-overlay-or-screen-filter.jpg?s=612x612&w=0&k=20&c=zWGnDHkDJZKqaUdNIGkf_eSNJ17qRrnl7czqJxWZlLw="
+    },
+    {
+        "name": "Dummy 4",
+        "description": "Located in room 19",
+        "contamination": 0.1,
+        "date": "2022-01-01",
+        "url": "https://t4.ftcdn.net/jpg/05/00/56/83/360_F_500568328_HdltBEmUOLBcRfIQTzjSslOsfuH06OCh.jpg"
+    },
+    {
+        "name": "Dummy 5",
+        "description": "Located in room 21",
+        "contamination": 0.05,
+        "date": "2022-01-01",
+        "url": "https://t4.ftcdn.net/jpg/05/00/56/83/360_F_500568328_HdltBEmUOLBcRfIQTzjSslOsfuH06OCh.jpg"
+    },
+    {
+        "name": "Dummy 6",
+        "description": "Located in room 23",
+        "contamination": 0.01,
+        "date": "2022-01-01",
+        "url": "https://t4.ftcdn.net/jpg/05/00/56/83/360_F_500568328_HdltBEmUOLBcRfIQTzjSslOsfuH06OCh.jpg"
+    },
+    {
+        "name": "Dummy 7",
+        "description": "Located in room 25",
+        "contamination": 0,
+        "date": "2022-01-01",
+        "url": "https://t4.ftcdn.net/jpg/05/00/56/83/360_F_500568328_HdltBEmUOLBcRfIQTzjSslOsfuH06OCh.jpg"
+    },
+    {
+        "name": "Dummy 8",
+        "description": "Located in room 27",
+        "contamination": 0,
+        "date": "2022-01-01",
+        "url": "https://t4.ftcdn.net/jpg/05/00/56/83/360_F_500568328_HdltBEmUOLBcRfIQTzjSslOsfuH06OCh.jpg"
+    },
+    {
+        "name": "Dummy 9",
+        "description": "Located in room 29",
+        "contamination": 0,
+        "date": "2022-01-01",
+        "url": "https://t4.ftcdn.net/jpg/05/00/56/83/360_F_500568328_HdltBEmUOLBcRfIQTzjSslOsfuH06OCh.jpg"
+    },
+    {
+        "name": "Dummy 10",
+        "description": "Located in room 31",
+        "contamination": 0,
+        "date": "2022-01-01",
+        "url": "https://t4.ftcdn.net/jpg/05/00/56/83/360_F_500568328_HdltBEmUOLBcRfIQTzjSslOsfuH06OCh.jpg"
+    },
+    {
+        "name": "Dummy 11",
+        "description": "Located in room 33",
+        "contamination": 0,
+        "date": "2022-01-01",
+        "url": "https://t4.ftcdn.net/jpg/05/00/56/83/360_F_500568328_HdltBEmUOLBcRfIQTzjSslOsfuH06OCh.jpg"
+    },
+    {
+        "name": "Dummy 12",
+        "description": "Located in room 35",
+        "contamination": 0,
+        "date": "2022-01-01",
+        "url": "https://t4.ftcdn.net/jpg/05/00/56/83/360_F_500568328_HdltBEmUOLBcRfIQTzjSslOsfuH06OCh.jpg"
+    }
+]
+
+def up(database: pw.Database):
+    """
+    Creates the initial schema.
+    """
+    for statement in SCHEMA:
+        database.execute_sql(statement)
+
+    for name in ROLES:
+        database.execute_sql(
+            'INSERT INTO "role" ("created_at", "updated_at", "name") '
+            "VALUES (NOW(), NOW(), %s) ON CONFLICT DO NOTHING",
+            (name,)
+        )
+
+    if database.execute_sql('SELECT 1 FROM "camera" LIMIT 1').fetchone():
+        return
+    for camera in CAMERAS:
+        database.execute_sql(
+            'INSERT INTO "camera" '
+            '("created_at", "updated_at", "name", "description", "contamination", "date", "url") '
+            "VALUES (NOW(), NOW(), "
+            "%(name)s, %(description)s, %(contamination)s, %(date)s, %(url)s)",
+            camera
+        )
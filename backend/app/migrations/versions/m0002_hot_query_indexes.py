@@ -0,0 +1,16 @@
+"""
+Index for the hottest query: camera listing ordered by (date, id).
+Lookups of user data by user id are served by the foreign key indexes of
+the initial schema. Built concurrently, so writes are not blocked.
+"""
+import peewee as pw
+from backend.app.migrations.operations import create_index_concurrently
+from backend.app.models.camera import Camera
+
+TRANSACTIONAL = False
+
+def up(database: pw.Database):
+    """
+    Creates the index.
+    """
+    create_index_concurrently(database, "camera_date_id", [Camera.date, Camera.id])
@@ -0,0 +1,12 @@
+"""
+Widens password hashes to fit argon2 hashes.
+"""
+import peewee as pw
+
+def up(database: pw.Database):
+    """
+    Alters the column type.
+    """
+    database.execute_sql(
+        'ALTER TABLE "userlogindata" ALTER COLUMN "password_hash" TYPE VARCHAR(255)'
+    )
@@ -0,0 +1,27 @@
+"""
+History of camera contamination readings.
+The table is partitioned by month, so range queries only scan the months
+they cover and old months can be detached or dropped as a whole.
+The primary key index includes the contamination, so readings of a camera
+over a period are served by an index-only scan. The BRIN index on the time of
+the readings stays tiny and serves queries over all cameras, since readings
+are appended roughly in the order they were taken.
+"""
+import peewee as pw
+
+def up(database: pw.Database):
+    """
+    Creates the partitioned table and its indexes.
+    """
+    database.execute_sql(
+        'CREATE TABLE "camerareading" ('
+        '"camera_id" INTEGER NOT NULL REFERENCES "camera" ("id") ON DELETE CASCADE, '
+        '"taken_at" TIMESTAMP NOT NULL, '
+        '"contamination" REAL NOT NULL, '
+        'PRIMARY KEY ("camera_id", "taken_at") INCLUDE ("contamination")'
+        ') PARTITION BY RANGE ("taken_at")'
+    )
+    database.execute_sql(
+        'CREATE INDEX "camerareading_taken_at_brin" ON "camerareading" '
+        'USING BRIN ("taken_at")'
+    )
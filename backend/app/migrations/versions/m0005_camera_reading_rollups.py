@@ -0,0 +1,47 @@
+"""
+Hourly and daily aggregates of camera readings, so charts over long
+periods read one row per camera and hour or day instead of every reading.
+Aggregates of the readings stored so far are filled in.
+"""
+import peewee as pw
+
+ROLLUP_TABLE_SQL = """
+CREATE TABLE "{table}" (
+    "camera_id" INTEGER NOT NULL REFERENCES "camera" ("id") ON DELETE CASCADE,
+    "bucket" TIMESTAMP NOT NULL,
+    "readings" INTEGER NOT NULL,
+    "total" DOUBLE PRECISION NOT NULL,
+    "minimum" REAL NOT NULL,
+    "maximum" REAL NOT NULL,
+    "last_at" TIMESTAMP NOT NULL,
+    "last" REAL NOT NULL,
+    PRIMARY KEY ("camera_id", "bucket")
+)
+"""
+
+HOURLY_BACKFILL_SQL = """
+INSERT INTO "camerareading_hourly"
+SELECT "camera_id", date_trunc('hour', "taken_at"), count(*), sum("contamination"::float8),
+    min("contamination"), max("contamination"), max("taken_at"),
+    (array_agg("contamination" ORDER BY "taken_at" DESC))[1]
+FROM "camerareading"
+GROUP BY 1, 2
+"""
+
+DAILY_BACKFILL_SQL = """
+INSERT INTO "camerareading_daily"
+SELECT "camera_id", date_trunc('day', "bucket"), sum("readings"), sum("total"),
+    min("minimum"), max("maximum"), max("last_at"),
+    (array_agg("last" ORDER BY "last_at" DESC))[1]
+FROM "camerareading_hourly"
+GROUP BY 1, 2
+"""
+
+def up(database: pw.Database):
+    """
+    Creates the aggregate tables and fills them in.
+    """
+    database.execute_sql(ROLLUP_TABLE_SQL.format(table="camerareading_hourly"))
+    database.execute_sql(ROLLUP_TABLE_SQL.format(table="camerareading_daily"))
+    database.execute_sql(HOURLY_BACKFILL_SQL)
+    database.execute_sql(DAILY_BACKFILL_SQL)
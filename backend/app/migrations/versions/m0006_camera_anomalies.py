@@ -0,0 +1,36 @@
+"""
+Anomalous contamination readings, the checkpointed state of their detection
+and the time of the latest anomaly of every camera, listed with the cameras.
+"""
+import peewee as pw
+
+def up(database: pw.Database):
+    """
+    Creates the tables and the column.
+    """
+    database.execute_sql(
+        'CREATE TABLE "cameraanomaly" ('
+        '"id" SERIAL PRIMARY KEY, '
+        '"created_at" TIMESTAMP NOT NULL, '
+        '"updated_at" TIMESTAMP NOT NULL, '
+        '"camera_id" INTEGER NOT NULL REFERENCES "camera" ("id") ON DELETE CASCADE, '
+        '"taken_at" TIMESTAMP NOT NULL, '
+        '"contamination" REAL NOT NULL, '
+        '"expected" DOUBLE PRECISION NOT NULL, '
+        '"score" DOUBLE PRECISION NOT NULL'
+        ')'
+    )
+    # Anomalies of a camera are listed newest first
+    database.execute_sql(
+        'CREATE INDEX "cameraanomaly_camera_id_id" ON "cameraanomaly" ("camera_id", "id")'
+    )
+    database.execute_sql(
+        'CREATE TABLE "cameraanomaly_state" ('
+        '"camera_id" INTEGER PRIMARY KEY REFERENCES "camera" ("id") ON DELETE CASCADE, '
+        '"mean" DOUBLE PRECISION NOT NULL, '
+        '"variance" DOUBLE PRECISION NOT NULL, '
+        '"readings" INTEGER NOT NULL, '
+        '"last_at" TIMESTAMP NOT NULL'
+        ')'
+    )
+    database.execute_sql('ALTER TABLE "camera" ADD COLUMN "last_anomaly_at" TIMESTAMP')
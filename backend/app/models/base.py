@@ -10,30 +10,107 @@ from backend.app.config import (
     POSTGRES_PORT,
     POSTGRES_DB,
     POSTGRES_USER,
-    POSTGRES_PASSWORD
+    POSTGRES_PASSWORD,
+    POSTGRES_POOL_ENABLED,
+    POSTGRES_POOL_MAX_CONNECTIONS,
+    POSTGRES_POOL_STALE_TIMEOUT,
+    POSTGRES_POOL_TIMEOUT,
+    POSTGRES_REPLICA_HOSTS,
+    POSTGRES_REPLICA_MAX_LAG_SECONDS,
+    POSTGRES_REPLICA_CHECK_INTERVAL_SECONDS,
+    ASYNC_POSTGRES_POOL_MIN_SIZE,
+    ASYNC_POSTGRES_POOL_MAX_SIZE,
+    SLOW_QUERY_THRESHOLD_MS,
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    SLOW_QUERY_LOG_SIZE
 )
+from backend.app.utils.database import state, instrumentation
+from backend.app.utils.database.identity_map import current_identity_map
+from backend.app.utils.database.slow_queries import SlowQueryLog
+from backend.app.utils.database.replicas import ReplicaRouter
+from backend.app.utils.database.pool import InstrumentedPooledPostgresqlDatabase
+from backend.app.utils.database.async_db import AsyncDatabase
 
-db = pw.PostgresqlDatabase(
+def _create_database(host: str, port: str, metrics_prefix: str) -> pw.PostgresqlDatabase:
+    if POSTGRES_POOL_ENABLED == "true":
+        return InstrumentedPooledPostgresqlDatabase(
+            database=POSTGRES_DB,
+            user=POSTGRES_USER,
+            password=POSTGRES_PASSWORD,
+            host=host,
+            port=port,
+            metrics_prefix=metrics_prefix,
+            max_connections=int(POSTGRES_POOL_MAX_CONNECTIONS),
+            stale_timeout=int(POSTGRES_POOL_STALE_TIMEOUT),
+            timeout=int(POSTGRES_POOL_TIMEOUT)
+        )
+    return pw.PostgresqlDatabase(
+        database=POSTGRES_DB,
+        user=POSTGRES_USER,
+        password=POSTGRES_PASSWORD,
+        host=host,
+        port=port
+    )
+
+db = _create_database(POSTGRES_HOSTNAME, POSTGRES_PORT, "db_pool")
+
+replicas = []
+for index, address in enumerate(filter(None, POSTGRES_REPLICA_HOSTS.split(","))):
+    replica_host, _, replica_port = address.strip().partition(":")
+    replicas.append(_create_database(
+        replica_host, replica_port or POSTGRES_PORT, f"db_replica_{index}_pool"
+    ))
+
+# Pooled connections are bound to requests, see DatabaseConnectionMiddleware
+for database in (db, *replicas):
+    state.install(database)
+    instrumentation.install(database)
+
+# Reads of read_only service methods are served by replicas
+replica_router = ReplicaRouter(
+    db,
+    replicas,
+    max_lag=float(POSTGRES_REPLICA_MAX_LAG_SECONDS),
+    check_interval=float(POSTGRES_REPLICA_CHECK_INTERVAL_SECONDS)
+)
+replica_router.install()
+
+slow_query_log = SlowQueryLog(
+    db,
+    threshold=int(SLOW_QUERY_THRESHOLD_MS) / 1000,
+    sample_rate=float(SLOW_QUERY_EXPLAIN_SAMPLE_RATE),
+    capacity=int(SLOW_QUERY_LOG_SIZE)
+)
+slow_query_log.install()
+
+# Used by async endpoints, has its own pool
+async_db = AsyncDatabase(
+    min_size=int(ASYNC_POSTGRES_POOL_MIN_SIZE),
+    max_size=int(ASYNC_POSTGRES_POOL_MAX_SIZE),
     database=POSTGRES_DB,
     user=POSTGRES_USER,
     password=POSTGRES_PASSWORD,
     host=POSTGRES_HOSTNAME,
-    port=POSTGRES_PORT
+    port=int(POSTGRES_PORT)
 )
 
 class Base(pw.Model):
     """
-    Default database model
+    Default database model.
+    Rows loaded by primary key are shared within a request, together with
+    the relationships loaded on them, see identity_scope.
+    Only modified fields are validated and written on save.
     """
     id = pw.AutoField(primary_key=True)
-    created_at = pw.DateTimeField(default=pnd.now())
-    updated_at = pw.DateTimeField(default=pnd.now())
+    created_at = pw.DateTimeField(default=pnd.now)
+    updated_at = pw.DateTimeField(default=pnd.now)
 
     class Meta:
         """
         Metadata for the database model
         """
         database = db
+        only_save_dirty = True
 
     def to_dict(self):
         """Converts the object to a dictionary"""
@@ -46,6 +123,80 @@ class Base(pw.Model):
     def __str__(self):
         return self.to_json()
 
+    @classmethod
+    def get_by_id(cls, pk):
+        """
+        Get object by primary key. Within an identity scope the row
+        is loaded once and the same instance is returned afterwards.
+        """
+        identity_map = current_identity_map()
+        if identity_map is None:
+            return super().get_by_id(pk)
+
+        key = (cls, cls._meta.primary_key.adapt(pk))
+        instance = identity_map.get(key)
+        if instance is None:
+            instance = identity_map[key] = super().get_by_id(pk)
+        return instance
+
+    @classmethod
+    def remember(cls, instance):
+        """
+        Adds a loaded instance to the identity map of the current scope.
+        Returns the instance already known for the same row if there is one.
+        """
+        identity_map = current_identity_map()
+        if identity_map is None:
+            return instance
+        return identity_map.setdefault((cls, instance.get_id()), instance)
+
+    def related(self, name: str, loader):
+        """
+        Returns a relationship of the object, calling the loader only on first access.
+        """
+        relations = self.__dict__.setdefault("_related", {})
+        if name not in relations:
+            relations[name] = loader()
+        return relations[name]
+
+    def set_related(self, name: str, value):
+        """
+        Stores an already loaded relationship of the object.
+        """
+        self.__dict__.setdefault("_related", {})[name] = value
+
+    def forget_related(self, name: str = None):
+        """
+        Drops a loaded relationship of the object, or all of them,
+        so that it is loaded again on next access.
+        """
+        relations = self.__dict__.get("_related", {})
+        if name is None:
+            relations.clear()
+        else:
+            relations.pop(name, None)
+
+    def insert_values(self, *exclude: pw.Field) -> dict[pw.Field, pw.Value]:
+        """
+        Returns the values of the object for use in INSERT ... SELECT queries,
+        skipping the auto-generated id and the excluded fields.
+        """
+        # Fields are compared by name, == on fields builds an expression
+        excluded = {field.name for field in exclude}
+        return {
+            field: pw.Value(self.__data__.get(field.name), converter=field.db_value)
+            for field in self._meta.sorted_fields
+            if not (field.primary_key and self.__data__.get(field.name) is None)
+            and field.name not in excluded
+        }
+
+    def is_field_dirty(self, name: str) -> bool:
+        """
+        Checks if the field has been set since the object was loaded or saved.
+        All fields set on a new object are dirty.
+        """
+        return name in self._dirty
+
     def validate(self):
         """
         Function to run validation on.
@@ -61,3 +212,10 @@ class Base(pw.Model):
 
         super().save(*args, **kwargs)
         return self
+
+    def delete_instance(self, *args, **kwargs):
+        """Delete the object from the database"""
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            identity_map.pop((type(self), self.get_id()), None)
+        return super().delete_instance(*args, **kwargs)
@@ -20,6 +20,8 @@ class Camera(Base):
 
     url = pw.CharField(null=True, max_length=500)
 
+    last_anomaly_at = pw.DateTimeField(null=True)
+
     def validate(self):
         """
         Function to run validation on.
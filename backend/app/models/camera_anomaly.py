@@ -0,0 +1,44 @@
+"""
+Objects representing anomalous contamination readings and the state of their detection.
+"""
+import peewee as pw
+from .base import Base, db
+from .camera import Camera
+
+class CameraAnomaly(Base):
+    """
+    Object representing a contamination reading far from the usual readings of its camera.
+    expected - moving mean of the readings before it;
+    score - distance from the mean in standard deviations;
+    """
+    camera = pw.ForeignKeyField(Camera, on_delete="CASCADE", index=False)
+
+    taken_at = pw.DateTimeField()
+
+    contamination = pw.FloatField()
+
+    expected = pw.DoubleField()
+
+    score = pw.DoubleField()
+
+class CameraAnomalyState(pw.Model):
+    """
+    Checkpoint of the moving statistics of the readings of a camera.
+    last_at - time of the latest reading included, older readings are not scored;
+    """
+    camera = pw.ForeignKeyField(Camera, on_delete="CASCADE", primary_key=True)
+
+    mean = pw.DoubleField()
+
+    variance = pw.DoubleField()
+
+    readings = pw.IntegerField()
+
+    last_at = pw.DateTimeField()
+
+    class Meta:
+        """
+        Metadata for the database model
+        """
+        database = db
+        table_name = "cameraanomaly_state"
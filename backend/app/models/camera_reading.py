@@ -0,0 +1,74 @@
+"""
+Object representing a contamination reading of a camera.
+"""
+import logging
+from datetime import date, datetime
+from typing import Iterable
+import peewee as pw
+from .base import db
+from .camera import Camera
+
+logger = logging.getLogger(__name__)
+
+# Names of the partitions known to exist, to skip the DDL on every ingestion
+_partitions: set[str] = set()
+
+class CameraReading(pw.Model):
+    """
+    Object representing a contamination reading of a camera.
+    The table is partitioned by month of taken_at and created by a migration,
+    partitions are created on demand by ensure_partitions.
+    """
+    camera = pw.ForeignKeyField(Camera, on_delete="CASCADE", index=False)
+
+    taken_at = pw.DateTimeField()
+
+    contamination = pw.FloatField()
+
+    class Meta:
+        """
+        Metadata for the database model
+        """
+        database = db
+        table_name = "camerareading"
+        primary_key = pw.CompositeKey("camera", "taken_at")
+
+    @classmethod
+    def partition_name(cls, month: datetime) -> str:
+        """
+        Returns the name of the partition holding readings of the month.
+        """
+        return f"{cls._meta.table_name}_p{month:%Y%m}"
+
+    @classmethod
+    def ensure_partitions(cls, dates: Iterable[date]):
+        """
+        Creates the missing partitions for readings taken on the dates.
+        Must run outside of a transaction that inserts the readings,
+        so that the partitions stay even if the insertion fails.
+        """
+        months = {datetime(value.year, value.month, 1) for value in dates}
+        for month in sorted(months):
+            name = cls.partition_name(month)
+            if name in _partitions:
+                continue
+
+            following = datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+            try:
+                cls._meta.database.execute_sql(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF '
+                    f'"{cls._meta.table_name}" FOR VALUES FROM (%s) TO (%s)',
+                    (month, following)
+                )
+            except pw.IntegrityError:
+                # IF NOT EXISTS does not cover a concurrent creation by another worker
+                logger.info("Partition %s was created concurrently", name)
+            _partitions.add(name)
+
+    @classmethod
+    def forget_partitions(cls):
+        """
+        Forgets the partitions known to exist.
+        Call after dropping the table.
+        """
+        _partitions.clear()
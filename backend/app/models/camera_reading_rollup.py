@@ -0,0 +1,56 @@
+"""
+Objects representing contamination readings of a camera aggregated over time.
+"""
+import peewee as pw
+from .base import db
+from .camera import Camera
+
+class CameraReadingRollup(pw.Model):
+    """
+    Aggregate of the readings of a camera taken in a bucket of time.
+    Kept up to date when readings are stored, see ReadingService.
+    bucket - start of the bucket;
+    last - contamination of the latest reading, taken at last_at;
+    """
+    camera = pw.ForeignKeyField(Camera, on_delete="CASCADE", index=False)
+
+    bucket = pw.DateTimeField()
+
+    readings = pw.IntegerField()
+
+    total = pw.DoubleField()
+
+    minimum = pw.FloatField()
+
+    maximum = pw.FloatField()
+
+    last_at = pw.DateTimeField()
+
+    last = pw.FloatField()
+
+    class Meta:
+        """
+        Metadata for the database model
+        """
+        database = db
+        primary_key = pw.CompositeKey("camera", "bucket")
+
+class CameraReadingHourly(CameraReadingRollup):
+    """
+    Aggregate of the readings of a camera taken in an hour.
+    """
+    class Meta:
+        """
+        Metadata for the database model
+        """
+        table_name = "camerareading_hourly"
+
+class CameraReadingDaily(CameraReadingRollup):
+    """
+    Aggregate of the readings of a camera taken in a day.
+    """
+    class Meta:
+        """
+        Metadata for the database model
+        """
+        table_name = "camerareading_daily"
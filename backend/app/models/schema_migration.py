@@ -0,0 +1,23 @@
+"""
+Object representing an applied schema migration.
+"""
+import peewee as pw
+from .base import db
+
+class SchemaMigration(pw.Model):
+    """
+    Object representing an applied schema migration.
+    Managed by the migration runner, see backend.app.migrations.
+    """
+    version = pw.CharField(primary_key=True, max_length=4)
+
+    name = pw.CharField(max_length=100)
+
+    applied_at = pw.DateTimeField()
+
+    class Meta:
+        """
+        Metadata for the database model
+        """
+        database = db
+        table_name = "schema_migrations"
@@ -2,6 +2,7 @@
 Object representing the user account.
 """
 import peewee as pw
+import pendulum as pnd
 from .base import Base
 from .user_login_data import UserLoginData
 from .user_profile import UserProfile
@@ -17,36 +18,147 @@ class User(Base):
     @classmethod
     def get_by_username(cls, username: str):
         """
-        Get user by username.
+        Get user by username, with login data, profile and role loaded.
         """
-        user_login_data = UserLoginData.get(UserLoginData.username == username)
-        return cls.get_by_id(user_login_data.user.id)
+        return cls.get_with_relations(UserLoginData.username == username)
 
     @classmethod
     def get_by_email(cls, email: str):
         """
-        Get user by email.
+        Get user by email, with login data, profile and role loaded.
         """
-        user_login_data = UserLoginData.get(UserLoginData.email == email)
-        return cls.get_by_id(user_login_data.user.id)
+        return cls.get_with_relations(UserLoginData.email == email)
+
+    @classmethod
+    def select_with_relations(cls):
+        """
+        Selects users with their login data, profile and role in a single joined query.
+        Pass the results through with_relations to make the relationships available.
+        """
+        return (cls
+            .select(cls, UserLoginData, UserProfile, UserRole, Role)
+            .join(UserLoginData, pw.JOIN.LEFT_OUTER,
+                on=UserLoginData.user == cls.id, attr="_login_data")
+            .switch(cls)
+            .join(UserProfile, pw.JOIN.LEFT_OUTER,
+                on=UserProfile.user == cls.id, attr="_profile")
+            .switch(cls)
+            .join(UserRole, pw.JOIN.LEFT_OUTER,
+                on=UserRole.user == cls.id, attr="_user_role")
+            .join(Role, pw.JOIN.LEFT_OUTER,
+                on=UserRole.role == Role.id, attr="_role"))
+
+    @classmethod
+    def with_relations(cls, user: "User") -> "User":
+        """
+        Moves the relationships selected by select_with_relations into
+        the relationship cache and adds the user to the identity map.
+        """
+        login_data = user.__dict__.pop("_login_data", None)
+        profile = user.__dict__.pop("_profile", None)
+        user_role = user.__dict__.pop("_user_role", None)
+        role = user_role and user_role.__dict__.pop("_role", None)
+
+        user = cls.remember(user)
+        # Missing rows are left to the properties, which raise as before
+        if login_data is not None:
+            user.related("login_data", lambda: login_data)
+        if profile is not None:
+            user.related("profile", lambda: profile)
+        if role is not None:
+            user.related("role", lambda: role.name)
+        return user
+
+    @classmethod
+    def get_with_relations(cls, *expressions) -> "User":
+        """
+        Get user matching the expressions, with login data, profile and role
+        loaded in a single query.
+        """
+        return cls.with_relations(cls.select_with_relations().where(*expressions).get())
+
+    @classmethod
+    def prefetch(cls, user_id) -> "User":
+        """
+        Get user by id, with login data, profile and role loaded in a single query.
+        """
+        return cls.get_with_relations(cls.id == user_id)
+
+    @classmethod
+    def insert_with_login_data(cls, user: "User", login_data: UserLoginData, role_id: int):
+        """
+        Inserts the user with its role and login data in a single statement,
+        so that either all of the rows are created or none of them.
+        Sets the id of the user. Raises IntegrityError if the username or email is taken.
+        """
+        user_role = UserRole(role=role_id)
+        now = pnd.now()
+        for instance in (user, user_role, login_data):
+            instance.created_at = instance.updated_at = now
+            instance.validate()
+
+        role_values = user_role.insert_values(UserRole.user)
+        login_values = login_data.insert_values(UserLoginData.user)
+
+        new_user = cls.insert(user.insert_values()).returning(cls.id).cte("new_user")
+        new_role = (UserRole
+            .insert_from(
+                pw.Select((new_user,), (new_user.c.id, *role_values.values())),
+                [UserRole.user, *role_values])
+            .cte("new_role"))
+        query = (UserLoginData
+            .insert_from(
+                pw.Select((new_user,), (new_user.c.id, *login_values.values())),
+                [UserLoginData.user, *login_values])
+            .with_cte(new_user, new_role)
+            .returning(UserLoginData.user))
+
+        user.id = cls._meta.database.execute(query).fetchone()[0]
+        login_data.user = user
+        user.set_related("login_data", login_data)
+        cls.remember(user)
+
+    @classmethod
+    def select_accounts(cls):
+        """
+        Selects id, username, salt and role name of users in a single joined query.
+        """
+        return (cls
+            .select(
+                cls.id,
+                UserLoginData.username,
+                UserLoginData.auth_token_salt.alias("salt"),
+                Role.name.alias("role")
+            )
+            .join(UserLoginData, on=UserLoginData.user == cls.id)
+            .switch(cls)
+            .join(UserRole, on=UserRole.user == cls.id)
+            .join(Role, on=UserRole.role == Role.id))
 
     @property
     def login_data(self):
         """
         Property that returns the user login data.
+        Loaded once per object.
         """
-        return UserLoginData.get(user=self)
+        return self.related("login_data", lambda: UserLoginData.get(user=self))
 
     @property
     def profile(self):
         """
         Property that returns the user profile.
+        Loaded once per object.
         """
-        return UserProfile.get(user=self)
+        return self.related("profile", lambda: UserProfile.get(user=self))
 
     @property
     def role(self):
         """
         Property that returns the user role.
+        Loaded once per object.
         """
-        return Role.get_by_id(UserRole.get(user=self).role).name
+        return self.related("role", lambda: Role
+            .select(Role.name)
+            .join(UserRole, on=UserRole.role == Role.id)
+            .where(UserRole.user == self)
+            .scalar())
@@ -24,7 +24,7 @@ class UserLoginData(Base):
 
     email = pw.CharField(unique=True, max_length=50)
 
-    password_hash = pw.CharField(max_length=60)
+    password_hash = pw.CharField(max_length=255)
 
     auth_token_salt = pw.CharField(null=True, max_length=36)
 
@@ -0,0 +1,231 @@
+"""
+Service for statistics of contamination readings.
+"""
+import json
+import math
+import time
+import logging
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import peewee as pw
+from fastapi import HTTPException, status
+from backend.app.config import (
+    ANALYTICS_BUCKET_SECONDS,
+    ANALYTICS_MIN_BUCKET_SECONDS,
+    ANALYTICS_MAX_BUCKET_SECONDS,
+    ANALYTICS_MAX_BUCKETS,
+    ANALYTICS_CACHE_SIZE,
+    ANALYTICS_CACHE_TTL_SECONDS
+)
+from backend.app.models.base import replica_router
+from backend.app.models.camera_reading import CameraReading
+from backend.app.services.redis import RedisService as redis
+from backend.app.utils.caching.ttl_cache import TTLCache
+from backend.app.utils.database.replicas import read_only
+from backend.app.utils.statistics import QUANTILES, BucketStats, merge
+from backend.app.utils.validation.readings import ReadingBatch, to_utc
+from backend.app.dtos.analytics_service.dtos import ContaminationStats, ContaminationBucket
+from backend.app.dtos.analytics_service.responses import ContaminationAnalyticsResponse
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1)
+
+INVALIDATION_CHANNEL = "analytics:invalidation"
+
+# Statistics of completed buckets keyed by (camera id, bucket seconds, bucket number)
+bucket_cache = TTLCache(int(ANALYTICS_CACHE_SIZE))
+
+class AnalyticsService:
+    """
+    Service for statistics of contamination readings.
+    Readings are grouped into buckets aligned to multiples of their duration
+    since the epoch and aggregated by Postgres. Buckets which have ended
+    are cached, so repeated requests only aggregate the current bucket.
+    Readings arriving late for a cached bucket evict it on every worker.
+    """
+    # Number of evictions by this worker, aggregates started before one are not cached
+    _evictions = 0
+
+    @classmethod
+    def _bucket_seconds(cls, bucket_seconds: int | None) -> int:
+        if bucket_seconds is None:
+            return int(ANALYTICS_BUCKET_SECONDS)
+        minimum, maximum = int(ANALYTICS_MIN_BUCKET_SECONDS), int(ANALYTICS_MAX_BUCKET_SECONDS)
+        if not minimum <= bucket_seconds <= maximum:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Buckets must last between {ANALYTICS_MIN_BUCKET_SECONDS} "
+                    f"and {ANALYTICS_MAX_BUCKET_SECONDS} seconds"
+            )
+        return bucket_seconds
+
+    @classmethod
+    def _bucket_start(cls, number: int, bucket_seconds: int) -> datetime:
+        return EPOCH + timedelta(seconds=number * bucket_seconds)
+
+    @classmethod
+    def _aggregate(cls, camera_id: int | None, bucket_seconds: int,
+        first: int, last: int) -> dict[int, BucketStats]:
+        """
+        Aggregates the readings of the buckets first to last in one query.
+        Buckets without readings are missing from the result.
+        """
+        number = pw.fn.FLOOR(pw.fn.date_part("epoch", CameraReading.taken_at) / bucket_seconds)
+        sketch = pw.NodeList((
+            pw.fn.percentile_cont(pw.Cast(pw.Value(QUANTILES.tolist(), unpack=False), "float8[]")),
+            pw.SQL("WITHIN GROUP"),
+            pw.NodeList((pw.SQL("ORDER BY"), CameraReading.contamination), parens=True)
+        ))
+        query = (CameraReading
+            .select(
+                number,
+                pw.fn.COUNT(CameraReading.contamination),
+                pw.fn.SUM(CameraReading.contamination.cast("float8")),
+                sketch
+            )
+            .where(
+                (CameraReading.taken_at >= cls._bucket_start(first, bucket_seconds)) &
+                (CameraReading.taken_at < cls._bucket_start(last + 1, bucket_seconds))
+            )
+            .group_by(number))
+        if camera_id is not None:
+            query = query.where(CameraReading.camera == camera_id)
+
+        return {
+            int(bucket): BucketStats(count, total, np.asarray(values, dtype=float))
+            for bucket, count, total, values in query.tuples()
+        }
+
+    @classmethod
+    def _to_dto(cls, stats: BucketStats) -> dict:
+        if not stats.count:
+            return {"count": 0}
+        return {
+            "count": stats.count,
+            "min": float(stats.sketch[0]),
+            "max": float(stats.sketch[-1]),
+            "mean": stats.mean,
+            "p50": stats.quantile(0.5),
+            "p90": stats.quantile(0.9),
+            "p99": stats.quantile(0.99)
+        }
+
+    @classmethod
+    def _evict(cls, message: str):
+        # Messages are JSON lists of [camera id, first second, last second] of stored readings
+        spans = {camera_id: (first, last) for camera_id, first, last in json.loads(message)}
+
+        def stale(key: tuple) -> bool:
+            camera_id, bucket_seconds, number = key
+            span = spans.get(camera_id)
+            return (span is not None and
+                number * bucket_seconds <= span[1] and (number + 1) * bucket_seconds > span[0])
+
+        cls._evictions += 1
+        evicted = bucket_cache.discard_keys(stale)
+        logger.debug("Evicted %s cached buckets", evicted)
+
+    @classmethod
+    def start_invalidation_listener(cls):
+        """
+        Subscribes this worker to evictions caused by readings stored by other workers.
+        Must be called once on startup.
+        """
+        # Evictions missed while disconnected can not be told apart
+        return redis.subscribe(INVALIDATION_CHANNEL, cls._evict, bucket_cache.clear)
+
+    @classmethod
+    def evict_readings(cls, batch: ReadingBatch):
+        """
+        Evicts the cached buckets of the cameras, and of all cameras,
+        that the readings of a stored deduplicated batch fall into, on every worker.
+        Call after the readings are committed.
+        """
+        if not len(batch):
+            return
+        seconds = batch.taken_at.astype("datetime64[s]").astype("int64")
+        # Readings of a deduplicated batch are ordered by camera and time
+        cameras, first = np.unique(batch.camera_ids, return_index=True)
+        last = np.r_[first[1:], len(batch)] - 1
+        spans = [[None, int(seconds.min()), int(seconds.max())], *map(list, zip(
+            cameras.tolist(), seconds[first].tolist(), seconds[last].tolist()
+        ))]
+        message = json.dumps(spans)
+
+        cls._evict(message)
+        redis.publish(INVALIDATION_CHANNEL, message)
+        # Buckets may be cached again from a replica that has not seen the readings yet
+        replica_router.after_replication(lambda: cls._evict(message))
+
+    @classmethod
+    @read_only
+    def get_contamination(cls, start: datetime, end: datetime,
+        bucket_seconds: int = None, camera_id: int = None) -> ContaminationAnalyticsResponse:
+        """
+        Retrieves statistics of contamination readings of a camera, or of all
+        cameras, for every bucket of the period and for the whole period.
+        The period is widened to whole buckets.
+        """
+        bucket_seconds = cls._bucket_seconds(bucket_seconds)
+        start, end = to_utc(start), to_utc(end)
+        if start >= end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Start of the period must be before its end"
+            )
+
+        first = math.floor((start - EPOCH).total_seconds() / bucket_seconds)
+        last = math.ceil((end - EPOCH).total_seconds() / bucket_seconds) - 1
+        try:
+            cls._bucket_start(first, bucket_seconds)
+            cls._bucket_start(last + 1, bucket_seconds)
+        except OverflowError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="The period must lie within the years 1 to 9999 in whole buckets"
+            ) from e
+        if last - first + 1 > int(ANALYTICS_MAX_BUCKETS):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"The period must span at most {ANALYTICS_MAX_BUCKETS} buckets"
+            )
+
+        # Buckets from the current one on may still receive readings
+        current = math.floor(
+            (to_utc(datetime.now(timezone.utc)) - EPOCH).total_seconds() / bucket_seconds
+        )
+        buckets: dict[int, BucketStats] = {}
+        missing = []
+        for number in range(first, last + 1):
+            cached = bucket_cache.get((camera_id, bucket_seconds, number))
+            if cached is None:
+                missing.append(number)
+            else:
+                buckets[number] = cached
+
+        if missing:
+            evictions = cls._evictions
+            aggregated = cls._aggregate(camera_id, bucket_seconds, missing[0], missing[-1])
+            expires_at = time.time() + int(ANALYTICS_CACHE_TTL_SECONDS)
+            for number in missing:
+                buckets[number] = aggregated.get(number, BucketStats())
+                if number < current and evictions == cls._evictions:
+                    bucket_cache.set(
+                        (camera_id, bucket_seconds, number), buckets[number], expires_at
+                    )
+
+        return ContaminationAnalyticsResponse(
+            camera_id=camera_id,
+            start=cls._bucket_start(first, bucket_seconds),
+            end=cls._bucket_start(last + 1, bucket_seconds),
+            bucket_seconds=bucket_seconds,
+            summary=ContaminationStats(**cls._to_dto(merge(list(buckets.values())))),
+            buckets=[
+                ContaminationBucket(
+                    start=cls._bucket_start(number, bucket_seconds),
+                    **cls._to_dto(buckets[number])
+                )
+                for number in range(first, last + 1)
+            ]
+        )
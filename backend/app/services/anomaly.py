@@ -0,0 +1,208 @@
+"""
+Service for detecting anomalous contamination readings.
+"""
+from datetime import datetime
+import numpy as np
+import peewee as pw
+from fastapi import HTTPException, status
+from backend.app.config import (
+    ANOMALY_EWMA_ALPHA,
+    ANOMALY_Z_THRESHOLD,
+    ANOMALY_WARMUP_READINGS,
+    ANOMALIES_PAGE_SIZE,
+    ANOMALIES_PAGE_MAX_SIZE
+)
+from backend.app.models.camera import Camera
+from backend.app.models.camera_anomaly import CameraAnomaly, CameraAnomalyState
+from backend.app.utils.anomalies import EwmaState, Detection, detect
+from backend.app.utils.database.replicas import read_only
+from backend.app.utils.validation.readings import ReadingBatch
+from backend.app.dtos.camera_service.dtos import Anomaly
+from backend.app.dtos.camera_service.responses import AnomaliesResponse
+
+class AnomalyService:
+    """
+    Service for detecting anomalous contamination readings.
+    Readings are scored against the moving statistics of their camera as they
+    are stored. The statistics are checkpointed with every stored batch, so
+    detection never reads past readings.
+    """
+    @classmethod
+    def _load_states(cls, cameras: np.ndarray) -> tuple[EwmaState, np.ndarray]:
+        """
+        Loads the checkpoints of the cameras.
+        Returns their statistics and the times of their latest scored readings.
+        """
+        state = EwmaState(
+            np.zeros(len(cameras)),
+            np.zeros(len(cameras)),
+            np.zeros(len(cameras), dtype="int64")
+        )
+        last_at = np.full(len(cameras), np.datetime64(datetime.min, "us"))
+
+        checkpoints = (CameraAnomalyState
+            .select(
+                CameraAnomalyState.camera,
+                CameraAnomalyState.mean,
+                CameraAnomalyState.variance,
+                CameraAnomalyState.readings,
+                CameraAnomalyState.last_at
+            )
+            .where(CameraAnomalyState.camera.in_(cameras.tolist()))
+            .tuples())
+        for camera_id, mean, variance, readings, checkpoint_at in checkpoints:
+            index = np.searchsorted(cameras, camera_id)
+            state.mean[index] = mean
+            state.variance[index] = variance
+            state.count[index] = readings
+            last_at[index] = checkpoint_at
+        return state, last_at
+
+    @classmethod
+    def process(cls, batch: ReadingBatch):
+        """
+        Scores the readings of a stored batch, ordered by camera and time,
+        records the anomalous ones and checkpoints the statistics.
+        Must run in the transaction storing the batch, with its cameras locked,
+        so that batches of a camera are processed one after another.
+        Readings older than the latest scored reading of their camera are not scored.
+        """
+        cameras = np.unique(batch.camera_ids)
+        state, last_at = cls._load_states(cameras)
+        series = np.searchsorted(cameras, batch.camera_ids)
+        new = batch.taken_at > last_at[series]
+        if not new.any():
+            return
+
+        detection = detect(
+            series[new],
+            batch.contamination[new],
+            state,
+            alpha=float(ANOMALY_EWMA_ALPHA),
+            threshold=float(ANOMALY_Z_THRESHOLD),
+            warmup=int(ANOMALY_WARMUP_READINGS)
+        )
+        np.maximum.at(last_at, series[new], batch.taken_at[new])
+
+        updated = np.unique(series[new])
+        (CameraAnomalyState
+            .insert_many(
+                zip(
+                    cameras[updated].tolist(),
+                    state.mean[updated].tolist(),
+                    state.variance[updated].tolist(),
+                    state.count[updated].tolist(),
+                    last_at[updated].tolist()
+                ),
+                fields=[
+                    CameraAnomalyState.camera,
+                    CameraAnomalyState.mean,
+                    CameraAnomalyState.variance,
+                    CameraAnomalyState.readings,
+                    CameraAnomalyState.last_at
+                ]
+            )
+            .on_conflict(
+                conflict_target=[CameraAnomalyState.camera],
+                preserve=[
+                    CameraAnomalyState.mean,
+                    CameraAnomalyState.variance,
+                    CameraAnomalyState.readings,
+                    CameraAnomalyState.last_at
+                ]
+            )
+            .as_rowcount()
+            .execute())
+
+        if not detection.anomalous.any():
+            return
+        cls._record(batch.take(np.flatnonzero(new)), detection)
+
+    @classmethod
+    def _record(cls, readings: ReadingBatch, detection: Detection):
+        """
+        Stores the anomalous readings and moves the latest anomaly of their cameras forward.
+        """
+        flagged = np.flatnonzero(detection.anomalous)
+        CameraAnomaly.insert_many([
+            {
+                "camera": camera_id,
+                "taken_at": taken_at,
+                "contamination": contamination,
+                "expected": expected,
+                "score": score
+            }
+            for camera_id, taken_at, contamination, expected, score in zip(
+                readings.camera_ids[flagged].tolist(),
+                readings.taken_at[flagged].tolist(),
+                readings.contamination[flagged].tolist(),
+                detection.expected[flagged].tolist(),
+                detection.score[flagged].tolist()
+            )
+        ]).as_rowcount().execute()
+
+        # Readings are ordered by camera and time, the last flagged one of a camera is its latest
+        cameras = readings.camera_ids[flagged]
+        latest = flagged[np.r_[cameras[1:] != cameras[:-1], True]]
+        anomalies = pw.ValuesList(
+            list(zip(
+                readings.camera_ids[latest].tolist(),
+                readings.taken_at[latest].tolist()
+            )),
+            columns=("camera_id", "taken_at"),
+            alias="anomaly"
+        )
+        (Camera
+            .update(last_anomaly_at=pw.fn.GREATEST(Camera.last_anomaly_at, anomalies.c.taken_at))
+            .from_(anomalies)
+            .where(Camera.id == anomalies.c.camera_id)
+            .execute())
+
+    @classmethod
+    def _page_size(cls, limit: int | None) -> int:
+        if limit is None:
+            return int(ANOMALIES_PAGE_SIZE)
+        if not 1 <= limit <= int(ANOMALIES_PAGE_MAX_SIZE):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Page size must be between 1 and {ANOMALIES_PAGE_MAX_SIZE}"
+            )
+        return limit
+
+    @classmethod
+    @read_only
+    def get_anomalies(cls, camera_id: int = None, before_id: int = None,
+        limit: int = None) -> AnomaliesResponse:
+        """
+        Retrieves anomalies of a camera, or of all cameras, newest first.
+        """
+        page_size = cls._page_size(limit)
+        query = (CameraAnomaly
+            .select(
+                CameraAnomaly.id,
+                CameraAnomaly.camera.alias("camera_id"),
+                Camera.name.alias("camera_name"),
+                CameraAnomaly.taken_at,
+                CameraAnomaly.contamination,
+                CameraAnomaly.expected,
+                CameraAnomaly.score,
+                CameraAnomaly.created_at.alias("detected_at")
+            )
+            .join(Camera)
+            .order_by(CameraAnomaly.id.desc())
+            .limit(page_size + 1))
+        if camera_id is not None:
+            query = query.where(CameraAnomaly.camera == camera_id)
+        if before_id is not None:
+            query = query.where(CameraAnomaly.id < before_id)
+
+        rows = list(query.dicts())
+        next_before_id = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_before_id = rows[-1]["id"]
+
+        return AnomaliesResponse(
+            anomalies=[Anomaly(**row) for row in rows],
+            next_before_id=next_before_id
+        )
@@ -1,8 +1,13 @@
 """
 Service for authenticating users.
 """
-import json
+import uuid
+import time
+import threading
+import struct
+import hashlib
 import logging
+from typing import Annotated, Callable
 import jwt
 import pendulum as pnd
 import pydantic as pyd
@@ -15,85 +20,122 @@ from backend.app.config import (
     JWT_REFRESH_EXPIRE_MINUTES,
     JWT_ISSUER,
     JWT_AUDIENCE,
-    JWT_ALGORITHM
+    JWT_ALGORITHM,
+    JWT_KEYS_DIR,
+    JWT_ACTIVE_KID,
+    TOKEN_CACHE_MAX_SIZE,
+    TOKEN_CACHE_TTL_SECONDS,
+    TOKEN_BATCH_MAX_SIZE,
+    ACCOUNT_CACHE_TTL_SECONDS,
+    TERMINATION_SYNC_INTERVAL_SECONDS
 )
+from backend.app.models.base import db, replica_router
 from backend.app.models.user import User
 from backend.app.models.user_login_data import UserLoginData
-from backend.app.models.user_role import UserRole
-from backend.app.models.role import Role
+from backend.app.models.user_termination import UserTermination
 from backend.app.dtos.auth_service.dtos import TokenData, UserAccount
 from backend.app.dtos.auth_service.requests import (
     ValidateAccessTokenRequest,
+    ValidateAccessTokensRequest,
     RefreshTokenRequest,
-    LoginRequest
+    LoginRequest,
+    ChangePasswordRequest
 )
 from backend.app.dtos.auth_service.responses import (
     RefreshTokenResponse,
     ValidateAccessTokenResponse,
-    LoginResponse
+    ValidateAccessTokensResponse,
+    TokenValidationResult,
+    LoginResponse,
+    JwksResponse,
+    RevokedSaltsResponse
 )
-from backend.app.utils.security.hashing import verify_password
+from backend.app.utils.security.hashing import (
+    hash_password,
+    verify_password,
+    verify_and_update_password
+)
+from backend.app.utils.security.keys import KeyRing
+from backend.app.utils.caching.ttl_cache import TTLCache
+from backend.app.utils.database.state import connection_scope
+from backend.app.utils.database.replicas import read_only
+from backend.app.utils.metrics.registry import Counter
 from backend.app.services.redis import RedisService as redis
+from backend.app.services.throttle import ThrottleService
+from backend.app.services.role import RoleService
+from backend.app.utils.security.permissions import Permission
 
 logger = logging.getLogger(__name__)
 
 http_bearer_scheme = HTTPBearer()
 
+TOKEN_INVALIDATION_CHANNEL = "auth:token_invalidation"
+REVOKED_SALTS_FEED = "auth:revoked_salts"
+TERMINATION_CHANNEL = "auth:terminations"
+
+key_ring = KeyRing(
+    JWT_ALGORITHM,
+    shared_key=JWT_KEY,
+    keys_dir=JWT_KEYS_DIR,
+    active_kid=JWT_ACTIVE_KID
+)
+
+account_cache_hits = Counter(
+    "auth_account_cache_hits_total", "Accounts served from the Redis cache")
+account_cache_misses = Counter(
+    "auth_account_cache_misses_total", "Accounts loaded from the database")
+
 class AuthService:
     """
     Service for authenticating users.
     """
-    @classmethod
-    def _generate_token(cls, user_id: str, token_type: str) -> str:
-        user: User
-        user_login_data: UserLoginData
-        role: Role
-        try:
-            user = User.get_by_id(user_id)
-        except pw.DataError:
-            logger.error("Attempted to generate token for non-existent user")
-            raise
-
-        try:
-            user_login_data = UserLoginData.get(user=user)
-        except pw.DataError:
-            logger.error("Login data for user %s not found", user_id)
-            raise
+    # Validated tokens by digest, shared by all requests of this worker
+    _token_cache = TTLCache(int(TOKEN_CACHE_MAX_SIZE))
 
-        try:
-            role = Role.get_by_id(UserRole.get(user=user).role)
-
-        except pw.DataError:
-            logger.error("Role for user %s not found", user_id)
-            raise
+    # Mirror of the terminated users set in Redis
+    _terminated_users: set[int] = set()
 
+    @classmethod
+    def _sign_token(cls, account: UserAccount, token_type: str) -> str:
         encoded_jwt: str
         try:
-            exipre = pnd.now()
+            expire = pnd.now()
             if token_type == "access":
-                exipre += pnd.duration(minutes=int(JWT_ACCESS_EXPIRE_MINUTES))
+                expire += pnd.duration(minutes=int(JWT_ACCESS_EXPIRE_MINUTES))
             elif token_type == "refresh":
-                exipre += pnd.duration(minutes=int(JWT_REFRESH_EXPIRE_MINUTES))
+                expire += pnd.duration(minutes=int(JWT_REFRESH_EXPIRE_MINUTES))
 
             data = TokenData(
-                user_id=user.id,
-                username=user_login_data.username,
-                role=role.name,
+                user_id=account.id,
+                username=account.username,
+                role=account.role,
                 token_type=token_type,
-                salt=user_login_data.auth_token_salt,
-                exp=exipre,
+                salt=account.salt,
+                exp=expire,
                 iss=JWT_ISSUER,
                 aud=JWT_AUDIENCE
             ).dict()
 
-            encoded_jwt = jwt.encode(data, JWT_KEY, algorithm=JWT_ALGORITHM)
+            encoded_jwt = jwt.encode(
+                data,
+                key_ring.signing_key,
+                algorithm=JWT_ALGORITHM,
+                headers=key_ring.signing_headers
+            )
 
         except Exception:
-            logger.error("Failed generating token for user %s ", user_id)
+            logger.error("Failed generating token for user %s ", account.id)
             raise
 
         return encoded_jwt
 
+    @classmethod
+    def _sign_token_pair(cls, account: UserAccount) -> RefreshTokenResponse:
+        return RefreshTokenResponse(
+            access_token=cls._sign_token(account, "access"),
+            refresh_token=cls._sign_token(account, "refresh")
+        )
+
     @classmethod
     def _validate_token(cls, token: str, token_type: str) -> UserAccount:
 
@@ -103,34 +145,30 @@ class AuthService:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+        token_digest = hashlib.sha256(token.encode("utf-8")).digest()
+        cached = cls._token_cache.get(token_digest)
+        if cached is not None:
+            cached_account, cached_token_type = cached
+            if cached_token_type != token_type:
+                raise credentials_exception
+            cls._ensure_not_terminated(cached_account.id)
+            return cached_account
+
         try:
+            key = key_ring.verification_key(jwt.get_unverified_header(token).get("kid"))
+            if key is None:
+                raise jwt.InvalidKeyError("Unknown key id")
+
             # Decode token and parse data as TokenData object
             data = TokenData(**jwt.decode(
                 token,
-                key=JWT_KEY,
+                key=key,
                 algorithms=[JWT_ALGORITHM],
                 audience=JWT_AUDIENCE,
                 issuer=JWT_ISSUER
                 ))
 
-            account: UserAccount
-
-            # Add user to Redis if it is not there yet
-            if not redis.exists(f"user:{data.user_id}"):
-                user = User.get_by_id(data.user_id)
-
-                account = UserAccount(
-                    id=user.id,
-                    username=user.login_data.username,
-                    role=user.role,
-                    salt=user.login_data.auth_token_salt
-                )
-                redis.set(f"user:{data.user_id}", account.json())
-
-            # Get user from Redis
-            redis_user = json.loads(redis.get(f"user:{data.user_id}"))
-            print(redis_user)
-            account = UserAccount(**redis_user)
+            account = cls._get_account(data.user_id)
 
             # Validate salt
             if account.salt != data.salt:
@@ -140,6 +178,15 @@ class AuthService:
             if data.token_type != token_type:
                 raise credentials_exception
 
+            cls._ensure_not_terminated(account.id)
+
+            # Cache the result, never beyond the token expiration
+            cls._token_cache.set(
+                token_digest,
+                (account, data.token_type),
+                min(data.exp.timestamp(), time.time() + int(TOKEN_CACHE_TTL_SECONDS))
+            )
+
             return account
 
         # TODO: review exception handling on FastAPI side
@@ -149,26 +196,297 @@ class AuthService:
         except jwt.InvalidTokenError as e:
             logger.warning("Token is invalid: %s", e)
             raise credentials_exception from e
-        except pw.DataError as e:
+        except (pw.DataError, pw.DoesNotExist) as e:
             logger.error("Could not find user: %s", e)
             raise credentials_exception from e
         except Exception as e:
             logger.error("Token validation failed: %s", e)
             raise e
 
+    @classmethod
+    def _pack_account(cls, account: UserAccount) -> bytes:
+        # Id followed by length-prefixed strings, -1 length stands for None
+        packed = [struct.pack(">q", account.id)]
+        for value in (account.username, account.role, account.salt):
+            if value is None:
+                packed.append(struct.pack(">h", -1))
+                continue
+            encoded = value.encode("utf-8")
+            packed.append(struct.pack(">h", len(encoded)))
+            packed.append(encoded)
+        return b"".join(packed)
+
+    @classmethod
+    def _unpack_account(cls, packed: bytes) -> UserAccount:
+        (account_id,) = struct.unpack_from(">q", packed)
+        offset = 8
+        values = []
+        for _ in range(3):
+            (length,) = struct.unpack_from(">h", packed, offset)
+            offset += 2
+            if length < 0:
+                values.append(None)
+                continue
+            values.append(packed[offset:offset + length].decode("utf-8"))
+            offset += length
+
+        username, role, salt = values
+        return UserAccount.model_construct(id=account_id, username=username, role=role, salt=salt)
+
+    @classmethod
+    @read_only
+    def _get_account(cls, user_id: int | str) -> UserAccount:
+        """
+        Returns the user account from Redis, loading it from the database on a miss.
+        """
+        key = f"account:{user_id}"
+
+        packed = redis.get_bytes(key)
+        if packed is not None:
+            account_cache_hits.inc()
+            return cls._unpack_account(packed)
+
+        account_cache_misses.inc()
+        row = User.select_accounts().where(User.id == user_id).dicts().get()
+        account = UserAccount(**row)
+        redis.set(key, cls._pack_account(account), ttl=int(ACCOUNT_CACHE_TTL_SECONDS))
+        return account
+
+    @classmethod
+    @read_only
+    def _get_accounts(cls, user_ids: set[int]) -> dict[int, UserAccount]:
+        """
+        Returns many user accounts with one Redis MGET and at most one
+        database query for the accounts missing from Redis.
+        """
+        user_ids = list(user_ids)
+        accounts: dict[int, UserAccount] = {}
+        missing: list[int] = []
+
+        for user_id, packed in zip(
+            user_ids, redis.get_many([f"account:{user_id}" for user_id in user_ids])):
+            if packed is None:
+                missing.append(user_id)
+            else:
+                accounts[user_id] = cls._unpack_account(packed)
+
+        account_cache_hits.inc(len(accounts))
+        account_cache_misses.inc(len(missing))
+
+        if missing:
+            loaded = {}
+            for row in User.select_accounts().where(User.id.in_(missing)).dicts():
+                account = UserAccount(**row)
+                accounts[account.id] = account
+                loaded[f"account:{account.id}"] = cls._pack_account(account)
+
+            if loaded:
+                redis.set_many(loaded, ttl=int(ACCOUNT_CACHE_TTL_SECONDS))
+
+        return accounts
+
+    @classmethod
+    def _evict_cached_tokens(cls, user_id: int | str):
+        evicted = cls._token_cache.discard_where(
+            lambda cached: cached[0].id == int(user_id)
+        )
+        logger.debug("Evicted %s cached tokens of user %s", evicted, user_id)
+
+    @classmethod
+    def start_token_invalidation_listener(cls):
+        """
+        Subscribes this worker to token invalidations issued by other workers.
+        Must be called once on startup.
+        """
+        # Invalidations missed while disconnected can not be told apart
+        return redis.subscribe(
+            TOKEN_INVALIDATION_CHANNEL, cls._evict_cached_tokens, cls._token_cache.clear
+        )
+
+    @classmethod
+    def rotate_token_salt(cls, user_id: int | str):
+        """
+        Assigns a new token salt to the user, which revokes all of their tokens.
+        Cached tokens of the user are dropped on every worker and the old salt
+        is published in the revocation feed.
+        """
+        old_salt = (UserLoginData
+            .select(UserLoginData.auth_token_salt)
+            .where(UserLoginData.user == user_id)
+            .scalar())
+        if old_salt is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+
+        UserLoginData.update(
+            auth_token_salt=str(uuid.uuid4()),
+            updated_at=pnd.now()
+        ).where(UserLoginData.user == user_id).execute()
+
+        redis.delete(f"account:{user_id}")
+        # The account may be cached again from a replica that has not seen the new salt yet
+        replica_router.after_replication(lambda: redis.delete(f"account:{user_id}"))
+        cls._evict_cached_tokens(user_id)
+        redis.publish(TOKEN_INVALIDATION_CHANNEL, str(user_id))
+
+        # Tokens can not outlive the longest token lifetime
+        redis.add_to_feed(REVOKED_SALTS_FEED, old_salt, int(JWT_REFRESH_EXPIRE_MINUTES) * 60)
+
+    @classmethod
+    def _ensure_not_terminated(cls, user_id: int):
+        if user_id in cls._terminated_users:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Account has been terminated"
+            )
+
+    @classmethod
+    def _on_termination_change(cls, message: str):
+        # Messages are "+<user id>" on termination and "-<user id>" on restoration
+        user_id = int(message[1:])
+        if message[0] == "+":
+            cls._terminated_users.add(user_id)
+        else:
+            cls._terminated_users.discard(user_id)
+
+    @classmethod
+    def sync_terminated_users(cls):
+        """
+        Replaces the terminated users of this worker with the ones in the database.
+        Catches up on terminations whose messages were missed and on direct table changes.
+        """
+        with connection_scope(db):
+            cls._terminated_users = {
+                user_id for (user_id,) in UserTermination.select(UserTermination.user).tuples()
+            }
+
+    @classmethod
+    def start_termination_listener(cls):
+        """
+        Loads the terminated users from the database into this worker,
+        subscribes to changes made by other workers and reloads them
+        periodically in a background daemon thread.
+        Must be called once on startup.
+        """
+        thread = redis.subscribe(
+            TERMINATION_CHANNEL, cls._on_termination_change, cls.sync_terminated_users
+        )
+
+        cls.sync_terminated_users()
+        logger.info("Loaded %s terminated users", len(cls._terminated_users))
+
+        def run():
+            stop = threading.Event()
+            while not stop.wait(float(TERMINATION_SYNC_INTERVAL_SECONDS)):
+                try:
+                    cls.sync_terminated_users()
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logger.error("Synchronization of terminated users failed: %s", e)
+
+        threading.Thread(target=run, name="termination-sync", daemon=True).start()
+        return thread
+
+    @classmethod
+    def terminate_user(cls, user_id: int, reason: str = None):
+        """
+        Terminates the user account. All tokens of the user are revoked
+        and further authentication is denied on every worker.
+        """
+        try:
+            UserTermination.insert(
+                user=user_id,
+                reason=reason,
+                termination_date=pnd.now(),
+                created_at=pnd.now(),
+                updated_at=pnd.now()
+            ).on_conflict_ignore().execute()
+        except pw.IntegrityError as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            ) from e
+
+        cls._terminated_users.add(int(user_id))
+        redis.publish(TERMINATION_CHANNEL, f"+{user_id}")
+
+        cls.rotate_token_salt(user_id)
+
+    @classmethod
+    def restore_user(cls, user_id: int):
+        """
+        Lifts the termination of the user account.
+        """
+        UserTermination.delete().where(UserTermination.user == user_id).execute()
+
+        cls._terminated_users.discard(int(user_id))
+        redis.publish(TERMINATION_CHANNEL, f"-{user_id}")
+
+    @classmethod
+    def get_jwks(cls) -> JwksResponse:
+        """
+        Public keys for verifying tokens without calling this service.
+        """
+        return JwksResponse(**key_ring.jwks())
+
+    @classmethod
+    def get_revoked_salts(cls, since: float = 0) -> RevokedSaltsResponse:
+        """
+        Salts revoked after the given timestamp. Tokens carrying any of them
+        must be rejected by services that verify tokens locally.
+        """
+        revoked = redis.read_feed(REVOKED_SALTS_FEED, since)
+        return RevokedSaltsResponse(
+            salts=[salt for salt, _ in revoked],
+            cursor=revoked[-1][1] if revoked else since
+        )
+
+    @classmethod
+    def _load_account(cls, user_id: int | str) -> UserAccount:
+        """
+        Loads the user, login data and role in a single query.
+        Unlike _get_account, bypasses the account cache and replicas,
+        so that issued tokens carry the current salt.
+        """
+        try:
+            row = User.select_accounts().where(User.id == user_id).dicts().get()
+        except (pw.DataError, pw.DoesNotExist):
+            logger.error("Attempted to generate tokens for non-existent user %s", user_id)
+            raise
+
+        return UserAccount(**row)
+
+    @classmethod
+    def issue_token_pair(cls, user_id: int | str) -> RefreshTokenResponse:
+        """
+        Generate access and refresh tokens for user.
+        """
+        return cls._sign_token_pair(cls._load_account(user_id))
+
+    @classmethod
+    def issue_token_pairs(cls, user_ids: list[int | str]) -> dict[int, RefreshTokenResponse]:
+        """
+        Generate access and refresh tokens for many users at once, e.g. after
+        a bulk salt rotation. Users that do not exist are omitted from the result.
+        """
+        rows = User.select_accounts().where(User.id.in_(user_ids)).dicts()
+
+        return {row["id"]: cls._sign_token_pair(UserAccount(**row)) for row in rows}
+
     @classmethod
     def generate_access_token(cls, user_id: str) -> str:
         """
         Generate access token for user.
         """
-        return cls._generate_token(user_id, "access")
+        return cls._sign_token(cls._load_account(user_id), "access")
 
     @classmethod
     def generate_refresh_token(cls, user_id: str) -> str:
         """
         Generate refresh token for user.
         """
-        return cls._generate_token(user_id, "refresh")
+        return cls._sign_token(cls._load_account(user_id), "refresh")
 
     @classmethod
     def validate_access_token(
@@ -182,6 +500,76 @@ class AuthService:
             is_valid=user is not None
         )
 
+    @classmethod
+    def validate_access_tokens(
+        cls, request: ValidateAccessTokensRequest) -> ValidateAccessTokensResponse:
+        """
+        Validate many access tokens at once. Duplicate tokens are validated once
+        and all referenced accounts are resolved together.
+        """
+        if len(request.access_tokens) > int(TOKEN_BATCH_MAX_SIZE):
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {TOKEN_BATCH_MAX_SIZE} tokens can be validated at once"
+            )
+
+        results: dict[str, UserAccount | None] = {}
+        decoded: dict[str, tuple[bytes, dict]] = {}
+
+        for token in dict.fromkeys(request.access_tokens):
+            token_digest = hashlib.sha256(token.encode("utf-8")).digest()
+            cached = cls._token_cache.get(token_digest)
+            if cached is not None:
+                cached_account, cached_token_type = cached
+                results[token] = (
+                    cached_account
+                    if cached_token_type == "access" and
+                    cached_account.id not in cls._terminated_users
+                    else None
+                )
+                continue
+
+            try:
+                key = key_ring.verification_key(jwt.get_unverified_header(token).get("kid"))
+                if key is None:
+                    raise jwt.InvalidKeyError("Unknown key id")
+
+                claims = jwt.decode(
+                    token,
+                    key=key,
+                    algorithms=[JWT_ALGORITHM],
+                    audience=JWT_AUDIENCE,
+                    issuer=JWT_ISSUER,
+                    options={"require": ["exp", "user_id", "salt", "token_type"]}
+                )
+                decoded[token] = (token_digest, claims)
+            except jwt.InvalidTokenError as e:
+                logger.debug("Token in batch is invalid: %s", e)
+                results[token] = None
+
+        accounts = cls._get_accounts({int(claims["user_id"]) for _, claims in decoded.values()})
+
+        for token, (token_digest, claims) in decoded.items():
+            account = accounts.get(int(claims["user_id"]))
+            if (account is None or
+                account.id in cls._terminated_users or
+                account.salt != claims["salt"] or
+                claims["token_type"] != "access"):
+                results[token] = None
+                continue
+
+            results[token] = account
+            cls._token_cache.set(
+                token_digest,
+                (account, "access"),
+                min(claims["exp"], time.time() + int(TOKEN_CACHE_TTL_SECONDS))
+            )
+
+        return ValidateAccessTokensResponse(results=[
+            TokenValidationResult(is_valid=results[token] is not None, account=results[token])
+            for token in request.access_tokens
+        ])
+
     @classmethod
     def refresh_tokens(cls, request: RefreshTokenRequest) -> RefreshTokenResponse:
         """
@@ -191,23 +579,27 @@ class AuthService:
         if user is None:
             raise RuntimeError("Could not validate token")
 
-        access_token = cls.generate_access_token(user)
-        refresh_token = cls.generate_refresh_token(user)
-        return RefreshTokenResponse(
-            access_token=access_token,
-            refresh_token=refresh_token
-        )
+        # The validated account already holds everything the tokens need
+        return cls._sign_token_pair(user)
 
     @classmethod
-    def login(cls, request=LoginRequest) -> LoginResponse:
+    def login(cls, request: LoginRequest, client_ip: str = None) -> LoginResponse:
         """
         Validate user credentials and return access token.
+        Attempts are throttled per username and client IP before any other work.
         """
-        user: User
-        user_login_data: UserLoginData
+        ThrottleService.check_login(request.username, client_ip)
+
+        row: dict
         try:
-            user = User.get_by_username(request.username)
-            user_login_data = UserLoginData.get(user=user)
+            row = (User.select_accounts()
+                .select_extend(
+                    UserLoginData.password_hash,
+                    UserLoginData.is_email_confirmed
+                )
+                .where(UserLoginData.username == request.username)
+                .dicts()
+                .get())
         except Exception as e:
             logger.warning(
                 "Attempt to login in to user %s that was not found: %s"
@@ -218,22 +610,75 @@ class AuthService:
                 detail="Invalid credentials"
             ) from e
 
-        if (not user_login_data.is_email_confirmed or
-            not verify_password(request.password, user_login_data.password_hash)):
+        is_valid = False
+        new_hash = None
+        if row["is_email_confirmed"]:
+            is_valid, new_hash = verify_and_update_password(
+                request.password, row["password_hash"], route="login"
+            )
+
+        if not is_valid:
             logger.warning(
                 "Attempt to login in to user %s with invalid credentials",
-                user.login_data.username
+                row["username"]
             )
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials"
             )
 
+        # Checked only with valid credentials, so the status of an account is not disclosed
+        # to anyone knowing its username. Terminated accounts are neither rehashed nor reset.
+        cls._ensure_not_terminated(row["id"])
+
+        # Transparently upgrade hashes made with outdated parameters
+        if new_hash is not None:
+            logger.info("Rehashing password of user %s", row["username"])
+            UserLoginData.update(
+                password_hash=new_hash,
+                updated_at=pnd.now()
+            ).where(UserLoginData.user == row["id"]).execute()
+
+        ThrottleService.reset_login(request.username)
+
+        tokens = cls._sign_token_pair(UserAccount(
+            id=row["id"],
+            username=row["username"],
+            role=row["role"],
+            salt=row["salt"]
+        ))
         return LoginResponse(
-            access_token=cls.generate_access_token(user.id),
-            refresh_token=cls.generate_refresh_token(user.id)
+            access_token=tokens.access_token,
+            refresh_token=tokens.refresh_token
         )
 
+    @classmethod
+    def change_password(
+        cls, user_id: int, request: ChangePasswordRequest) -> RefreshTokenResponse:
+        """
+        Replaces the password of the user and revokes all of their tokens.
+        Returns a new token pair, so that the current session goes on.
+        """
+        password_hash = (UserLoginData
+            .select(UserLoginData.password_hash)
+            .where(UserLoginData.user == user_id)
+            .scalar())
+
+        if not verify_password(request.current_password, password_hash, route="login"):
+            logger.warning("Attempt to change password of user %s with invalid password", user_id)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid credentials"
+            )
+
+        UserLoginData.update(
+            password_hash=hash_password(request.new_password, route="registration"),
+            updated_at=pnd.now()
+        ).where(UserLoginData.user == user_id).execute()
+
+        cls.rotate_token_salt(user_id)
+        return cls.issue_token_pair(user_id)
+
     @classmethod
     def authenticate(cls, credentials: HTTPAuthorizationCredentials = Depends(http_bearer_scheme)):
         """
@@ -248,3 +693,21 @@ class AuthService:
             )
 
         return user
+
+    @classmethod
+    def authorize(cls, required: Permission) -> Callable[..., UserAccount]:
+        """
+        Creates a dependency for controller methods that require permissions.
+        Authenticates the user and checks their role against the precomputed
+        permission bitset.
+        """
+        def dependency(user: Annotated[UserAccount, Depends(cls.authenticate)]) -> UserAccount:
+            if not RoleService.has_permissions(user.role, required):
+                logger.warning("User %s lacks permissions %s", user.username, required)
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Insufficient permissions"
+                )
+            return user
+
+        return dependency
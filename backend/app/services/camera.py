@@ -2,16 +2,139 @@
 Service for working with cameras.
 Designed to display the possible business-process.
 """
+import math
+import base64
+import asyncio
+import binascii
+from datetime import datetime
 from fastapi import HTTPException, status
+import peewee as pw
+from backend.app.config import (
+    CAMERA_PAGE_SIZE,
+    CAMERA_PAGE_MAX_SIZE,
+    CAMERA_COUNT_CACHE_TTL_SECONDS
+)
+from backend.app.models.base import async_db
 from backend.app.models.camera import Camera
+from backend.app.services.redis import RedisService as redis
+from backend.app.utils.database.replicas import read_only
 from backend.app.dtos.camera_service.dtos import Camera as CameraDto
 from backend.app.dtos.camera_service.responses import CamerasResponse
+
+COUNT_KEY = "cameras:count"
+
 class CameraService:
     """
     Service for working with cameras.
     Designed to display the possible business-process.
+    Cameras are listed newest first, ordered by (date, id).
+    The number of cameras is cached in Redis, anything inserting or deleting
+    cameras drops it with invalidate_count.
     """
     @classmethod
+    def _get_cached_count(cls) -> int | None:
+        count = redis.get_bytes(COUNT_KEY)
+        return None if count is None else int(count)
+
+    @classmethod
+    def _cache_count(cls, count: int):
+        # Another worker may have cached a newer count meanwhile
+        redis.set_if_absent(COUNT_KEY, count, int(CAMERA_COUNT_CACHE_TTL_SECONDS))
+
+    @classmethod
+    def _cached_count(cls) -> int:
+        count = cls._get_cached_count()
+        if count is None:
+            count = Camera.select().count()  # pylint: disable=no-value-for-parameter
+            cls._cache_count(count)
+        return count
+
+    @classmethod
+    def invalidate_count(cls):
+        """
+        Drops the cached number of cameras.
+        Call after inserting or deleting cameras.
+        """
+        redis.delete(COUNT_KEY)
+
+    @classmethod
+    def _select_dto_fields(cls) -> pw.ModelSelect:
+        return Camera.select(
+            Camera.id,
+            Camera.name,
+            Camera.description,
+            Camera.contamination,
+            Camera.date,
+            Camera.url,
+            Camera.last_anomaly_at
+        )
+
+    @classmethod
+    def _encode_cursor(cls, camera: CameraDto, page: int) -> str:
+        value = f"{camera.date.isoformat()}|{camera.id}|{page}"
+        return base64.urlsafe_b64encode(value.encode("utf-8")).decode("ascii")
+
+    @classmethod
+    def _decode_cursor(cls, cursor: str) -> tuple[datetime, int, int]:
+        """
+        Returns the date and id of the last camera of a page and the page number.
+        """
+        try:
+            date, camera_id, page = base64.urlsafe_b64decode(
+                cursor.encode("ascii")).decode("utf-8").split("|")
+            return datetime.fromisoformat(date), int(camera_id), int(page)
+        except (ValueError, UnicodeError, binascii.Error) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            ) from e
+
+    @classmethod
+    def _page_size(cls, limit: int | None) -> int:
+        if limit is None:
+            return int(CAMERA_PAGE_SIZE)
+        if not 1 <= limit <= int(CAMERA_PAGE_MAX_SIZE):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Page size must be between 1 and {CAMERA_PAGE_MAX_SIZE}"
+            )
+        return limit
+
+    @classmethod
+    def _select_page(cls, cursor: str | None, page_size: int) -> tuple[pw.ModelSelect, int]:
+        """
+        Selects the page after the cursor, with one extra row to detect the next page.
+        Returns the query and the page number.
+        """
+        query = (cls._select_dto_fields()
+            .order_by(Camera.date.desc(), Camera.id.desc())
+            .limit(page_size + 1))
+
+        if cursor is None:
+            return query, 1
+
+        date, camera_id, page = cls._decode_cursor(cursor)
+        # Row comparison is served by the (date, id) index
+        query = query.where(pw.Tuple(Camera.date, Camera.id) < pw.Tuple(date, camera_id))
+        return query, page + 1
+
+    @classmethod
+    def _build_page(cls, cameras: list[CameraDto], page: int,
+        page_size: int, camera_count: int) -> CamerasResponse:
+        next_cursor = None
+        if len(cameras) > page_size:
+            cameras = cameras[:page_size]
+            next_cursor = cls._encode_cursor(cameras[-1], page)
+
+        return CamerasResponse(
+            page=page,
+            cameras=cameras,
+            total_pages=math.ceil(camera_count / page_size),
+            next_cursor=next_cursor
+        )
+
+    @classmethod
+    @read_only
     def get_camera(cls, camera_id) -> CameraDto:
         """
         Retrieve info for a particular camera.
@@ -25,33 +148,97 @@ class CameraService:
             description=camera.description,
             contamination=camera.contamination,
             date=camera.date,
-            url=camera.url
+            url=camera.url,
+            last_anomaly_at=camera.last_anomaly_at
+        )
+
+    @classmethod
+    @read_only
+    def get_cameras(cls, cursor: str = None, limit: int = None) -> CamerasResponse:
+        """
+        Retrieves the page of cameras following the cursor, or the first page.
+        Every page costs the same regardless of its depth.
+        """
+        page_size = cls._page_size(limit)
+        query, page = cls._select_page(cursor, page_size)
+
+        return cls._build_page(
+            [CameraDto(**row) for row in query.dicts()],
+            page,
+            page_size,
+            cls._cached_count()
         )
 
     @classmethod
-    def get_cameras(cls, page=1) -> CamerasResponse:
+    @read_only
+    def get_cameras_page(cls, page=1) -> CamerasResponse:
         """
-        Retrieves the first page containing 10 cameras.
+        Retrieves a certain page of cameras by its number.
+        Prefer get_cameras, deep pages are slower to retrieve by number.
         """
-        camera_count = Camera.select().count()  # pylint: disable=no-value-for-parameter
+        page_size = int(CAMERA_PAGE_SIZE)
+        rows = (cls._select_dto_fields()
+            .order_by(Camera.date.desc(), Camera.id.desc())
+            .limit(page_size)
+            .offset((int(page) - 1) * page_size)
+            .dicts())
+
+        return CamerasResponse(
+            page=page,
+            cameras=[CameraDto(**row) for row in rows],
+            total_pages=math.ceil(cls._cached_count() / page_size)
+        )
+
+    @classmethod
+    async def _cached_count_async(cls) -> int:
+        # The Redis client is blocking, it must not hold up the event loop
+        count = await asyncio.to_thread(cls._get_cached_count)
+        if count is None:
+            count = await async_db.fetchval(Camera.select(pw.fn.COUNT(Camera.id)))
+            await asyncio.to_thread(cls._cache_count, count)
+        return count
 
-        cameras: list[Camera] = list(Camera
-            .select()
-            .order_by(Camera.date.desc())
-            .limit(10)
-            .offset((int(page) - 1) * 10))
+    @classmethod
+    async def get_camera_async(cls, camera_id) -> CameraDto:
+        """
+        Retrieve info for a particular camera without blocking a thread.
+        """
+        row = await async_db.fetchrow(
+            cls._select_dto_fields().where(Camera.id == camera_id)
+        )
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+        return CameraDto(**row)
+
+    @classmethod
+    async def get_cameras_async(cls, cursor: str = None, limit: int = None) -> CamerasResponse:
+        """
+        Retrieves the page of cameras following the cursor without blocking a thread.
+        """
+        page_size = cls._page_size(limit)
+        query, page = cls._select_page(cursor, page_size)
+        rows = await async_db.fetch(query)
+
+        return cls._build_page(
+            [CameraDto(**row) for row in rows],
+            page,
+            page_size,
+            await cls._cached_count_async()
+        )
+
+    @classmethod
+    async def get_cameras_page_async(cls, page=1) -> CamerasResponse:
+        """
+        Retrieves a certain page of cameras by its number without blocking a thread.
+        """
+        page_size = int(CAMERA_PAGE_SIZE)
+        rows = await async_db.fetch(cls._select_dto_fields()
+            .order_by(Camera.date.desc(), Camera.id.desc())
+            .limit(page_size)
+            .offset((int(page) - 1) * page_size))
 
         return CamerasResponse(
             page=page,
-            cameras=[
-                CameraDto(
-                    id=camera.id,
-                    name=camera.name,
-                    description=camera.description,
-                    contamination=camera.contamination,
-                    date=camera.date,
-                    url=camera.url
-                )
-                for camera in cameras],
-            total_pages=camera_count // 10
+            cameras=[CameraDto(**row) for row in rows],
+            total_pages=math.ceil(await cls._cached_count_async() / page_size)
         )
@@ -0,0 +1,34 @@
+"""
+Service for inspecting the state of the application.
+"""
+from backend.app.models.base import slow_query_log
+from backend.app.dtos.diagnostics_service.dtos import SlowQuery
+from backend.app.dtos.diagnostics_service.responses import SlowQueriesResponse
+
+class DiagnosticsService:
+    """
+    Service for inspecting the state of the application.
+    """
+    @classmethod
+    def get_slow_queries(cls) -> SlowQueriesResponse:
+        """
+        Returns the most recent slow queries of this worker with their plans.
+        """
+        return SlowQueriesResponse(
+            queries=[
+                SlowQuery(
+                    sql=query.sql,
+                    duration_ms=query.duration * 1000,
+                    captured_at=query.captured_at,
+                    plan=query.plan
+                )
+                for query in slow_query_log.entries()
+            ]
+        )
+
+    @classmethod
+    def clear_slow_queries(cls):
+        """
+        Drops the slow queries captured by this worker.
+        """
+        slow_query_log.clear()
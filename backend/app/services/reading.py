@@ -0,0 +1,429 @@
+"""
+Service for working with contamination readings of cameras.
+"""
+import math
+import logging
+from datetime import datetime, timedelta, timezone
+import peewee as pw
+from psycopg2 import errorcodes
+from fastapi import HTTPException, status
+from backend.app.config import (
+    READINGS_PAGE_SIZE,
+    READINGS_PAGE_MAX_SIZE,
+    READINGS_IMPORT_MAX_ROWS,
+    READINGS_MAX_CLOCK_SKEW_SECONDS,
+    READINGS_MAX_AGE_DAYS,
+    SERIES_POINTS,
+    SERIES_MAX_POINTS
+)
+from backend.app.models.base import db
+from backend.app.models.camera_reading import CameraReading
+from backend.app.models.camera_reading_rollup import (
+    CameraReadingRollup,
+    CameraReadingHourly,
+    CameraReadingDaily
+)
+from backend.app.services.analytics import AnalyticsService
+from backend.app.services.anomaly import AnomalyService
+from backend.app.utils.database.replicas import read_only
+from backend.app.utils.validation import readings as batches
+from backend.app.utils.validation.readings import ReadingBatch, to_utc
+from backend.app.dtos.camera_service.dtos import (
+    Reading as ReadingDto,
+    CameraReading as CameraReadingDto,
+    SeriesPoint
+)
+from backend.app.dtos.camera_service.responses import ReadingsResponse, SeriesResponse
+
+logger = logging.getLogger(__name__)
+
+# Session-level staging table, kept by pooled connections and emptied on commit
+STAGING_SQL = """
+CREATE TEMPORARY TABLE IF NOT EXISTS "camerareading_staging"
+(LIKE "camerareading") ON COMMIT DELETE ROWS
+"""
+
+COPY_SQL = """
+COPY "camerareading_staging" ("camera_id", "taken_at", "contamination")
+FROM STDIN WITH (FORMAT csv)
+"""
+
+# Ingestions of readings of the same cameras wait for each other, so that
+# aggregates are computed from all committed readings. Ordered against deadlocks.
+LOCK_SQL = """
+SELECT 1 FROM "camera"
+WHERE "id" IN (SELECT "camera_id" FROM "camerareading_staging")
+ORDER BY "id" FOR NO KEY UPDATE
+"""
+
+# A reading taken at the same time as a stored one replaces it
+MERGE_SQL = """
+INSERT INTO "camerareading" ("camera_id", "taken_at", "contamination")
+SELECT "camera_id", "taken_at", "contamination" FROM "camerareading_staging"
+ON CONFLICT ("camera_id", "taken_at") DO UPDATE SET "contamination" = EXCLUDED."contamination"
+"""
+
+# Cameras which already have a newer reading are left untouched
+SNAPSHOT_SQL = """
+UPDATE "camera"
+SET "contamination" = "latest"."contamination", "date" = "latest"."taken_at", "updated_at" = now()
+FROM (
+    SELECT DISTINCT ON ("camera_id") "camera_id", "taken_at", "contamination"
+    FROM "camerareading_staging"
+    ORDER BY "camera_id", "taken_at" DESC
+) AS "latest"
+WHERE "camera"."id" = "latest"."camera_id" AND "camera"."date" <= "latest"."taken_at"
+"""
+
+ROLLUP_UPSERT_SQL = """
+ON CONFLICT ("camera_id", "bucket") DO UPDATE SET
+    "readings" = EXCLUDED."readings", "total" = EXCLUDED."total",
+    "minimum" = EXCLUDED."minimum", "maximum" = EXCLUDED."maximum",
+    "last_at" = EXCLUDED."last_at", "last" = EXCLUDED."last"
+"""
+
+# Hours with new readings are aggregated again from all of their readings,
+# so replaced readings are not counted twice
+HOURLY_ROLLUP_SQL = """
+INSERT INTO "camerareading_hourly"
+SELECT "reading"."camera_id", "touched"."bucket", count(*),
+    sum("reading"."contamination"::float8), min("reading"."contamination"),
+    max("reading"."contamination"), max("reading"."taken_at"),
+    (array_agg("reading"."contamination" ORDER BY "reading"."taken_at" DESC))[1]
+FROM (
+    SELECT DISTINCT "camera_id", date_trunc('hour', "taken_at") AS "bucket"
+    FROM "camerareading_staging"
+) AS "touched"
+JOIN "camerareading" AS "reading"
+    ON "reading"."camera_id" = "touched"."camera_id"
+    AND "reading"."taken_at" >= "touched"."bucket"
+    AND "reading"."taken_at" < "touched"."bucket" + interval '1 hour'
+GROUP BY 1, 2
+""" + ROLLUP_UPSERT_SQL
+
+# Days with new readings are aggregated again from their hours
+DAILY_ROLLUP_SQL = """
+INSERT INTO "camerareading_daily"
+SELECT "hour"."camera_id", "touched"."bucket", sum("hour"."readings"),
+    sum("hour"."total"), min("hour"."minimum"), max("hour"."maximum"), max("hour"."last_at"),
+    (array_agg("hour"."last" ORDER BY "hour"."last_at" DESC))[1]
+FROM (
+    SELECT DISTINCT "camera_id", date_trunc('day', "taken_at") AS "bucket"
+    FROM "camerareading_staging"
+) AS "touched"
+JOIN "camerareading_hourly" AS "hour"
+    ON "hour"."camera_id" = "touched"."camera_id"
+    AND "hour"."bucket" >= "touched"."bucket"
+    AND "hour"."bucket" < "touched"."bucket" + interval '1 day'
+GROUP BY 1, 2
+""" + ROLLUP_UPSERT_SQL
+
+FORMATS = {
+    "text/csv": batches.parse_csv,
+    "application/x-ndjson": batches.parse_ndjson,
+    "application/jsonl": batches.parse_ndjson
+}
+
+EXTENSIONS = {
+    ".csv": batches.parse_csv,
+    ".ndjson": batches.parse_ndjson,
+    ".jsonl": batches.parse_ndjson
+}
+
+class ReadingService:
+    """
+    Service for working with contamination readings of cameras.
+    Every camera keeps its latest reading as contamination and date,
+    so listing cameras never touches the readings.
+    Readings are validated as columns and loaded with COPY.
+    """
+    @classmethod
+    def _page_size(cls, limit: int | None) -> int:
+        if limit is None:
+            return int(READINGS_PAGE_SIZE)
+        if not 1 <= limit <= int(READINGS_PAGE_MAX_SIZE):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Page size must be between 1 and {READINGS_PAGE_MAX_SIZE}"
+            )
+        return limit
+
+    @classmethod
+    def _point_budget(cls, points: int | None) -> int:
+        if points is None:
+            return int(SERIES_POINTS)
+        if not 1 <= points <= int(SERIES_MAX_POINTS):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Number of points must be between 1 and {SERIES_MAX_POINTS}"
+            )
+        return points
+
+    @classmethod
+    def _time_window(cls) -> tuple[datetime, datetime]:
+        """
+        Returns the earliest time a reading is accepted for, which bounds the number
+        of partitions, and the latest time a reading may have been taken at,
+        allowing for clock skew.
+        """
+        now = to_utc(datetime.now(timezone.utc))
+        return (now - timedelta(days=int(READINGS_MAX_AGE_DAYS)),
+            now + timedelta(seconds=int(READINGS_MAX_CLOCK_SKEW_SECONDS)))
+
+    @classmethod
+    def _check_size(cls, rows: int):
+        if rows > int(READINGS_IMPORT_MAX_ROWS):
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {READINGS_IMPORT_MAX_ROWS} readings can be stored at once"
+            )
+
+    @classmethod
+    def _store(cls, batch: ReadingBatch) -> int:
+        """
+        Stores a validated batch and updates the latest reading of its cameras
+        and the hourly and daily aggregates of their readings, scores
+        the readings for anomalies and evicts analytics cached for their buckets.
+        Returns the number of stored readings.
+        """
+        batch = batch.deduplicated()
+        if not len(batch):
+            return 0
+
+        CameraReading.ensure_partitions(batch.months())
+        try:
+            try:
+                cls._write(batch)
+            except pw.IntegrityError as e:
+                # Rows without a partition violate the partition constraint
+                if cls._error_code(e) != errorcodes.CHECK_VIOLATION:
+                    raise
+                logger.warning("Partition of readings is missing, creating partitions again")
+                CameraReading.forget_partitions()
+                CameraReading.ensure_partitions(batch.months())
+                cls._write(batch)
+        except pw.IntegrityError as e:
+            if cls._error_code(e) != errorcodes.FOREIGN_KEY_VIOLATION:
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Camera not found"
+            ) from e
+        AnalyticsService.evict_readings(batch)
+        return len(batch)
+
+    @classmethod
+    def _write(cls, batch: ReadingBatch):
+        """
+        Writes a deduplicated batch whose partitions exist in one transaction.
+        """
+        with db.atomic():
+            db.execute_sql(STAGING_SQL)
+            # COPY is not available through peewee, the cursor of the transaction is used
+            db.cursor().copy_expert(COPY_SQL, batch.to_csv())
+            db.execute_sql(LOCK_SQL)
+            db.execute_sql(MERGE_SQL)
+            db.execute_sql(SNAPSHOT_SQL)
+            db.execute_sql(HOURLY_ROLLUP_SQL)
+            db.execute_sql(DAILY_ROLLUP_SQL)
+            AnomalyService.process(batch)
+
+    @classmethod
+    def _error_code(cls, error: pw.IntegrityError) -> str | None:
+        """
+        Returns the SQLSTATE of the driver error wrapped by peewee.
+        """
+        return getattr(getattr(error, "orig", None), "pgcode", None)
+
+    @classmethod
+    def record_readings(cls, readings: list[CameraReadingDto]) -> int:
+        """
+        Stores contamination readings and updates the latest reading of their cameras.
+        A reading taken at the same time as a stored one replaces it.
+        Returns the number of stored readings.
+        """
+        cls._check_size(len(readings))
+        try:
+            batch = batches.from_readings(readings, *cls._time_window())
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=str(e)
+            ) from e
+        return cls._store(batch)
+
+    @classmethod
+    def import_readings(cls, content: bytes, content_type: str | None,
+        filename: str | None) -> int:
+        """
+        Stores readings from a CSV or NDJSON file, recognized by its content type
+        or extension, and updates the latest reading of their cameras.
+        Returns the number of stored readings.
+        """
+        parse = FORMATS.get((content_type or "").split(";")[0].strip())
+        if parse is None and filename:
+            parse = EXTENSIONS.get(filename[filename.rfind("."):].lower())
+        if parse is None:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Readings must be provided as CSV or NDJSON"
+            )
+
+        try:
+            text = content.decode("utf-8-sig")
+        except UnicodeDecodeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Readings must be encoded in UTF-8"
+            ) from e
+
+        # Roughly counted before parsing, so that oversized files are not parsed
+        cls._check_size(text.count("\n") - 1)
+        try:
+            batch = parse(text, *cls._time_window())
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=str(e)
+            ) from e
+        cls._check_size(len(batch))
+        return cls._store(batch)
+
+    @classmethod
+    @read_only
+    def get_readings(cls, camera_id: int, start: datetime, end: datetime,
+        limit: int = None) -> ReadingsResponse:
+        """
+        Retrieves readings of a camera taken from start up to end, oldest first.
+        Only the partitions of the period are scanned.
+        """
+        page_size = cls._page_size(limit)
+        start, end = to_utc(start), to_utc(end)
+        if start >= end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Start of the period must be before its end"
+            )
+
+        rows = list(CameraReading
+            .select(CameraReading.taken_at, CameraReading.contamination)
+            .where(
+                (CameraReading.camera == camera_id) &
+                (CameraReading.taken_at >= start) &
+                (CameraReading.taken_at < end)
+            )
+            .order_by(CameraReading.taken_at)
+            .limit(page_size + 1)
+            .dicts())
+
+        next_start = None
+        if len(rows) > page_size:
+            next_start = rows[page_size]["taken_at"]
+            rows = rows[:page_size]
+
+        return ReadingsResponse(
+            camera_id=camera_id,
+            readings=[ReadingDto(**row) for row in rows],
+            next_start=next_start
+        )
+
+    @classmethod
+    def _reading_points(cls, camera_id: int, start: datetime, end: datetime,
+        budget: int) -> list[SeriesPoint]:
+        # Not paginated like get_readings, the budget is bounded by SERIES_MAX_POINTS
+        return [
+            SeriesPoint(
+                start=taken_at,
+                readings=1,
+                mean=contamination,
+                min=contamination,
+                max=contamination,
+                last=contamination
+            )
+            for taken_at, contamination in CameraReading
+                .select(CameraReading.taken_at, CameraReading.contamination)
+                .where(
+                    (CameraReading.camera == camera_id) &
+                    (CameraReading.taken_at >= start) &
+                    (CameraReading.taken_at < end)
+                )
+                .order_by(CameraReading.taken_at)
+                .limit(budget)
+                .tuples()
+        ]
+
+    @classmethod
+    def _rollup_points(cls, model: type[CameraReadingRollup], camera_id: int,
+        start: datetime, end: datetime) -> list[SeriesPoint]:
+        return [
+            SeriesPoint(
+                start=rollup.bucket,
+                readings=rollup.readings,
+                mean=rollup.total / rollup.readings,
+                min=rollup.minimum,
+                max=rollup.maximum,
+                last=rollup.last
+            )
+            for rollup in model
+                .select()
+                .where(
+                    (model.camera == camera_id) &
+                    (model.bucket >= start) &
+                    (model.bucket < end)
+                )
+                .order_by(model.bucket)
+        ]
+
+    @classmethod
+    @read_only
+    def get_series(cls, camera_id: int, start: datetime, end: datetime,
+        points: int = None) -> SeriesResponse:
+        """
+        Retrieves contamination of a camera over a period in at most the given
+        number of points. Single readings are returned if they fit, otherwise
+        hourly aggregates if they fit, otherwise daily aggregates.
+        Aggregates cover the whole hours and days the period overlaps.
+        """
+        budget = cls._point_budget(points)
+        start, end = to_utc(start), to_utc(end)
+        if start >= end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Start of the period must be before its end"
+            )
+
+        hour = start.replace(minute=0, second=0, microsecond=0)
+        day = hour.replace(hour=0)
+        if math.ceil((end - hour) / timedelta(hours=1)) <= budget:
+            # Hourly aggregates count the readings without reading them
+            readings = (CameraReadingHourly
+                .select(pw.fn.SUM(CameraReadingHourly.readings))
+                .where(
+                    (CameraReadingHourly.camera == camera_id) &
+                    (CameraReadingHourly.bucket >= hour) &
+                    (CameraReadingHourly.bucket < end)
+                )
+                .scalar()) or 0
+            if readings <= budget:
+                return SeriesResponse(
+                    camera_id=camera_id,
+                    resolution="reading",
+                    points=cls._reading_points(camera_id, start, end, budget)
+                )
+            return SeriesResponse(
+                camera_id=camera_id,
+                resolution="hour",
+                points=cls._rollup_points(CameraReadingHourly, camera_id, hour, end)
+            )
+
+        if math.ceil((end - day) / timedelta(days=1)) <= budget:
+            return SeriesResponse(
+                camera_id=camera_id,
+                resolution="day",
+                points=cls._rollup_points(CameraReadingDaily, camera_id, day, end)
+            )
+
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The period has more days than the number of points"
+        )
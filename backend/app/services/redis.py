@@ -1,13 +1,20 @@
 """
 Service for working with Redis.
 """
+import time
+import logging
+import threading
+from typing import Callable
 import redis
 from backend.app.config import (
     REDIS_HOSTNAME,
     REDIS_PORT,
-    REDIS_PASSWORD
+    REDIS_PASSWORD,
+    REDIS_RECONNECT_MAX_DELAY_SECONDS
 )
 
+logger = logging.getLogger(__name__)
+
 client = redis.Redis(
     host=REDIS_HOSTNAME,
     port=int(REDIS_PORT),
@@ -20,11 +27,12 @@ class RedisService:
     Service for working with Redis.
     """
     @classmethod
-    def set(cls, key: str, value: str):
+    def set(cls, key: str, value: str | bytes, ttl: int = None):
         """
         Sets a key-value pair in Redis.
+        ttl - optional expiration in seconds
         """
-        client.set(key, value)
+        client.set(key, value, ex=ttl)
 
     @classmethod
     def get(cls, key: str):
@@ -33,9 +41,134 @@ class RedisService:
         """
         return client.get(key).decode("utf-8")
 
+    @classmethod
+    def get_bytes(cls, key: str) -> bytes | None:
+        """
+        Gets a raw value from Redis, None if the key does not exist.
+        """
+        return client.get(key)
+
+    @classmethod
+    def get_many(cls, keys: list[str]) -> list[bytes | None]:
+        """
+        Gets raw values of many keys in a single round trip.
+        """
+        if not keys:
+            return []
+        return client.mget(keys)
+
+    @classmethod
+    def set_many(cls, values: dict[str, str | bytes], ttl: int = None):
+        """
+        Sets many key-value pairs in a single round trip.
+        ttl - optional expiration in seconds
+        """
+        pipeline = client.pipeline(transaction=False)
+        for key, value in values.items():
+            pipeline.set(key, value, ex=ttl)
+        pipeline.execute()
+
+    @classmethod
+    def set_if_absent(cls, key: str, value: str | bytes, ttl: int = None) -> bool:
+        """
+        Sets a key-value pair only if the key does not exist yet.
+        ttl - optional expiration in seconds
+        """
+        return bool(client.set(key, value, ex=ttl, nx=True))
+
     @classmethod
     def exists(cls, key: str):
         """
         Checks if a key exists in Redis.
         """
         return client.exists(key)
+
+    @classmethod
+    def delete(cls, key: str):
+        """
+        Removes a key from Redis.
+        """
+        client.delete(key)
+
+    @classmethod
+    def add_to_feed(cls, key: str, member: str, retention_seconds: int):
+        """
+        Adds a member to a time-ordered feed stored as a sorted set.
+        Members older than the retention period are removed.
+        """
+        now = time.time()
+        pipeline = client.pipeline()
+        pipeline.zadd(key, {member: now})
+        pipeline.zremrangebyscore(key, "-inf", now - retention_seconds)
+        pipeline.execute()
+
+    @classmethod
+    def read_feed(cls, key: str, since: float = 0) -> list[tuple[str, float]]:
+        """
+        Returns (member, timestamp) pairs added to a feed after the given timestamp.
+        """
+        return [
+            (member.decode("utf-8"), score)
+            for member, score in client.zrangebyscore(key, f"({since}", "+inf", withscores=True)
+        ]
+
+    @classmethod
+    def register_script(cls, source: str) -> Callable:
+        """
+        Registers a Lua script. The returned callable accepts keys and args
+        and runs the script atomically on the server via EVALSHA.
+        """
+        return client.register_script(source)
+
+    @classmethod
+    def publish(cls, channel: str, message: str):
+        """
+        Publishes a message to a channel.
+        """
+        client.publish(channel, message)
+
+    @classmethod
+    def subscribe(
+        cls,
+        channel: str,
+        handler: Callable[[str], None],
+        on_reconnect: Callable[[], None] = None
+    ) -> threading.Thread:
+        """
+        Calls the handler with every message published to the channel.
+        Messages are processed in a background daemon thread, which reconnects
+        with exponential backoff when the subscription fails.
+        on_reconnect - optional callback run once subscribed again, messages
+        published in the meantime are lost
+        """
+        def on_message(message: dict):
+            try:
+                handler(message["data"].decode("utf-8"))
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error("Failed handling message from channel %s: %s", channel, e)
+
+        def run():
+            delay = 0
+            while True:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                try:
+                    pubsub.subscribe(**{channel: on_message})
+                    if delay and on_reconnect is not None:
+                        logger.info("Resubscribed to channel %s", channel)
+                        on_reconnect()
+                    delay = 0
+                    while True:
+                        pubsub.get_message(timeout=1)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    delay = min(max(delay * 2, 1), int(REDIS_RECONNECT_MAX_DELAY_SECONDS))
+                    logger.error(
+                        "Subscription to channel %s failed, retrying in %s seconds: %s",
+                        channel, delay, e
+                    )
+                finally:
+                    pubsub.close()
+                time.sleep(delay)
+
+        thread = threading.Thread(target=run, name=f"subscription-{channel}", daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,110 @@
+"""
+Service for role reference data.
+"""
+import time
+import logging
+import threading
+from typing import Hashable
+from fastapi import HTTPException, status
+from backend.app.config import ROLE_MISSING_CACHE_TTL_SECONDS
+from backend.app.models.base import db
+from backend.app.models.role import Role
+from backend.app.utils.caching.ttl_cache import TTLCache
+from backend.app.utils.database.state import connection_scope
+from backend.app.utils.security.permissions import Permission, ROLE_PERMISSIONS
+
+logger = logging.getLogger(__name__)
+
+class RoleService:
+    """
+    Service for role reference data.
+    Roles are kept in memory with precomputed permission bitsets,
+    so role lookups and permission checks never touch the database.
+    Roles are static: they are created by migrations and their permissions
+    are defined in ROLE_PERMISSIONS. A role missing from a worker is loaded
+    on its first lookup, unknown roles are remembered for
+    ROLE_MISSING_CACHE_TTL_SECONDS so that they do not reload the roles every time.
+    """
+    _ids_by_name: dict[str, int] = {}
+    _names_by_id: dict[int, str] = {}
+    _permissions_by_name: dict[str, int] = {}
+    _loaded = False
+    _lock = threading.Lock()
+    _missing = TTLCache(1000)
+
+    @classmethod
+    def reload(cls):
+        """
+        Loads all roles from the database.
+        """
+        with connection_scope(db):
+            roles = list(Role.select(Role.id, Role.name).tuples())
+
+        for _, name in roles:
+            if name not in ROLE_PERMISSIONS:
+                logger.warning("Role %s has no permissions defined, it grants none", name)
+
+        with cls._lock:
+            cls._ids_by_name = {name: role_id for role_id, name in roles}
+            cls._names_by_id = {role_id: name for role_id, name in roles}
+            cls._permissions_by_name = {
+                name: int(ROLE_PERMISSIONS.get(name, Permission(0)))
+                for _, name in roles
+            }
+            cls._loaded = True
+
+        logger.debug("Loaded %s roles", len(roles))
+
+    @classmethod
+    def _ensure_loaded(cls):
+        if not cls._loaded:
+            cls.reload()
+
+    @classmethod
+    def _lookup(cls, attribute: str, key: Hashable):
+        """
+        Looks the key up in one of the role mappings, reloading the roles
+        once if it is missing. Raises 404 for unknown roles.
+        """
+        cls._ensure_loaded()
+        value = getattr(cls, attribute).get(key)
+        if value is not None:
+            return value
+
+        # The role may have been created after the last reload
+        if cls._missing.get((attribute, key)) is None:
+            cls.reload()
+            value = getattr(cls, attribute).get(key)
+            if value is not None:
+                return value
+            cls._missing.set(
+                (attribute, key), True, time.time() + int(ROLE_MISSING_CACHE_TTL_SECONDS)
+            )
+
+        logger.error("Role %s does not exist", key)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Role not found"
+        )
+
+    @classmethod
+    def get_id(cls, name: str) -> int:
+        """
+        Returns the id of the role with the given name.
+        """
+        return cls._lookup("_ids_by_name", name)
+
+    @classmethod
+    def get_name(cls, role_id: int) -> str:
+        """
+        Returns the name of the role with the given id.
+        """
+        return cls._lookup("_names_by_id", role_id)
+
+    @classmethod
+    def has_permissions(cls, role: str, required: Permission) -> bool:
+        """
+        Checks that the role has all the required permissions.
+        """
+        cls._ensure_loaded()
+        return (cls._permissions_by_name.get(role, 0) & required) == required
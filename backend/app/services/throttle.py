@@ -0,0 +1,93 @@
+"""
+Service for throttling login attempts.
+"""
+import math
+import time
+import uuid
+import logging
+from fastapi import HTTPException, status
+from backend.app.config import (
+    LOGIN_THROTTLE_WINDOW_SECONDS,
+    LOGIN_THROTTLE_USERNAME_LIMIT,
+    LOGIN_THROTTLE_IP_LIMIT
+)
+from backend.app.services.redis import RedisService as redis
+
+logger = logging.getLogger(__name__)
+
+# Sliding window over sorted sets of attempt timestamps.
+# KEYS - one window per key; ARGV - now (ms), window (ms), attempt id, limit per key.
+# An attempt is recorded in all windows only if none of them is full.
+# Returns 0 if the attempt is allowed, otherwise milliseconds until it will be.
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local retry_after = 0
+
+for i, key in ipairs(KEYS) do
+    redis.call("ZREMRANGEBYSCORE", key, "-inf", now - window)
+    if redis.call("ZCARD", key) >= tonumber(ARGV[3 + i]) then
+        local oldest = redis.call("ZRANGE", key, 0, 0, "WITHSCORES")
+        retry_after = math.max(retry_after, tonumber(oldest[2]) + window - now)
+    end
+end
+
+if retry_after > 0 then
+    return retry_after
+end
+
+for _, key in ipairs(KEYS) do
+    redis.call("ZADD", key, now, ARGV[3])
+    redis.call("PEXPIRE", key, window)
+end
+return 0
+"""
+
+sliding_window = redis.register_script(SLIDING_WINDOW_SCRIPT)
+
+class ThrottleService:
+    """
+    Service for throttling login attempts.
+    """
+    @classmethod
+    def _username_key(cls, username: str) -> str:
+        return f"throttle:login:user:{username}"
+
+    @classmethod
+    def check_login(cls, username: str, client_ip: str | None):
+        """
+        Records a login attempt for the username and client IP.
+        Raises 429 if either of them has too many attempts in the window.
+        """
+        keys = [cls._username_key(username)]
+        limits = [LOGIN_THROTTLE_USERNAME_LIMIT]
+        if client_ip is not None:
+            keys.append(f"throttle:login:ip:{client_ip}")
+            limits.append(LOGIN_THROTTLE_IP_LIMIT)
+
+        retry_after_ms = sliding_window(
+            keys=keys,
+            args=[
+                int(time.time() * 1000),
+                int(LOGIN_THROTTLE_WINDOW_SECONDS) * 1000,
+                uuid.uuid4().hex,
+                *limits
+            ]
+        )
+
+        if retry_after_ms > 0:
+            logger.warning(
+                "Throttled login attempt to user %s from %s", username, client_ip
+            )
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, try again later",
+                headers={"Retry-After": str(math.ceil(retry_after_ms / 1000))}
+            )
+
+    @classmethod
+    def reset_login(cls, username: str):
+        """
+        Clears the attempts of the username after a successful login.
+        """
+        redis.delete(cls._username_key(username))
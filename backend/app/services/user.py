@@ -12,11 +12,11 @@ from backend.app.utils.security.hashing import (
     hash_password
 )
 
+from backend.app.models.base import async_db
+from backend.app.utils.database.replicas import read_only
 from backend.app.models.user_login_data import UserLoginData
 from backend.app.models.user_profile import UserProfile
-from backend.app.models.user_role import UserRole
 from backend.app.models.user import User
-from backend.app.models.role import Role
 
 from backend.app.dtos.user_service.requests import (
     BeginRegistrationRequest,
@@ -31,6 +31,7 @@ from backend.app.dtos.user_service.responses import (
 from backend.app.dtos.user_service.dtos import UserProfile as UserProfileDto
 
 from backend.app.services.auth import AuthService
+from backend.app.services.role import RoleService
 
 logger = logging.getLogger(__name__)
 
@@ -44,51 +45,39 @@ class UserService:
         """
         Begin user registration.
         """
-        # Check if user already exists
-        if UserLoginData.select().where(
-            UserLoginData.email == request.email or
-            UserLoginData.username == request.username
-        ).exists():
-
-            logger.warning(
-                "Attempted to register user with existing "
-                "username or email (%s, %s)", 
-                request.email, request.username
-            )
-
-            raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Provided username or email is already in use."
-        )
-
         logger.debug("Creating user account for user %s...", request.email)
 
-        user = User(
-            registration_date=pnd.now()
-            ).save()
-
-        logger.debug("Creating user role for user %s...", request.email)
-
-        UserRole(user=user, role=Role.get_by_name("user")).save()
-
-        logger.debug("Creating user login data for user %s...", request.email)
-
-        UserLoginData(
-            user=user,
+        user = User(registration_date=pnd.now())
+        login_data = UserLoginData(
             username=request.username,
             email=request.email,
-            password_hash=hash_password(request.password),
+            password_hash=hash_password(request.password, route="registration"),
             auth_token_salt=str(uuid.uuid4()),
             is_email_confirmed=False,
             confirmation_code=str(random.randint(100000, 999999)),
             confirmation_gen_time=pnd.now(),
             recovery_token=str(uuid.uuid4()),
             recovery_gen_time=pnd.now()
-        ).save()
+        )
+
+        # Uniqueness of username and email is enforced by constraints
+        try:
+            User.insert_with_login_data(user, login_data, RoleService.get_id("user"))
+        except pw.IntegrityError as e:
+            logger.warning(
+                "Attempted to register user with existing "
+                "username or email (%s, %s)",
+                request.email, request.username
+            )
+
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Provided username or email is already in use."
+            ) from e
 
         logger.debug(
             "Registration code for user %s is %s",
-            request.email, user.login_data.confirmation_code
+            request.email, login_data.confirmation_code
         )
 
         return BeginRegistrationResponse(
@@ -113,7 +102,7 @@ class UserService:
 
                 # Regenerate code
                 code = str(random.randint(100000, 999999))
-                login_data = UserLoginData.get(user=user)
+                login_data = user.login_data
                 login_data.confirmation_code = code
                 login_data.confirmation_gen_time = pnd.now()
                 login_data.save()
@@ -163,7 +152,7 @@ class UserService:
         user = User.get_by_email(request.email)
 
         # Set email as confirmed
-        login_data = UserLoginData.get(user=user)
+        login_data = user.login_data
         login_data.is_email_confirmed = True
         login_data.save()
 
@@ -180,20 +169,39 @@ class UserService:
         logger.debug("Issuing tokens for user %s...", user.id)
 
         # Finish registration and return access and refresh tokens
+        tokens = AuthService.issue_token_pair(user.id)
         return CompleteRegistrationResponse(
-            access_token=AuthService.generate_access_token(user.id),
-            refresh_token=AuthService.generate_refresh_token(user.id)
+            access_token=tokens.access_token,
+            refresh_token=tokens.refresh_token
         )
 
     @classmethod
+    @read_only
     def get_user_profile(cls, user_id) -> UserProfileDto:
         """
         Get user profile.
         """
-        profile = User.get_by_id(user_id).profile
+        profile = User.prefetch(user_id).profile
         return UserProfileDto(
             name=profile.name,
             surname=profile.surname,
             patronymic=profile.patronymic,
             avatar_url=profile.avatar_url
         )
+
+    @classmethod
+    async def get_user_profile_async(cls, user_id) -> UserProfileDto:
+        """
+        Get user profile without blocking a thread.
+        """
+        row = await async_db.fetchrow(UserProfile
+            .select(
+                UserProfile.name,
+                UserProfile.surname,
+                UserProfile.patronymic,
+                UserProfile.avatar_url
+            )
+            .where(UserProfile.user == user_id))
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+        return UserProfileDto(**row)
@@ -0,0 +1,73 @@
+"""
+Detection of anomalous readings with exponentially weighted moving statistics.
+
+Every series keeps an exponentially weighted mean and variance of its values.
+A value is anomalous when it is further than the threshold number of standard
+deviations from the mean of the values before it. The statistics are updated
+with every value, anomalous or not, so a lasting change of level stops being
+anomalous after a while. Only the statistics are kept, never past values.
+"""
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class EwmaState:
+    """
+    Moving statistics of series, one element per series.
+    count - number of values seen;
+    """
+    mean: np.ndarray
+    variance: np.ndarray
+    count: np.ndarray
+
+@dataclass
+class Detection:
+    """
+    Result of scoring values, one element per value.
+    expected - mean of the series before the value;
+    score - distance from the mean in standard deviations, 0 during warmup;
+    """
+    expected: np.ndarray
+    score: np.ndarray
+    anomalous: np.ndarray
+
+def detect(series: np.ndarray, values: np.ndarray, state: EwmaState,
+    alpha: float, threshold: float, warmup: int) -> Detection:
+    """
+    Scores values and updates the state of their series in place.
+    series - index of the series of every value, values of a series in time order;
+    warmup - number of values of a series seen before its values are scored;
+    Values of all series are processed together, one value of each series at a time.
+    """
+    expected = np.zeros(len(values))
+    score = np.zeros(len(values))
+
+    # Position of every value within its series, by stable order of the series
+    order = np.argsort(series, kind="stable")
+    ordered = series[order]
+    starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+    lengths = np.diff(np.r_[starts, len(ordered)])
+    position = np.empty(len(values), dtype=int)
+    position[order] = np.arange(len(ordered)) - np.repeat(starts, lengths)
+
+    # Values grouped by position, a step scores by_position[bounds[step]:bounds[step + 1]]
+    by_position = np.argsort(position, kind="stable")
+    bounds = np.r_[0, np.cumsum(np.bincount(position))] if len(values) else np.zeros(1, int)
+    for step in range(len(bounds) - 1):
+        rows = by_position[bounds[step]:bounds[step + 1]]
+        index = series[rows]
+        value = values[rows]
+        mean, variance, count = state.mean[index], state.variance[index], state.count[index]
+
+        scored = (count >= warmup) & (variance > 0)
+        deviation = np.sqrt(np.where(scored, variance, 1))
+        expected[rows] = mean
+        score[rows] = np.where(scored, (value - mean) / deviation, 0)
+
+        # The first value of a series starts its mean
+        difference = np.where(count == 0, 0, value - mean)
+        state.mean[index] = np.where(count == 0, value, mean + alpha * difference)
+        state.variance[index] = (1 - alpha) * (variance + alpha * difference ** 2)
+        state.count[index] = count + 1
+
+    return Detection(expected, score, np.abs(score) > threshold)
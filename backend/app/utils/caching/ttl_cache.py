@@ -0,0 +1,94 @@
+"""
+Bounded in-process cache with per-entry expiration.
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+class TTLCache:
+    """
+    Thread-safe LRU cache where every entry has its own expiration time.
+
+    max_size - maximum number of entries, the least recently used
+    entry is evicted when it is exceeded;\n
+    expires_at passed to set() is a UNIX timestamp in seconds.
+    """
+    def __init__(self, max_size: int):
+        if max_size < 1:
+            raise ValueError("Cache size must be positive.")
+
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Returns the cached value or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, expires_at: float):
+        """
+        Stores a value until the given UNIX timestamp.
+        """
+        if expires_at <= time.time():
+            return
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Any | None:
+        """
+        Removes an entry and returns its value.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return None if entry is None else entry[1]
+
+    def discard_where(self, predicate: Callable[[Any], bool]) -> int:
+        """
+        Removes all entries whose value matches the predicate.
+        Returns the number of removed entries.
+        """
+        with self._lock:
+            keys = [key for key, (_, value) in self._entries.items() if predicate(value)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def discard_keys(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Removes all entries whose key matches the predicate.
+        Returns the number of removed entries.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,82 @@
+"""
+Async access to Postgres for read-heavy endpoints.
+
+Queries are still built with peewee, so the models remain the only place
+where table and column names are defined. Only the execution is done by
+asyncpg, on its own connection pool, without blocking a thread.
+"""
+import re
+import asyncio
+import asyncpg
+import peewee as pw
+
+_PLACEHOLDER = re.compile(r"%(s|%)")
+
+def compile_query(query: pw.Query) -> tuple[str, list]:
+    """
+    Compiles a peewee query into asyncpg SQL with numbered placeholders.
+    """
+    sql, params = query.sql()
+    counter = iter(range(1, len(params) + 1))
+    sql = _PLACEHOLDER.sub(
+        lambda match: f"${next(counter)}" if match.group(1) == "s" else "%",
+        sql
+    )
+    return sql, params
+
+class AsyncDatabase:
+    """
+    asyncpg connection pool that executes peewee queries.
+    The pool is created on first use, in the event loop serving requests.
+    """
+    def __init__(self, min_size: int, max_size: int, **connect_params):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.connect_params = connect_params
+        self._pool: asyncpg.Pool | None = None
+        self._lock: asyncio.Lock | None = None
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        if self._pool is None:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if self._pool is None:
+                    self._pool = await asyncpg.create_pool(
+                        min_size=self.min_size,
+                        max_size=self.max_size,
+                        **self.connect_params
+                    )
+        return self._pool
+
+    async def fetch(self, query: pw.Query) -> list[asyncpg.Record]:
+        """
+        Returns all rows of the query.
+        """
+        sql, params = compile_query(query)
+        pool = await self._get_pool()
+        return await pool.fetch(sql, *params)
+
+    async def fetchrow(self, query: pw.Query) -> asyncpg.Record | None:
+        """
+        Returns the first row of the query, or None if there are no rows.
+        """
+        sql, params = compile_query(query)
+        pool = await self._get_pool()
+        return await pool.fetchrow(sql, *params)
+
+    async def fetchval(self, query: pw.Query):
+        """
+        Returns the first column of the first row of the query.
+        """
+        sql, params = compile_query(query)
+        pool = await self._get_pool()
+        return await pool.fetchval(sql, *params)
+
+    async def close(self):
+        """
+        Closes all connections of the pool.
+        """
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
@@ -0,0 +1,29 @@
+"""
+Identity map scoped to a request.
+
+Inside an identity scope every row loaded by primary key is kept, so loading
+it again returns the same model instance together with the relationships
+already loaded on it, instead of querying the database again.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_identity_map: ContextVar[dict | None] = ContextVar("identity_map", default=None)
+
+def current_identity_map() -> dict | None:
+    """
+    Returns the identity map of the current scope, None outside of any scope.
+    Keys are (model, primary key) pairs.
+    """
+    return _identity_map.get()
+
+@contextmanager
+def identity_scope():
+    """
+    Runs the block with its own empty identity map.
+    """
+    token = _identity_map.set({})
+    try:
+        yield
+    finally:
+        _identity_map.reset(token)
@@ -0,0 +1,108 @@
+"""
+Instrumentation of SQL queries.
+
+Every query executed through an instrumented database is timed and
+recorded under its normalized SQL in the statistics of the current scope,
+usually a request, see QueryInstrumentationMiddleware.
+"""
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+import peewee as pw
+from backend.app.utils.metrics.registry import Counter, Histogram
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+query_duration = Histogram(
+    "db_query_duration_seconds",
+    "Time spent executing SQL queries")
+query_errors = Counter(
+    "db_query_errors_total",
+    "SQL queries that raised an error")
+
+def normalize_sql(sql: str) -> str:
+    """
+    Replaces literals with placeholders and collapses lists of placeholders,
+    so that queries differing only in their values normalize to the same statement.
+    """
+    sql = _STRING_LITERAL.sub("%s", sql)
+    sql = _NUMBER_LITERAL.sub("%s", sql)
+    sql = _PLACEHOLDER_LIST.sub("(%s, ...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+class QueryStats:
+    """
+    Numbers and durations of the queries executed in a scope.
+    statements - normalized SQL mapped to its execution count and total duration;
+    """
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def record(self, sql: str, duration: float):
+        """
+        Records an executed query.
+        """
+        statement = normalize_sql(sql)
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+            totals = self.statements.setdefault(statement, [0, 0.0])
+            totals[0] += 1
+            totals[1] += duration
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Returns statements executed more than threshold times, most repeated first.
+        """
+        with self._lock:
+            return sorted(
+                (
+                    (statement, count)
+                    for statement, (count, _) in self.statements.items()
+                    if count > threshold
+                ),
+                key=lambda item: item[1],
+                reverse=True
+            )
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+def current_query_stats() -> QueryStats | None:
+    """
+    Returns the statistics of the current scope, None outside of any scope.
+    """
+    return _query_stats.get()
+
+@contextmanager
+def query_stats_scope():
+    """
+    Collects statistics of the queries executed in the block.
+    """
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+def _record_query(event: pw.QueryEvent):
+    query_duration.observe(event.duration)
+    if event.exception is not None:
+        query_errors.inc()
+
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(event.sql, event.duration)
+
+def install(database: pw.Database):
+    """
+    Makes the database report its queries.
+    """
+    database.query_hooks.append(_record_query)
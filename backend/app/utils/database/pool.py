@@ -0,0 +1,37 @@
+"""
+Postgres connection pool with metrics.
+"""
+import time
+from playhouse.pool import PooledPostgresqlDatabase, MaxConnectionsExceeded
+from backend.app.utils.metrics.registry import Counter, Gauge, Histogram
+
+class InstrumentedPooledPostgresqlDatabase(PooledPostgresqlDatabase):
+    """
+    Pooled Postgres database that reports connections in use, idle connections,
+    checkout wait time and checkout timeouts.
+    """
+    def __init__(self, database, metrics_prefix: str = "db_pool", **kwargs):
+        super().__init__(database, **kwargs)
+
+        self.checkout_wait = Histogram(
+            f"{metrics_prefix}_checkout_wait_seconds",
+            "Time spent waiting for a pooled connection")
+        self.checkout_timeouts = Counter(
+            f"{metrics_prefix}_checkout_timeouts_total",
+            "Connection checkouts that timed out")
+        Gauge(f"{metrics_prefix}_connections_in_use",
+            "Pooled connections currently checked out",
+            callback=lambda: len(self._in_use))
+        Gauge(f"{metrics_prefix}_connections_idle",
+            "Pooled connections waiting to be reused",
+            callback=lambda: len(self._connections))
+
+    def connect(self, reuse_if_open=False):
+        start = time.perf_counter()
+        try:
+            return super().connect(reuse_if_open)
+        except MaxConnectionsExceeded:
+            self.checkout_timeouts.inc()
+            raise
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - start)
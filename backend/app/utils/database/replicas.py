@@ -0,0 +1,196 @@
+"""
+Routing of read-only queries to read replicas.
+
+SELECT queries executed inside read_only functions go to a healthy replica.
+Everything else, and every query of a request after it has written to the
+primary, goes to the primary, so a request always reads its own writes.
+Replicas are checked in the background and only used while they respond
+and lag behind the primary by no more than the configured tolerance.
+"""
+import random
+import logging
+import threading
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+import peewee as pw
+from backend.app.utils.metrics.registry import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+# Seconds since the last replayed transaction, 0 if everything received is replayed
+REPLICATION_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+replica_reads = Counter(
+    "db_replica_reads_total",
+    "Queries routed to read replicas")
+replica_fallbacks = Counter(
+    "db_replica_fallbacks_total",
+    "Replica queries that failed and were repeated on the primary")
+
+class RoutingState:
+    """
+    Routing state of a request.
+    pinned - the request has written to the primary and reads from it from now on;
+    """
+    def __init__(self):
+        self.pinned = False
+
+_read_only: ContextVar[bool] = ContextVar("read_only", default=False)
+_routing_state: ContextVar[RoutingState | None] = ContextVar("routing_state", default=None)
+
+def read_only(func):
+    """
+    Marks a function as only reading data, so that its SELECT queries
+    may be served by a replica.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _read_only.set(True)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+    return wrapper
+
+@contextmanager
+def routing_scope():
+    """
+    Runs the block, usually a request, with its own routing state.
+    """
+    token = _routing_state.set(RoutingState())
+    try:
+        yield
+    finally:
+        _routing_state.reset(token)
+
+class ReplicaRouter:
+    """
+    Routes read-only queries of the primary database to its replicas.
+    max_lag - staleness tolerance in seconds;
+    """
+    def __init__(self, primary: pw.Database, replicas: list[pw.Database],
+        max_lag: float, check_interval: float, metrics_prefix: str = "db"):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        # Replicas are not trusted until the first successful check
+        self._healthy: list[pw.Database] = []
+        self._lock = threading.Lock()
+        self._primary_execute = primary.execute
+        Gauge(f"{metrics_prefix}_replicas_healthy",
+            "Read replicas currently receiving queries",
+            callback=lambda: len(self._healthy))
+
+    def install(self):
+        """
+        Makes the primary database route its queries.
+        """
+        self.primary.execute = self.execute
+
+    def execute(self, query, **context_options):
+        """
+        Executes the query on a replica if it may be, otherwise on the primary.
+        """
+        state = _routing_state.get()
+        if not self._is_read(query):
+            if state is not None:
+                state.pinned = True
+            return self._primary_execute(query, **context_options)
+
+        replica = self._choose_replica(state)
+        if replica is None:
+            return self._primary_execute(query, **context_options)
+
+        try:
+            cursor = replica.execute(query, **context_options)
+            replica_reads.inc()
+            return cursor
+        except (pw.OperationalError, pw.InterfaceError) as e:
+            logger.error("Replica query failed, falling back to the primary: %s", e)
+            replica_fallbacks.inc()
+            self._mark_unhealthy(replica)
+            return self._primary_execute(query, **context_options)
+
+    def _is_read(self, query) -> bool:
+        return (isinstance(query, pw.SelectBase) and
+            not getattr(query, "_for_update", None))
+
+    def _choose_replica(self, state: RoutingState | None) -> pw.Database | None:
+        if (not _read_only.get() or
+            (state is not None and state.pinned) or
+            self.primary.in_transaction()):
+            return None
+        healthy = self._healthy
+        return random.choice(healthy) if healthy else None
+
+    def _mark_unhealthy(self, replica: pw.Database):
+        with self._lock:
+            self._healthy = [r for r in self._healthy if r is not replica]
+        if not replica.is_closed():
+            replica.close()
+
+    def _name(self, replica: pw.Database) -> str:
+        return f"{replica.connect_params.get('host')}:{replica.connect_params.get('port')}"
+
+    def check_replicas(self):
+        """
+        Checks the lag of every replica and routes reads only to those
+        within the staleness tolerance.
+        """
+        healthy = []
+        for replica in self.replicas:
+            try:
+                with replica.connection_context():
+                    lag = float(replica.execute_sql(REPLICATION_LAG_SQL).fetchone()[0])
+            except pw.PeeweeException as e:
+                logger.warning("Replica %s is unavailable: %s", self._name(replica), e)
+                continue
+
+            if lag > self.max_lag:
+                logger.warning("Replica %s lags behind by %.1fs", self._name(replica), lag)
+                continue
+            healthy.append(replica)
+
+        with self._lock:
+            self._healthy = healthy
+
+    def after_replication(self, callback):
+        """
+        Calls the callback once replicas within the staleness tolerance
+        have caught up with the writes made so far. Use to drop data cached
+        from a replica before it saw the latest writes.
+        """
+        if not self.replicas:
+            return
+        timer = threading.Timer(self.max_lag, callback)
+        timer.daemon = True
+        timer.start()
+
+    def start_health_checks(self) -> threading.Thread | None:
+        """
+        Checks the replicas now and then periodically in a background daemon thread.
+        Must be called once on startup.
+        """
+        if not self.replicas:
+            return None
+
+        self.check_replicas()
+
+        def run():
+            stop = threading.Event()
+            while not stop.wait(self.check_interval):
+                try:
+                    self.check_replicas()
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logger.error("Replica health check failed: %s", e)
+
+        thread = threading.Thread(target=run, name="replica-health", daemon=True)
+        thread.start()
+        return thread
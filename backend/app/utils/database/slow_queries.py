@@ -0,0 +1,104 @@
+"""
+Log of slow SQL queries with their execution plans.
+
+Queries slower than the threshold are kept in a ring buffer. A sample of
+the slow SELECT statements is executed again with EXPLAIN (ANALYZE, BUFFERS)
+to capture the plan the database actually used, so the extra load stays
+proportional to the sample rate.
+"""
+import random
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import peewee as pw
+from backend.app.utils.metrics.registry import Counter
+
+logger = logging.getLogger(__name__)
+
+slow_queries_total = Counter(
+    "db_slow_queries_total",
+    "SQL queries slower than the slow query threshold")
+
+@dataclass
+class SlowQuery:
+    """
+    Slow query captured by the log.
+    plan - EXPLAIN output, None if the query was not sampled;
+    """
+    sql: str
+    duration: float
+    captured_at: datetime
+    plan: str | None = None
+
+class SlowQueryLog:
+    """
+    Ring buffer of the most recent slow queries of a database.
+    threshold - duration in seconds above which a query is slow;
+    sample_rate - share of slow SELECT statements to explain;
+    """
+    def __init__(self, database: pw.Database, threshold: float,
+        sample_rate: float, capacity: int):
+        self.database = database
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self._queries: deque[SlowQuery] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def install(self):
+        """
+        Starts watching the queries of the database.
+        """
+        self.database.query_hooks.append(self._on_query)
+
+    def entries(self) -> list[SlowQuery]:
+        """
+        Returns the captured queries, newest first.
+        """
+        with self._lock:
+            return list(reversed(self._queries))
+
+    def clear(self):
+        """
+        Drops all captured queries.
+        """
+        with self._lock:
+            self._queries.clear()
+
+    def _on_query(self, event: pw.QueryEvent):
+        if event.exception is not None or event.duration < self.threshold:
+            return
+
+        slow_queries_total.inc()
+        query = SlowQuery(
+            sql=event.sql,
+            duration=event.duration,
+            captured_at=datetime.now(timezone.utc)
+        )
+        if self._should_explain(event.sql):
+            query.plan = self._explain(event.sql, event.params)
+
+        logger.warning("Slow query (%.1fms): %s", event.duration * 1000, event.sql)
+        with self._lock:
+            self._queries.append(query)
+
+    def _should_explain(self, sql: str) -> bool:
+        # ANALYZE executes the statement again, which is only harmless for plain reads.
+        # Inside a transaction a failing EXPLAIN would abort the caller's transaction.
+        statement = sql.lstrip().upper()
+        return (statement.startswith("SELECT") and
+            " FOR UPDATE" not in statement and
+            " FOR SHARE" not in statement and
+            not self.database.in_transaction() and
+            random.random() < self.sample_rate)
+
+    def _explain(self, sql: str, params) -> str | None:
+        try:
+            # The cursor is used directly to keep EXPLAIN out of the query hooks
+            cursor = self.database.cursor()
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", params or ())
+            return "\n".join(row[0] for row in cursor.fetchall())
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Failed to explain slow query: %s", e)
+            return None
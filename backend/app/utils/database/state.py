@@ -0,0 +1,80 @@
+"""
+Connection state that can be scoped to a request instead of a thread.
+
+Peewee keeps the current connection per thread, but sync FastAPI handlers
+and their dependencies run on arbitrary threadpool threads. Inside a
+connection scope the state is stored in a context variable, which is shared
+by everything the request runs, so the request uses one connection that is
+released when the scope ends.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+import peewee as pw
+
+class ScopedConnectionState:
+    """
+    Peewee connection state bound to the current connection scope,
+    or to the current thread outside of any scope.
+    """
+    def __init__(self):
+        object.__setattr__(self, "_scoped", ContextVar(f"db_state_{id(self)}", default=None))
+        object.__setattr__(self, "_thread", pw._ConnectionLocal())  # pylint: disable=protected-access
+
+    def _current(self) -> pw._ConnectionState:  # pylint: disable=protected-access
+        return self._scoped.get() or self._thread
+
+    def begin_scope(self) -> Token:
+        """
+        Starts a new scope with no connection.
+        """
+        return self._scoped.set(pw._ConnectionState())  # pylint: disable=protected-access
+
+    def end_scope(self, token: Token):
+        """
+        Restores the state that was current before the scope started.
+        """
+        self._scoped.reset(token)
+
+    def reset(self):
+        """
+        Resets the current state.
+        """
+        self._current().reset()
+
+    def set_connection(self, conn):
+        """
+        Sets the connection of the current state.
+        """
+        self._current().set_connection(conn)
+
+    def __getattr__(self, name: str):
+        return getattr(self._current(), name)
+
+    def __setattr__(self, name: str, value):
+        setattr(self._current(), name, value)
+
+def install(database: pw.Database):
+    """
+    Makes the database use scoped connection state.
+    """
+    database._state = ScopedConnectionState()  # pylint: disable=protected-access
+
+@contextmanager
+def connection_scope(*databases: pw.Database):
+    """
+    Runs the block with its own connection to each of the databases.
+    Connections are opened lazily and closed (or returned to the pool) on exit.
+    """
+    tokens = [
+        (database, database._state.begin_scope())  # pylint: disable=protected-access
+        for database in databases
+    ]
+    try:
+        yield
+    finally:
+        for database, token in tokens:
+            try:
+                if not database.is_closed():
+                    database.close()
+            finally:
+                database._state.end_scope(token)  # pylint: disable=protected-access
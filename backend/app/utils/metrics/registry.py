@@ -0,0 +1,143 @@
+"""
+Minimal in-process metrics registry rendered in the Prometheus text format.
+"""
+import threading
+from typing import Callable
+
+class Metric:
+    """
+    Base class for all metrics. Registers itself on creation.
+    """
+    metric_type = "untyped"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def samples(self) -> list[tuple[str, float]]:
+        """
+        Returns (sample name, value) pairs of the metric.
+        """
+        raise NotImplementedError
+
+class Counter(Metric):
+    """
+    Monotonically increasing value.
+    """
+    metric_type = "counter"
+
+    def __init__(self, name: str, description: str):
+        self.value = 0
+        super().__init__(name, description)
+
+    def inc(self, amount: float = 1):
+        """
+        Increments the counter.
+        """
+        with self._lock:
+            self.value += amount
+
+    def samples(self) -> list[tuple[str, float]]:
+        return [(self.name, self.value)]
+
+class Gauge(Metric):
+    """
+    Value that can go up and down.
+    If a callback is provided, the value is read from it on every collection.
+    """
+    metric_type = "gauge"
+
+    def __init__(self, name: str, description: str, callback: Callable[[], float] = None):
+        self.value = 0
+        self.callback = callback
+        super().__init__(name, description)
+
+    def set(self, value: float):
+        """
+        Sets the gauge value.
+        """
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        """
+        Increments the gauge.
+        """
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        """
+        Decrements the gauge.
+        """
+        with self._lock:
+            self.value -= amount
+
+    def samples(self) -> list[tuple[str, float]]:
+        return [(self.name, self.callback() if self.callback else self.value)]
+
+class Histogram(Metric):
+    """
+    Distribution of observed values over fixed buckets.
+    """
+    metric_type = "histogram"
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, name: str, description: str, buckets: tuple[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.total = 0
+        self.count = 0
+        super().__init__(name, description)
+
+    def observe(self, value: float):
+        """
+        Records a single observation.
+        """
+        with self._lock:
+            self.total += value
+            self.count += 1
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+
+    def samples(self) -> list[tuple[str, float]]:
+        samples = [
+            (f'{self.name}_bucket{{le="{bound}"}}', count)
+            for bound, count in zip(self.buckets, self.counts)
+        ]
+        samples.append((f'{self.name}_bucket{{le="+Inf"}}', self.count))
+        samples.append((f"{self.name}_sum", self.total))
+        samples.append((f"{self.name}_count", self.count))
+        return samples
+
+class Registry:
+    """
+    Collection of all metrics of the process.
+    """
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric):
+        """
+        Adds a metric to the registry. Metric names must be unique.
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        """
+        Renders all metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            for sample_name, value in metric.samples():
+                lines.append(f"{sample_name} {value}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
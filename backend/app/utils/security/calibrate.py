@@ -0,0 +1,93 @@
+"""
+Calibrates password hashing cost for the current host.
+
+Measures hashing time with increasing cost and prints the environment
+variables that keep a single hash under the target latency.
+
+Usage: python -m backend.app.utils.security.calibrate --target-ms 250 --scheme bcrypt
+"""
+import argparse
+import statistics
+import time
+from passlib.hash import bcrypt, argon2
+
+SAMPLE_PASSWORD = "Calibration-Passw0rd!"
+
+def measure(handler, samples: int) -> float:
+    """
+    Returns the median time in milliseconds of hashing with the given handler.
+    """
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        handler.hash(SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def calibrate_bcrypt(target_ms: float, samples: int) -> dict[str, str]:
+    """
+    Picks the highest bcrypt rounds that stay under the target.
+    """
+    best = 10
+    for rounds in range(10, 20):
+        elapsed = measure(bcrypt.using(rounds=rounds), samples)
+        print(f"bcrypt rounds={rounds}: {elapsed:.1f} ms")
+        if elapsed > target_ms:
+            break
+        best = rounds
+
+    return {"PASSWORD_HASH_SCHEME": "bcrypt", "BCRYPT_ROUNDS": str(best)}
+
+def calibrate_argon2(
+    target_ms: float, samples: int, memory_cost: int, parallelism: int) -> dict[str, str]:
+    """
+    Picks the highest argon2 time cost that stays under the target
+    with the given memory cost (KiB) and parallelism.
+    """
+    best = 1
+    for time_cost in range(1, 33):
+        elapsed = measure(
+            argon2.using(rounds=time_cost, memory_cost=memory_cost, parallelism=parallelism),
+            samples
+        )
+        print(f"argon2 time_cost={time_cost}: {elapsed:.1f} ms")
+        if elapsed > target_ms:
+            break
+        best = time_cost
+
+    return {
+        "PASSWORD_HASH_SCHEME": "argon2",
+        "ARGON2_TIME_COST": str(best),
+        "ARGON2_MEMORY_COST": str(memory_cost),
+        "ARGON2_PARALLELISM": str(parallelism)
+    }
+
+def main():
+    """
+    Entrypoint function
+    """
+    parser = argparse.ArgumentParser(description="Calibrate password hashing cost.")
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250,
+        help="Maximum time of a single hash in milliseconds")
+    parser.add_argument("--samples", type=int, default=3,
+        help="Number of hashes measured per cost value")
+    parser.add_argument("--memory-cost", type=int, default=102400,
+        help="Argon2 memory cost in KiB")
+    parser.add_argument("--parallelism", type=int, default=8,
+        help="Argon2 parallelism")
+    args = parser.parse_args()
+
+    if args.scheme == "bcrypt":
+        result = calibrate_bcrypt(args.target_ms, args.samples)
+    else:
+        result = calibrate_argon2(
+            args.target_ms, args.samples, args.memory_cost, args.parallelism
+        )
+
+    print()
+    for key, value in result.items():
+        print(f"{key}={value}")
+
+if __name__ == "__main__":
+    main()
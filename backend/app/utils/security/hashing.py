@@ -1,19 +1,168 @@
 """
 Features related to password hashing
+
+Hashing is CPU-bound, so it runs in a dedicated process pool instead of the
+request threads. The number of hashes waiting for the pool is bounded both
+globally and per route; requests over the limit are rejected right away
+with 503 and a Retry-After header.
 """
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
+from backend.app.config import (
+    HASHING_POOL_WORKERS,
+    HASHING_QUEUE_SIZE,
+    HASHING_ROUTE_LIMITS,
+    HASHING_RETRY_AFTER_SECONDS,
+    PASSWORD_HASH_SCHEME,
+    BCRYPT_ROUNDS,
+    ARGON2_TIME_COST,
+    ARGON2_MEMORY_COST,
+    ARGON2_PARALLELISM
+)
+from backend.app.utils.metrics.registry import Counter, Gauge, Histogram
+
+# The configured scheme comes first, the other one is only kept to verify
+# existing hashes. Hashes with another scheme or cost need an update.
+pwd_context = CryptContext(
+    schemes=sorted(["bcrypt", "argon2"], key=lambda scheme: scheme != PASSWORD_HASH_SCHEME),
+    deprecated="auto",
+    bcrypt__rounds=int(BCRYPT_ROUNDS),
+    argon2__rounds=int(ARGON2_TIME_COST),
+    argon2__memory_cost=int(ARGON2_MEMORY_COST),
+    argon2__parallelism=int(ARGON2_PARALLELISM)
+)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+queue_depth = Gauge(
+    "password_hashing_queue_depth", "Hashing operations submitted and not yet finished")
+hashing_latency = Histogram(
+    "password_hashing_latency_seconds", "Time spent waiting for and computing a hash")
+hashing_rejections = Counter(
+    "password_hashing_rejections_total", "Hashing operations rejected due to saturation")
 
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
 
-def hash_password(password: str) -> str:
+_queue_slots = threading.BoundedSemaphore(int(HASHING_QUEUE_SIZE))
+_route_slots = {
+    route: threading.BoundedSemaphore(int(limit))
+    for route, limit in (
+        item.split(":") for item in HASHING_ROUTE_LIMITS.split(",") if item
+    )
+}
+
+def _get_executor() -> ProcessPoolExecutor | None:
     """
-    Hashes a password.
+    Lazily creates the process pool. Returns None if hashing runs inline.
     """
+    global _executor  # pylint: disable=global-statement
+
+    if int(HASHING_POOL_WORKERS) <= 0:
+        return None
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=int(HASHING_POOL_WORKERS),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def _saturated() -> HTTPException:
+    hashing_rejections.inc()
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, try again later",
+        headers={"Retry-After": HASHING_RETRY_AFTER_SECONDS}
+    )
+
+def _discard_executor(executor: ProcessPoolExecutor):
+    """
+    Drops a broken process pool, the next hash creates a new one.
+    """
+    global _executor  # pylint: disable=global-statement
+
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+def _submit(func: callable, *args):
+    """
+    Runs a function in the pool. A pool broken by a dead worker, e.g. one
+    killed for running out of memory, is replaced and the function is run once more.
+    """
+    executor = _get_executor()
+    if executor is None:
+        return func(*args)
+    try:
+        return executor.submit(func, *args).result()
+    except BrokenProcessPool:
+        _discard_executor(executor)
+
+    executor = _get_executor()
+    try:
+        return executor.submit(func, *args).result()
+    except BrokenProcessPool as e:
+        _discard_executor(executor)
+        raise _saturated() from e
+
+def _run(route: str, func: callable, *args):
+    """
+    Runs a hashing function in the pool, subject to admission control.
+    """
+    route_slots = _route_slots.get(route)
+    if route_slots is not None and not route_slots.acquire(blocking=False):
+        raise _saturated()
+
+    try:
+        if not _queue_slots.acquire(blocking=False):
+            raise _saturated()
+
+        queue_depth.inc()
+        start = time.perf_counter()
+        try:
+            return _submit(func, *args)
+        finally:
+            hashing_latency.observe(time.perf_counter() - start)
+            queue_depth.dec()
+            _queue_slots.release()
+    finally:
+        if route_slots is not None:
+            route_slots.release()
+
+def hash_password(password: str, route: str = None) -> str:
+    """
+    Hashes a password.
+    route - name of the concurrency limit to apply, see HASHING_ROUTE_LIMITS
+    """
+    return _run(route, _hash, password)
+
+def verify_password(plain_password: str, hashed_password: str, route: str = None) -> bool:
     """
     Verifies that a password is correct.
+    route - name of the concurrency limit to apply, see HASHING_ROUTE_LIMITS
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return _run(route, _verify, plain_password, hashed_password)
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str, route: str = None) -> tuple[bool, str | None]:
+    """
+    Verifies that a password is correct. If it is, and the hash uses an outdated
+    scheme or cost, also returns a new hash of the password, otherwise None.
+    route - name of the concurrency limit to apply, see HASHING_ROUTE_LIMITS
+    """
+    return _run(route, _verify_and_update, plain_password, hashed_password)
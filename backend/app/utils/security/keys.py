@@ -0,0 +1,88 @@
+"""
+Keys used for signing and verifying JWTs.
+
+For HMAC algorithms the shared JWT_KEY is used. For asymmetric algorithms
+every file named <kid>.pem in JWT_KEYS_DIR is a private key; the one with
+JWT_ACTIVE_KID signs new tokens, all of them verify tokens. Rotation is done
+by adding a new key, switching JWT_ACTIVE_KID to it and removing the old key
+once the tokens it signed have expired.
+"""
+import logging
+from pathlib import Path
+from typing import Any
+from cryptography.hazmat.primitives import serialization
+from jwt.algorithms import get_default_algorithms
+
+logger = logging.getLogger(__name__)
+
+class KeyRing:
+    """
+    Keys used for signing and verifying JWTs.
+    """
+    def __init__(self, algorithm: str, shared_key: str = None,
+        keys_dir: str = None, active_kid: str = None):
+        self.algorithm = algorithm
+        self.active_kid = None
+        self._private_keys: dict[str, Any] = {}
+        self._public_keys: dict[str, Any] = {}
+        self._shared_key = shared_key
+
+        if not self.is_asymmetric:
+            return
+
+        for path in sorted(Path(keys_dir).glob("*.pem")):
+            private_key = serialization.load_pem_private_key(path.read_bytes(), password=None)
+            self._private_keys[path.stem] = private_key
+            self._public_keys[path.stem] = private_key.public_key()
+            logger.debug("Loaded JWT key %s", path.stem)
+
+        if active_kid not in self._private_keys:
+            raise ValueError(f"Active JWT key {active_kid} was not found in {keys_dir}.")
+        self.active_kid = active_kid
+
+    @property
+    def is_asymmetric(self) -> bool:
+        """
+        Whether tokens are signed with a private key.
+        """
+        return not self.algorithm.startswith("HS")
+
+    @property
+    def signing_key(self):
+        """
+        Key that signs new tokens.
+        """
+        if not self.is_asymmetric:
+            return self._shared_key
+        return self._private_keys[self.active_kid]
+
+    @property
+    def signing_headers(self) -> dict[str, str] | None:
+        """
+        Additional JWT headers of new tokens.
+        """
+        if not self.is_asymmetric:
+            return None
+        return {"kid": self.active_kid}
+
+    def verification_key(self, kid: str | None):
+        """
+        Key that verifies a token with the given key id, None if it is unknown.
+        """
+        if not self.is_asymmetric:
+            return self._shared_key
+        return self._public_keys.get(kid)
+
+    def jwks(self) -> dict[str, list[dict]]:
+        """
+        Public keys in the JSON Web Key Set format.
+        Empty for HMAC algorithms since the key is secret.
+        """
+        algorithm = get_default_algorithms()[self.algorithm]
+
+        keys = []
+        for kid, public_key in self._public_keys.items():
+            jwk = algorithm.to_jwk(public_key, as_dict=True)
+            jwk.update({"kid": kid, "alg": self.algorithm, "use": "sig"})
+            keys.append(jwk)
+        return {"keys": keys}
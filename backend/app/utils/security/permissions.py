@@ -0,0 +1,30 @@
+"""
+Permissions granted to roles.
+"""
+from enum import IntFlag
+from functools import reduce
+from operator import or_
+
+class Permission(IntFlag):
+    """
+    Single permission, combined into bitsets with |.
+    """
+    CAMERA_READ = 1
+    CAMERA_WRITE = 2
+    PROFILE_READ = 4
+    STORAGE_READ = 8
+    STORAGE_WRITE = 16
+    ADMIN = 32
+
+ALL_PERMISSIONS = reduce(or_, Permission)
+
+# Roles missing from this mapping have no permissions, RoleService warns about them
+ROLE_PERMISSIONS: dict[str, Permission] = {
+    "user": (
+        Permission.CAMERA_READ |
+        Permission.PROFILE_READ |
+        Permission.STORAGE_READ |
+        Permission.STORAGE_WRITE
+    ),
+    "admin": ALL_PERMISSIONS
+}
@@ -0,0 +1,61 @@
+"""
+Statistics of values grouped into buckets, such as readings grouped by time.
+
+Every bucket keeps the number and the sum of its values and a sketch of their
+distribution made of evenly spaced quantiles. Statistics of any set of buckets
+are computed from the sketches alone, without the values: the count, sum,
+minimum and maximum exactly, other quantiles as estimates.
+"""
+from dataclasses import dataclass, field
+import numpy as np
+
+SKETCH_SIZE = 101
+
+# Quantiles stored in sketches, 0 and 1 being the minimum and maximum
+QUANTILES = np.linspace(0, 1, SKETCH_SIZE)
+
+@dataclass
+class BucketStats:
+    """
+    Statistics of the values of a bucket.
+    sketch - values at QUANTILES, empty if there are no values;
+    """
+    count: int = 0
+    total: float = 0.0
+    sketch: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+    @property
+    def mean(self) -> float | None:
+        """Mean of the values, None if there are none"""
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Returns the q-th quantile of the values, None if there are none.
+        """
+        if not self.count:
+            return None
+        return float(np.interp(q, QUANTILES, self.sketch))
+
+def merge(buckets: list[BucketStats]) -> BucketStats:
+    """
+    Merges statistics of buckets, estimating the sketch of the union of their
+    values. Every quantile of a sketch stands for an equal share of its bucket.
+    """
+    filled = [bucket for bucket in buckets if bucket.count]
+    if len(filled) <= 1:
+        return filled[0] if filled else BucketStats()
+
+    values = np.concatenate([bucket.sketch for bucket in filled])
+    weights = np.repeat([bucket.count for bucket in filled], SKETCH_SIZE).astype(float)
+    order = np.argsort(values, kind="stable")
+    values, weights = values[order], weights[order]
+
+    # Position of every value in the merged distribution, from 0 to 1
+    positions = np.cumsum(weights) - weights / 2
+    positions = (positions - positions[0]) / (positions[-1] - positions[0])
+    return BucketStats(
+        count=sum(bucket.count for bucket in filled),
+        total=sum(bucket.total for bucket in filled),
+        sketch=np.interp(QUANTILES, positions, values)
+    )
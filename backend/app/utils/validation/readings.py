@@ -0,0 +1,191 @@
+"""
+Parsing and validation of batches of contamination readings.
+Batches are held as NumPy columns and validated with operations over whole
+columns, so the cost per reading stays low for batches of any size.
+Invalid batches raise ValueError naming the invalid rows.
+"""
+import io
+import csv
+import json
+import warnings
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+import numpy as np
+
+COLUMNS = ("camera_id", "taken_at", "contamination")
+
+# Camera ids are stored as Postgres integers
+MAX_CAMERA_ID = 2 ** 31 - 1
+
+# Number of invalid rows listed in errors
+REPORTED_ROWS = 10
+
+def to_utc(value: datetime) -> datetime:
+    """
+    Converts the time to naive UTC, as readings are stored.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+@dataclass
+class ReadingBatch:
+    """
+    Batch of readings as columns, one element per reading.
+    taken_at - naive UTC times as datetime64[us];
+    """
+    camera_ids: np.ndarray
+    taken_at: np.ndarray
+    contamination: np.ndarray
+
+    def __len__(self):
+        return len(self.camera_ids)
+
+    def take(self, indexes: np.ndarray) -> "ReadingBatch":
+        """
+        Returns the readings at the indexes.
+        """
+        return ReadingBatch(
+            self.camera_ids[indexes],
+            self.taken_at[indexes],
+            self.contamination[indexes]
+        )
+
+    def deduplicated(self) -> "ReadingBatch":
+        """
+        Returns the batch ordered by camera and time, keeping only the last
+        of the readings of a camera taken at the same time.
+        """
+        # lexsort is stable, so the last of equal readings is the last submitted
+        order = np.lexsort((self.taken_at, self.camera_ids))
+        camera_ids, taken_at = self.camera_ids[order], self.taken_at[order]
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = (camera_ids[1:] != camera_ids[:-1]) | (taken_at[1:] != taken_at[:-1])
+        return self.take(order[last])
+
+    def months(self) -> list[date]:
+        """
+        Returns the first days of the months the readings were taken in.
+        """
+        return np.unique(self.taken_at.astype("datetime64[M]")).astype(datetime).tolist()
+
+    def to_csv(self) -> io.StringIO:
+        """
+        Returns the batch in the CSV format of COPY, without a header.
+        """
+        lines = map(",".join, zip(
+            self.camera_ids.astype(str),
+            self.taken_at.astype(str),
+            self.contamination.astype(str)
+        ))
+        return io.StringIO("\n".join(lines))
+
+def _invalid(name: str, rows: np.ndarray | list) -> ValueError:
+    numbers = ", ".join(str(row + 1) for row in list(rows)[:REPORTED_ROWS])
+    return ValueError(f"Invalid {name} in rows {numbers}")
+
+def _convert(column: np.ndarray, dtype: str, name: str) -> np.ndarray:
+    def converts(value) -> bool:
+        try:
+            np.array([value], dtype=column.dtype).astype(dtype)
+            return True
+        except (ValueError, OverflowError):
+            return False
+
+    with warnings.catch_warnings():
+        # Times with an offset are converted to UTC, which is what is wanted
+        warnings.simplefilter("ignore", UserWarning)
+        try:
+            return column.astype(dtype)
+        except (ValueError, OverflowError):
+            # Only a failed batch is converted value by value, to locate the errors
+            raise _invalid(name, [
+                row for row, value in enumerate(column) if not converts(value)
+            ]) from None
+
+def from_columns(camera_ids: np.ndarray, taken_at: np.ndarray,
+    contamination: np.ndarray, min_time: datetime, max_time: datetime) -> ReadingBatch:
+    """
+    Converts and validates columns of strings.
+    min_time - naive UTC time before which readings are not accepted;
+    max_time - naive UTC time after which readings cannot have been taken;
+    """
+    batch = ReadingBatch(
+        _convert(camera_ids, "int64", "camera_id"),
+        _convert(taken_at, "datetime64[us]", "taken_at"),
+        _convert(contamination, "float64", "contamination")
+    )
+    validate(batch, min_time, max_time)
+    return batch
+
+def from_readings(readings: list, min_time: datetime, max_time: datetime) -> ReadingBatch:
+    """
+    Converts and validates objects with camera_id, taken_at and contamination.
+    """
+    batch = ReadingBatch(
+        _convert(
+            np.array([reading.camera_id for reading in readings], dtype=object),
+            "int64",
+            "camera_id"
+        ),
+        np.array([to_utc(reading.taken_at) for reading in readings], dtype="datetime64[us]"),
+        np.array([reading.contamination for reading in readings], dtype="float64")
+    )
+    validate(batch, min_time, max_time)
+    return batch
+
+def validate(batch: ReadingBatch, min_time: datetime, max_time: datetime):
+    """
+    Checks that the readings refer to cameras by id, were taken
+    between min_time and max_time and have a non-negative contamination.
+    """
+    checks = (
+        ("camera_id", (batch.camera_ids > 0) & (batch.camera_ids <= MAX_CAMERA_ID)),
+        ("taken_at", ~np.isnat(batch.taken_at) &
+            (batch.taken_at >= np.datetime64(min_time, "us")) &
+            (batch.taken_at <= np.datetime64(max_time, "us"))),
+        ("contamination", np.isfinite(batch.contamination) & (batch.contamination >= 0))
+    )
+    for name, valid in checks:
+        if not valid.all():
+            raise _invalid(name, np.flatnonzero(~valid))
+
+def parse_csv(text: str, min_time: datetime, max_time: datetime) -> ReadingBatch:
+    """
+    Parses readings from CSV with a header naming the columns.
+    """
+    reader = csv.reader(io.StringIO(text))
+    header = [name.strip() for name in next(reader, [])]
+    if sorted(header) != sorted(COLUMNS):
+        raise ValueError(f"CSV header must name the columns {', '.join(COLUMNS)}")
+
+    rows = [row for row in reader if row]
+    try:
+        table = np.array(rows, dtype=str).reshape(len(rows), len(header))
+    except ValueError as e:
+        raise ValueError(f"Every CSV row must have {len(header)} values") from e
+    table = np.char.strip(table)
+    return from_columns(
+        *(table[:, header.index(name)] for name in COLUMNS), min_time, max_time
+    )
+
+def parse_ndjson(text: str, min_time: datetime, max_time: datetime) -> ReadingBatch:
+    """
+    Parses readings from newline delimited JSON objects.
+    """
+    records = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON on line {number}") from e
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {number} is not a JSON object")
+        records.append(record)
+
+    # Missing values become "None", which fails the conversion
+    return from_columns(*(
+        np.array([record.get(name) for record in records], dtype=str) for name in COLUMNS
+    ), min_time, max_time)
@@ -11,7 +11,13 @@ def validate_field(cls, field: str, func: callable, *args, **kwargs):
     field - name of the field
     func - validation function
     *args, **kwargs - additional arguments
+    Objects that track modified fields (see Base.is_field_dirty)
+    only have their modified fields validated.
     """
+    is_field_dirty = getattr(cls, "is_field_dirty", None)
+    if is_field_dirty is not None and not is_field_dirty(field):
+        return
+
     value = getattr(cls, field)
     result = value is None or func(value, *args, **kwargs)
     if not result:
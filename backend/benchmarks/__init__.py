@@ -0,0 +1,3 @@
+"""
+Benchmarks of performance sensitive paths.
+"""
@@ -0,0 +1,104 @@
+"""
+Benchmark of importing contamination readings.
+
+Reports rows per second of parsing and validating a CSV batch and, with
+--database, of storing it with COPY compared to inserting rows one by one.
+Storing writes benchmark cameras and readings, so it is only allowed in the
+development environment:
+python -m backend.benchmarks.import_readings --rows 100000 --cameras 1000 --database
+"""
+import time
+import argparse
+from datetime import datetime, timedelta
+import numpy as np
+from backend.app.config import ENVIRONMENT_TYPE
+from backend.app.models.base import db
+from backend.app.models.camera import Camera
+from backend.app.models.camera_reading import CameraReading
+from backend.app.services.camera import CameraService
+from backend.app.services.reading import ReadingService
+from backend.app.utils.validation.readings import parse_csv
+
+def generate_csv(camera_ids: list[int], rows: int, start: datetime) -> str:
+    """
+    Generates rows readings spread over the cameras, one second apart per camera.
+    """
+    generator = np.random.default_rng(0)
+    indexes = np.arange(rows)
+    ids = np.asarray(camera_ids)[indexes % len(camera_ids)]
+    taken_at = (np.datetime64(start, "us") +
+        (indexes // len(camera_ids)).astype("timedelta64[s]"))
+    contamination = generator.random(rows).round(4)
+    lines = map(",".join, zip(ids.astype(str), taken_at.astype(str), contamination.astype(str)))
+    return "camera_id,taken_at,contamination\n" + "\n".join(lines)
+
+def report(name: str, rows: int, seconds: float):
+    """
+    Prints the throughput of a stage.
+    """
+    print(f"{name:<24} {rows:>9} rows {seconds:>8.3f}s {rows / seconds:>12.0f} rows/s")
+
+def benchmark_database(text: str, rows: int, cameras: int, baseline_rows: int):
+    """
+    Measures storing of the batch with COPY and of a part of it row by row.
+    """
+    if ENVIRONMENT_TYPE != "development":
+        raise RuntimeError("Benchmarking the database is only allowed in development.")
+
+    batch = parse_csv(text, datetime.min, datetime.max)
+    started = time.perf_counter()
+    ReadingService._store(batch)  # pylint: disable=protected-access
+    report("COPY", rows, time.perf_counter() - started)
+
+    baseline = batch.take(np.arange(min(baseline_rows, rows)))
+    baseline.taken_at = baseline.taken_at + np.timedelta64(rows // cameras + 1, "s")
+    started = time.perf_counter()
+    for camera_id, taken_at, contamination in zip(
+        baseline.camera_ids.tolist(), baseline.taken_at.tolist(), baseline.contamination.tolist()
+    ):
+        CameraReading.insert(
+            camera=camera_id, taken_at=taken_at, contamination=contamination
+        ).on_conflict_ignore().execute()
+    report("INSERT row by row", len(baseline), time.perf_counter() - started)
+
+def main():
+    """
+    Entrypoint function
+    """
+    parser = argparse.ArgumentParser(description="Benchmark importing of readings.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--cameras", type=int, default=1000)
+    parser.add_argument("--database", action="store_true",
+        help="also store the readings, creating benchmark cameras if needed")
+    parser.add_argument("--baseline-rows", type=int, default=2000,
+        help="number of readings inserted row by row for comparison")
+    args = parser.parse_args()
+
+    start = datetime.now().replace(microsecond=0) - timedelta(days=1)
+    camera_ids = list(range(1, args.cameras + 1))
+    if args.database:
+        with db.connection_context():
+            Camera.insert_many(
+                [{"name": f"Benchmark {i}", "contamination": 0, "date": start}
+                 for i in camera_ids],
+            ).on_conflict_ignore().execute()
+            CameraService.invalidate_count()
+            camera_ids = [camera.id for camera in Camera
+                .select(Camera.id)
+                .where(Camera.name.startswith("Benchmark "))
+                .limit(args.cameras)]
+
+    started = time.perf_counter()
+    text = generate_csv(camera_ids, args.rows, start)
+    report("generate", args.rows, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    parse_csv(text, datetime.min, datetime.max)
+    report("parse and validate", args.rows, time.perf_counter() - started)
+
+    if args.database:
+        with db.connection_context():
+            benchmark_database(text, args.rows, len(camera_ids), args.baseline_rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Testing detection of anomalous readings.
+"""
+import unittest
+import numpy as np
+from backend.app.utils.anomalies import EwmaState, detect
+
+def empty_state(size: int) -> EwmaState:
+    """State of series without values"""
+    return EwmaState(np.zeros(size), np.zeros(size), np.zeros(size, dtype=int))
+
+class TestAnomalies(unittest.TestCase):
+    """
+    Testing detection of anomalous readings.
+    """
+    def test_jump_is_detected(self):
+        """Only the series that jumps is flagged"""
+        generator = np.random.default_rng(0)
+        steady = 0.3 + generator.normal(0, 0.01, 50)
+        jumping = np.r_[0.3 + generator.normal(0, 0.01, 49), 0.9]
+        series = np.r_[np.zeros(50, dtype=int), np.ones(50, dtype=int)]
+        detection = detect(series, np.r_[steady, jumping], empty_state(2),
+            alpha=0.1, threshold=4, warmup=10)
+
+        self.assertEqual(np.flatnonzero(detection.anomalous).tolist(), [99])
+        self.assertGreater(detection.score[99], 4)
+
+    def test_incremental(self):
+        """Scoring values in batches gives the same result as all at once"""
+        values = np.random.default_rng(1).random(30)
+        series = np.arange(30) % 3
+        whole = detect(series, values, empty_state(3), alpha=0.2, threshold=3, warmup=2)
+
+        state = empty_state(3)
+        first = detect(series[:10], values[:10], state, alpha=0.2, threshold=3, warmup=2)
+        second = detect(series[10:], values[10:], state, alpha=0.2, threshold=3, warmup=2)
+        np.testing.assert_allclose(np.r_[first.score, second.score], whole.score)
@@ -0,0 +1,37 @@
+"""
+Testing compilation of peewee queries for asyncpg.
+"""
+import unittest
+import peewee as pw
+from backend.app.utils.database.async_db import compile_query
+
+db = pw.PostgresqlDatabase(None)
+
+class Item(pw.Model):
+    """Model used to build queries"""
+    name = pw.CharField()
+
+    class Meta:
+        """Metadata for the test model"""
+        database = db
+
+class TestCompileQuery(unittest.TestCase):
+    """
+    Testing compilation of peewee queries for asyncpg.
+    """
+    def test_placeholders_are_numbered(self):
+        """Each parameter gets its own numbered placeholder"""
+        sql, params = compile_query(
+            Item.select(Item.id).where(Item.id == "5").limit(10).offset(20)
+        )
+        self.assertEqual(
+            sql,
+            'SELECT "t1"."id" FROM "item" AS "t1" WHERE ("t1"."id" = $1) LIMIT $2 OFFSET $3'
+        )
+        self.assertEqual(params, [5, 10, 20])
+
+    def test_query_without_parameters(self):
+        """Queries without parameters are left as they are"""
+        sql, params = compile_query(Item.select(pw.fn.COUNT(Item.id)))
+        self.assertEqual(sql, 'SELECT COUNT("t1"."id") FROM "item" AS "t1"')
+        self.assertEqual(params, [])
@@ -0,0 +1,248 @@
+"""
+Testing authentication against the database and Redis.
+"""
+import uuid
+import unittest
+import logging
+from unittest import mock
+import pendulum as pnd
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from backend.app import config, models
+from backend.app.models.user import User
+from backend.app.models.user_login_data import UserLoginData
+from backend.app.models.user_termination import UserTermination
+from backend.app.services.auth import AuthService, account_cache_hits, account_cache_misses
+from backend.app.services.redis import RedisService as redis
+from backend.app.services.role import RoleService
+from backend.app.services.throttle import ThrottleService
+from backend.app.dtos.auth_service.dtos import UserAccount
+from backend.app.dtos.auth_service.requests import (
+    LoginRequest,
+    RefreshTokenRequest,
+    ChangePasswordRequest,
+    ValidateAccessTokensRequest
+)
+from backend.app.utils.security import hashing
+
+config.ENVIRONMENT_TYPE = "development"
+config.POSTGRES_DB = "automatic_unittest_database"
+
+# Hashes are computed inline instead of in worker processes
+hashing.HASHING_POOL_WORKERS = "0"
+
+PASSWORD = "correct horse"
+
+logger = logging.getLogger(__name__)
+
+def create_user(password: str = PASSWORD) -> User:
+    """Creates a confirmed user with a unique username"""
+    user = User(registration_date=pnd.now())
+    User.insert_with_login_data(user, UserLoginData(
+        username=f"test_{uuid.uuid4().hex[:12]}",
+        email=f"{uuid.uuid4().hex[:12]}@example.com",
+        password_hash=hashing.pwd_context.hash(password),
+        auth_token_salt=str(uuid.uuid4()),
+        is_email_confirmed=True
+    ), RoleService.get_id("user"))
+    return user
+
+class TestAuth(unittest.TestCase):
+    """
+    Testing authentication against the database and Redis.
+    """
+    def setUp(self):
+        logger.debug("Creation of the database...")
+        models.create_database()
+        self.user = create_user()
+        self.username = self.user.login_data.username
+        # Wiped databases reuse the ids of users still cached in Redis
+        redis.delete(f"account:{self.user.id}")
+
+    def tearDown(self):
+        AuthService.restore_user(self.user.id)
+        self.user.delete_instance(recursive=True)
+
+    def login(self, password: str = PASSWORD):
+        """Logs in as the user of the test"""
+        return AuthService.login(LoginRequest(username=self.username, password=password))
+
+    def assert_revoked(self, tokens):
+        """Both tokens of a pair are rejected"""
+        with self.assertRaises(HTTPException) as context:
+            self.authenticate(tokens.access_token)
+        self.assertEqual(context.exception.status_code, 401)
+        with self.assertRaises(HTTPException) as context:
+            AuthService.refresh_tokens(RefreshTokenRequest(refresh_token=tokens.refresh_token))
+        self.assertEqual(context.exception.status_code, 401)
+
+    def authenticate(self, access_token: str):
+        """Authenticates like the controllers do"""
+        return AuthService.authenticate(
+            HTTPAuthorizationCredentials(scheme="Bearer", credentials=access_token)
+        )
+
+    def test_login(self):
+        """Valid credentials give tokens of the user"""
+        tokens = self.login()
+        self.assertEqual(self.authenticate(tokens.access_token).id, self.user.id)
+
+    def test_login_resets_throttling(self):
+        """Failed attempts of a username are forgotten after a successful login"""
+        # pylint: disable-next=protected-access
+        username_key = ThrottleService._username_key(self.username)
+        with self.assertRaises(HTTPException):
+            self.login("wrong password")
+        self.assertTrue(redis.exists(username_key))
+
+        self.login()
+        self.assertFalse(redis.exists(username_key))
+
+    def test_terminated_user_needs_password(self):
+        """Termination is only disclosed to someone knowing the password"""
+        AuthService.terminate_user(self.user.id)
+
+        with self.assertRaises(HTTPException) as context:
+            self.login("wrong password")
+        self.assertEqual(context.exception.status_code, 401)
+
+        with self.assertRaises(HTTPException) as context:
+            self.login()
+        self.assertEqual(context.exception.status_code, 403)
+        # Attempts of a terminated user are not forgotten
+        self.assertTrue(redis.exists(
+            ThrottleService._username_key(self.username)  # pylint: disable=protected-access
+        ))
+
+    def test_terminations_are_synchronized(self):
+        """Terminations written directly to the table are picked up by workers"""
+        UserTermination.insert(
+            user=self.user.id, termination_date=pnd.now(),
+            created_at=pnd.now(), updated_at=pnd.now()
+        ).execute()
+        AuthService.sync_terminated_users()
+
+        with self.assertRaises(HTTPException) as context:
+            self.login()
+        self.assertEqual(context.exception.status_code, 403)
+
+        UserTermination.delete().where(UserTermination.user == self.user.id).execute()
+        AuthService.sync_terminated_users()
+        self.login()
+
+    def test_terminate_unknown_user(self):
+        """Terminating a missing user is rejected as not found"""
+        with self.assertRaises(HTTPException) as context:
+            AuthService.terminate_user(self.user.id + 1000)
+        self.assertEqual(context.exception.status_code, 404)
+
+    def test_rotated_salts_are_revoked(self):
+        """Rotating the salt rejects issued tokens and publishes the old salt"""
+        tokens = self.login()
+        self.authenticate(tokens.access_token)
+        salt = self.user.login_data.auth_token_salt
+        since = AuthService.get_revoked_salts().cursor
+
+        AuthService.rotate_token_salt(self.user.id)
+
+        self.assert_revoked(tokens)
+        self.assertEqual(AuthService.get_revoked_salts(since).salts, [salt])
+        self.assertEqual(self.authenticate(self.login().access_token).id, self.user.id)
+
+    def test_change_password(self):
+        """Changing the password revokes issued tokens except the returned ones"""
+        tokens = self.login()
+        new_password = "N3w-Password!"
+
+        with self.assertRaises(HTTPException) as context:
+            AuthService.change_password(self.user.id, ChangePasswordRequest(
+                current_password="wrong password", new_password=new_password
+            ))
+        self.assertEqual(context.exception.status_code, 401)
+
+        new_tokens = AuthService.change_password(self.user.id, ChangePasswordRequest(
+            current_password=PASSWORD, new_password=new_password
+        ))
+        self.assert_revoked(tokens)
+        self.assertEqual(self.authenticate(new_tokens.access_token).id, self.user.id)
+        self.login(new_password)
+
+    def test_packed_accounts(self):
+        """Accounts are unpacked as they were packed, including missing values"""
+        for account in (
+            UserAccount(id=1, username="user", role="admin", salt=str(uuid.uuid4())),
+            UserAccount(id=2 ** 40, username="пользователь", role="user", salt=None),
+            UserAccount.model_construct(id=3, username=None, role=None, salt=""),
+        ):
+            with self.subTest(account=account):
+                packed = AuthService._pack_account(account)  # pylint: disable=protected-access
+                self.assertEqual(
+                    AuthService._unpack_account(packed),  # pylint: disable=protected-access
+                    account
+                )
+
+    def test_account_cache(self):
+        """Accounts are loaded once and then served from Redis"""
+        other = create_user()
+        self.addCleanup(other.delete_instance, recursive=True)
+        redis.delete(f"account:{other.id}")
+        hits, misses = account_cache_hits.value, account_cache_misses.value
+
+        # pylint: disable=protected-access
+        account = AuthService._get_account(self.user.id)
+        self.assertEqual((account.id, account.username), (self.user.id, self.username))
+        self.assertEqual(AuthService._get_account(self.user.id), account)
+        self.assertEqual(account_cache_hits.value - hits, 1)
+        self.assertEqual(account_cache_misses.value - misses, 1)
+
+        missing_id = other.id + 1000
+        accounts = AuthService._get_accounts({self.user.id, other.id, missing_id})
+        self.assertEqual(accounts[self.user.id], account)
+        self.assertEqual(accounts[other.id].username, other.login_data.username)
+        self.assertNotIn(missing_id, accounts)
+        self.assertEqual(account_cache_hits.value - hits, 2)
+        self.assertEqual(account_cache_misses.value - misses, 3)
+
+        self.assertEqual(AuthService._get_accounts({other.id}), {other.id: accounts[other.id]})
+        self.assertEqual(account_cache_hits.value - hits, 3)
+
+    def test_validate_access_tokens(self):
+        """Batches mixing cached, uncached, repeated and invalid tokens keep their order"""
+        other = create_user()
+        self.addCleanup(other.delete_instance, recursive=True)
+        redis.delete(f"account:{other.id}")
+
+        cached = self.login()
+        self.authenticate(cached.access_token)
+        uncached = AuthService.login(LoginRequest(
+            username=other.login_data.username, password=PASSWORD
+        ))
+
+        tokens = [
+            cached.access_token, "invalid", uncached.access_token, cached.access_token,
+            uncached.refresh_token, uncached.access_token
+        ]
+        get_accounts = AuthService._get_accounts  # pylint: disable=protected-access
+        with mock.patch.object(AuthService, "_get_accounts", wraps=get_accounts) as get_accounts:
+            results = AuthService.validate_access_tokens(
+                ValidateAccessTokensRequest(access_tokens=tokens)
+            ).results
+
+        # Accounts of cached tokens are not looked up again
+        get_accounts.assert_called_once_with({other.id})
+        self.assertEqual(
+            [result.is_valid for result in results], [True, False, True, True, False, True]
+        )
+        self.assertEqual(
+            [result.account.id for result in results if result.is_valid],
+            [self.user.id, other.id, self.user.id, other.id]
+        )
+
+    def test_validate_too_many_access_tokens(self):
+        """Batches over the limit are rejected"""
+        with mock.patch("backend.app.services.auth.TOKEN_BATCH_MAX_SIZE", "2"):
+            with self.assertRaises(HTTPException) as context:
+                AuthService.validate_access_tokens(
+                    ValidateAccessTokensRequest(access_tokens=["a", "b", "c"])
+                )
+        self.assertEqual(context.exception.status_code, 413)
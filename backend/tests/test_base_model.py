@@ -0,0 +1,78 @@
+"""
+Testing dirty field tracking of the base model.
+"""
+import uuid
+import sqlite3
+import unittest
+import pendulum as pnd
+import peewee as pw
+from backend.app.models.user_login_data import UserLoginData
+from backend.app.models.user import User
+
+# Base sets pendulum timestamps, which sqlite3 cannot bind by itself
+sqlite3.register_adapter(pnd.DateTime, lambda value: value.isoformat(" "))
+
+MODELS = [User, UserLoginData]
+
+class RecordingDatabase(pw.SqliteDatabase):
+    """Records executed statements"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statements = []
+
+    def execute_sql(self, sql, params=None):
+        self.statements.append(sql)
+        return super().execute_sql(sql, params)
+
+class TestBaseModel(unittest.TestCase):
+    """
+    Testing dirty field tracking of the base model.
+    """
+    def setUp(self):
+        self.db = RecordingDatabase(":memory:")
+        self.binding = self.db.bind_ctx(MODELS)
+        self.binding.__enter__()  # pylint: disable=unnecessary-dunder-call
+        self.db.create_tables(MODELS)
+
+        self.login_data = UserLoginData.create(
+            user=User.create(registration_date=pnd.now()),
+            username="ivan",
+            email="ivan@example.com",
+            password_hash="hash",
+            auth_token_salt=str(uuid.uuid4())
+        )
+
+    def tearDown(self):
+        self.binding.__exit__(None, None, None)
+        self.db.close()
+
+    def test_only_dirty_fields_are_written(self):
+        """Updates contain only the modified columns"""
+        login_data = UserLoginData.get_by_id(self.login_data.id)
+        login_data.is_email_confirmed = True
+        self.db.statements.clear()
+        login_data.save()
+
+        self.assertEqual(len(self.db.statements), 1)
+        self.assertRegex(
+            self.db.statements[0],
+            r'^UPDATE "userlogindata" SET "updated_at" = \?, "is_email_confirmed" = \? WHERE'
+        )
+
+    def test_only_dirty_fields_are_validated(self):
+        """Invalid values loaded from the database do not block unrelated updates"""
+        UserLoginData.update(email="not an email").execute()
+
+        login_data = UserLoginData.get_by_id(self.login_data.id)
+        login_data.is_email_confirmed = True
+        login_data.save()
+
+        login_data.username = "not a valid username!"
+        with self.assertRaises(ValueError):
+            login_data.save()
+
+    def test_timestamps_are_computed_per_row(self):
+        """created_at defaults to the time the object is created"""
+        first = User(registration_date=pnd.now())
+        second = User(registration_date=pnd.now())
+        self.assertLess(first.created_at, second.created_at)
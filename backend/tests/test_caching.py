@@ -0,0 +1,54 @@
+"""
+Testing in-process caching utilities.
+"""
+import time
+import unittest
+from backend.app.utils.caching.ttl_cache import TTLCache
+
+class TestTTLCache(unittest.TestCase):
+    """
+    Testing the bounded cache with per-entry expiration.
+    """
+    def test_expiration(self):
+        """Expired entries are not returned"""
+        cache = TTLCache(10)
+        cache.set("alive", 1, time.time() + 60)
+        cache.set("expired", 2, time.time() - 1)
+
+        self.assertEqual(cache.get("alive"), 1)
+        self.assertIsNone(cache.get("expired"))
+
+    def test_lru_eviction(self):
+        """Least recently used entry is evicted when the cache is full"""
+        cache = TTLCache(2)
+        expires_at = time.time() + 60
+        cache.set("a", 1, expires_at)
+        cache.set("b", 2, expires_at)
+        cache.get("a")
+        cache.set("c", 3, expires_at)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_discard_where(self):
+        """Entries can be removed by value"""
+        cache = TTLCache(10)
+        expires_at = time.time() + 60
+        cache.set("a", 1, expires_at)
+        cache.set("b", 2, expires_at)
+
+        self.assertEqual(cache.discard_where(lambda value: value == 1), 1)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+
+    def test_discard_keys(self):
+        """Entries can be removed by key"""
+        cache = TTLCache(10)
+        expires_at = time.time() + 60
+        cache.set(("a", 1), 1, expires_at)
+        cache.set(("b", 1), 2, expires_at)
+
+        self.assertEqual(cache.discard_keys(lambda key: key[0] == "a"), 1)
+        self.assertIsNone(cache.get(("a", 1)))
+        self.assertEqual(cache.get(("b", 1)), 2)
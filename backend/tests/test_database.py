@@ -6,6 +6,7 @@ import unittest
 import uuid
 import logging
 import pendulum as pnd
+import peewee as pw
 from backend.app import config, models
 from backend.app.models.role import Role
 from backend.app.models.user_login_data import UserLoginData
@@ -88,6 +89,44 @@ class TestDatabase(unittest.TestCase):
         user.delete_instance(recursive=True)
         role.delete_instance(recursive=True)
 
+    def test_insert_with_login_data(self):
+        """Users are inserted with their role and login data, or not at all"""
+        logger.debug("Creation of the database...")
+        models.create_database()
+        role_id = Role.get(Role.name == "user").id
+
+        def login_data(username: str, email: str) -> UserLoginData:
+            return UserLoginData(
+                username=username,
+                email=email,
+                password_hash="password_hash",
+                auth_token_salt=str(uuid.uuid4())
+            )
+
+        username = f"user_{uuid.uuid4().hex[:12]}"
+        email = f"{uuid.uuid4().hex[:12]}@example.com"
+        user = User(registration_date=pnd.now())
+        User.insert_with_login_data(user, login_data(username, email), role_id)
+
+        self.assertEqual(UserRole.get(UserRole.user == user.id).role_id, role_id)
+        self.assertEqual(UserLoginData.get(UserLoginData.user == user.id).username, username)
+
+        user_count, role_count = User.select().count(), UserRole.select().count()
+        for duplicate in (
+            login_data(username, f"{uuid.uuid4().hex[:12]}@example.com"),
+            login_data(f"user_{uuid.uuid4().hex[:12]}", email)
+        ):
+            with self.subTest(username=duplicate.username, email=duplicate.email):
+                with self.assertRaises(pw.IntegrityError):
+                    User.insert_with_login_data(
+                        User(registration_date=pnd.now()), duplicate, role_id
+                    )
+                self.assertEqual(User.select().count(), user_count)
+                self.assertEqual(UserRole.select().count(), role_count)
+
+        logger.debug("Deleting tables recursively...")
+        user.delete_instance(recursive=True)
+
     def test_database_validation(self):
         """Validation attributes test"""
         logger.debug("Creation of the database...")
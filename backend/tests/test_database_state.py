@@ -0,0 +1,68 @@
+"""
+Testing connection state scoped to requests instead of threads.
+"""
+import contextvars
+import tempfile
+import threading
+import unittest
+import peewee as pw
+from backend.app.utils.database import state
+from backend.app.utils.database.state import connection_scope
+
+class TestScopedConnectionState(unittest.TestCase):
+    """
+    Testing connection state scoped to requests instead of threads.
+    """
+    def setUp(self):
+        self.file = tempfile.NamedTemporaryFile(suffix=".db")  # pylint: disable=consider-using-with
+        self.db = pw.SqliteDatabase(self.file.name, check_same_thread=False)
+        state.install(self.db)
+
+    def tearDown(self):
+        self.db.close()
+        self.file.close()
+
+    def test_scope_is_shared_across_threads(self):
+        """Threads running in the context of a scope share its connection"""
+        connections = []
+
+        def query():
+            self.db.execute_sql("SELECT 1")
+            connections.append(self.db.connection())
+
+        with connection_scope(self.db):
+            for _ in range(2):
+                context = contextvars.copy_context()
+                thread = threading.Thread(target=context.run, args=(query,))
+                thread.start()
+                thread.join()
+
+            self.assertFalse(self.db.is_closed())
+
+        self.assertIs(connections[0], connections[1])
+        self.assertTrue(self.db.is_closed())
+
+    def test_scopes_are_isolated(self):
+        """Nested scopes get their own connections"""
+        with connection_scope(self.db):
+            self.db.execute_sql("SELECT 1")
+            outer = self.db.connection()
+
+            with connection_scope(self.db):
+                self.assertTrue(self.db.is_closed())
+                self.db.execute_sql("SELECT 1")
+                self.assertIsNot(self.db.connection(), outer)
+
+            self.assertIs(self.db.connection(), outer)
+
+    def test_thread_state_outside_of_scope(self):
+        """Outside of any scope connections are bound to threads"""
+        self.db.execute_sql("SELECT 1")
+        result = []
+
+        thread = threading.Thread(target=lambda: result.append(self.db.is_closed()))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(result, [True])
+        self.assertFalse(self.db.is_closed())
@@ -0,0 +1,31 @@
+"""
+Testing password hashing in the process pool.
+"""
+import os
+import unittest
+from unittest import mock
+from concurrent.futures.process import BrokenProcessPool
+from backend.app.utils.security import hashing
+
+class TestHashingPool(unittest.TestCase):
+    """
+    Testing password hashing in the process pool.
+    """
+    def setUp(self):
+        patcher = mock.patch.object(hashing, "HASHING_POOL_WORKERS", "1")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        executor = hashing._get_executor()  # pylint: disable=protected-access
+        hashing._discard_executor(executor)  # pylint: disable=protected-access
+
+    def test_broken_pool_is_replaced(self):
+        """Hashing goes on in a new pool after a worker died"""
+        broken = hashing._get_executor()  # pylint: disable=protected-access
+        with self.assertRaises(BrokenProcessPool):
+            broken.submit(os._exit, 1).result()
+
+        hashed = hashing.hash_password("password")
+        self.assertTrue(hashing.verify_password("password", hashed))
+        self.assertIsNot(hashing._get_executor(), broken)  # pylint: disable=protected-access
@@ -0,0 +1,82 @@
+"""
+Testing the request-scoped identity map and relationship loading.
+"""
+import uuid
+import sqlite3
+import unittest
+import pendulum as pnd
+import peewee as pw
+from backend.app.models.role import Role
+from backend.app.models.user_login_data import UserLoginData
+from backend.app.models.user_profile import UserProfile
+from backend.app.models.user_role import UserRole
+from backend.app.models.user import User
+from backend.app.utils.database.identity_map import identity_scope
+
+# Base sets pendulum timestamps, which sqlite3 cannot bind by itself
+sqlite3.register_adapter(pnd.DateTime, lambda value: value.isoformat(" "))
+
+MODELS = [Role, User, UserLoginData, UserProfile, UserRole]
+
+class CountingDatabase(pw.SqliteDatabase):
+    """Counts executed queries"""
+    queries = 0
+
+    def execute_sql(self, sql, params=None):
+        self.queries += 1
+        return super().execute_sql(sql, params)
+
+class TestIdentityMap(unittest.TestCase):
+    """
+    Testing the request-scoped identity map and relationship loading.
+    """
+    def setUp(self):
+        self.db = CountingDatabase(":memory:")
+        self.binding = self.db.bind_ctx(MODELS)
+        self.binding.__enter__()  # pylint: disable=unnecessary-dunder-call
+        self.db.create_tables(MODELS)
+
+        user = User.create(registration_date=pnd.now())
+        UserRole.create(user=user, role=Role.create(name="user"))
+        UserProfile.create(user=user, name="Ivan", surname="Ivanov")
+        UserLoginData.create(
+            user=user,
+            username="ivan",
+            email="ivan@example.com",
+            password_hash="hash",
+            auth_token_salt=str(uuid.uuid4())
+        )
+        self.user_id = user.id
+        self.db.queries = 0
+
+    def tearDown(self):
+        self.binding.__exit__(None, None, None)
+        self.db.close()
+
+    def test_same_instance_within_scope(self):
+        """Rows loaded by id are loaded once per scope"""
+        with identity_scope():
+            user = User.get_by_id(self.user_id)
+            self.assertIs(User.get_by_id(str(self.user_id)), user)
+        self.assertEqual(self.db.queries, 1)
+
+        self.assertIsNot(User.get_by_id(self.user_id), user)
+
+    def test_relationships_are_loaded_once(self):
+        """Repeated relationship access does not query again"""
+        user = User.get_by_id(self.user_id)
+        self.db.queries = 0
+        for _ in range(3):
+            self.assertEqual(user.login_data.username, "ivan")
+            self.assertEqual(user.role, "user")
+        self.assertEqual(self.db.queries, 2)
+
+    def test_prefetch(self):
+        """Prefetch loads the user with all relationships in a single query"""
+        with identity_scope():
+            user = User.prefetch(self.user_id)
+            self.assertEqual(user.login_data.email, "ivan@example.com")
+            self.assertEqual(user.profile.surname, "Ivanov")
+            self.assertEqual(user.role, "user")
+            self.assertIs(User.get_by_id(self.user_id), user)
+        self.assertEqual(self.db.queries, 1)
@@ -0,0 +1,54 @@
+"""
+Testing instrumentation of SQL queries.
+"""
+import unittest
+import peewee as pw
+from backend.app.utils.database import instrumentation
+from backend.app.utils.database.instrumentation import normalize_sql, query_stats_scope
+from backend.app.utils.database.slow_queries import SlowQueryLog
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    Testing instrumentation of SQL queries.
+    """
+    def test_normalize_sql(self):
+        """Queries differing only in values normalize to the same statement"""
+        self.assertEqual(
+            normalize_sql('SELECT "t1"."id" FROM "user" AS "t1"\n  WHERE "t1"."id" IN (%s, %s, %s)'),
+            'SELECT "t1"."id" FROM "user" AS "t1" WHERE "t1"."id" IN (%s, ...)'
+        )
+        self.assertEqual(
+            normalize_sql("SELECT 1 FROM role WHERE name = 'admin' LIMIT 10"),
+            "SELECT %s FROM role WHERE name = %s LIMIT %s"
+        )
+
+    def test_queries_are_recorded_per_scope(self):
+        """Queries executed in a scope are counted per normalized statement"""
+        db = pw.SqliteDatabase(":memory:")
+        instrumentation.install(db)
+
+        with query_stats_scope() as stats:
+            for i in range(3):
+                db.execute_sql("SELECT ?", (i,))
+            db.execute_sql("SELECT 1, 2")
+        db.execute_sql("SELECT 3")
+
+        self.assertEqual(stats.count, 4)
+        self.assertEqual(stats.repeated(2), [("SELECT ?", 3)])
+        self.assertEqual(stats.repeated(3), [])
+
+    def test_slow_query_log(self):
+        """Only queries above the threshold are kept, up to the capacity"""
+        db = pw.SqliteDatabase(":memory:")
+        log = SlowQueryLog(db, threshold=0.0, sample_rate=0.0, capacity=2)
+        log.install()
+
+        for i in range(3):
+            db.execute_sql(f"SELECT {i}")
+
+        self.assertEqual([query.sql for query in log.entries()], ["SELECT 2", "SELECT 1"])
+        self.assertIsNone(log.entries()[0].plan)
+
+        log.threshold = 60.0
+        db.execute_sql("SELECT 3")
+        self.assertEqual(len(log.entries()), 2)
@@ -0,0 +1,83 @@
+"""
+Testing parsing and validation of batches of readings.
+"""
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+import numpy as np
+from backend.app.utils.validation.readings import parse_csv, parse_ndjson, from_readings
+
+MIN_TIME = datetime(2020, 1, 1)
+MAX_TIME = datetime(2025, 1, 1)
+
+class TestReadingBatches(unittest.TestCase):
+    """
+    Testing parsing and validation of batches of readings.
+    """
+    def test_parse_csv(self):
+        """Columns are matched by the header"""
+        batch = parse_csv(
+            "contamination,camera_id,taken_at\n"
+            "0.5,1,2024-01-01T10:00:00\n"
+            "0.25, 2 ,2024-02-01 00:00:00+03:00\n",
+            MIN_TIME, MAX_TIME
+        )
+        self.assertEqual(batch.camera_ids.tolist(), [1, 2])
+        self.assertEqual(batch.contamination.tolist(), [0.5, 0.25])
+        self.assertEqual(batch.taken_at[1], np.datetime64("2024-01-31T21:00:00"))
+
+    def test_parse_ndjson(self):
+        """Blank lines are skipped"""
+        batch = parse_ndjson(
+            '{"camera_id": 3, "taken_at": "2024-01-01T00:00:00", "contamination": 1}\n\n',
+            MIN_TIME, MAX_TIME
+        )
+        self.assertEqual(len(batch), 1)
+        self.assertEqual(batch.camera_ids[0], 3)
+
+    def test_invalid_rows_are_reported(self):
+        """Errors name the invalid rows"""
+        cases = [
+            "camera_id,taken_at,contamination\n1,2024-01-01,-1\n1,2024-01-02,0.1\n2,2024-01-03,x",
+            "camera_id,taken_at,contamination\n1,2030-01-01,0.1",
+            "camera_id,taken_at,contamination\n1,0001-01-01,0.1",
+            "camera_id,taken_at,contamination\n2147483648,2024-01-01,0.1",
+            "camera_id,taken_at,contamination\n1,2024-01-01",
+            "camera_id,contamination\n1,0.1"
+        ]
+        for text in cases:
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                parse_csv(text, MIN_TIME, MAX_TIME)
+
+        with self.assertRaisesRegex(ValueError, "Invalid camera_id in rows 2"):
+            parse_ndjson(
+                '{"camera_id": 1, "taken_at": "2024-01-01", "contamination": 0}\n'
+                '{"taken_at": "2024-01-01", "contamination": 0}',
+                MIN_TIME, MAX_TIME
+            )
+
+    def test_out_of_range_camera_ids(self):
+        """Ids beyond the range of int64 are invalid rows, not overflows"""
+        readings = [
+            SimpleNamespace(camera_id=1, taken_at=datetime(2024, 1, 1), contamination=0.1),
+            SimpleNamespace(camera_id=2 ** 63, taken_at=datetime(2024, 1, 1), contamination=0.1)
+        ]
+        with self.assertRaisesRegex(ValueError, "Invalid camera_id in rows 2"):
+            from_readings(readings, MIN_TIME, MAX_TIME)
+
+    def test_deduplicated(self):
+        """The last of the readings taken at the same time is kept"""
+        batch = parse_csv(
+            "camera_id,taken_at,contamination\n"
+            "2,2024-01-01,0.1\n"
+            "1,2024-01-02,0.2\n"
+            "1,2024-01-01,0.3\n"
+            "1,2024-01-02,0.4\n",
+            MIN_TIME, MAX_TIME
+        ).deduplicated()
+        self.assertEqual(batch.camera_ids.tolist(), [1, 1, 2])
+        self.assertEqual(batch.contamination.tolist(), [0.3, 0.4, 0.1])
+        self.assertEqual(
+            batch.to_csv().getvalue().splitlines()[0],
+            "1,2024-01-01T00:00:00.000000,0.3"
+        )
@@ -0,0 +1,207 @@
+"""
+Testing storage of contamination readings in the database.
+"""
+import time
+import threading
+import unittest
+import logging
+from datetime import datetime
+from unittest import mock
+import psycopg2
+from psycopg2 import errors
+from fastapi import HTTPException
+from backend.app import config, models
+from backend.app.models.base import db
+from backend.app.models.camera import Camera
+from backend.app.models.camera_reading import CameraReading
+from backend.app.models.camera_reading_rollup import CameraReadingHourly, CameraReadingDaily
+from backend.app.services.reading import ReadingService
+from backend.app.services.analytics import AnalyticsService
+from backend.app.utils.validation.readings import parse_csv
+
+config.ENVIRONMENT_TYPE = "development"
+config.POSTGRES_DB = "automatic_unittest_database"
+
+logger = logging.getLogger(__name__)
+
+def readings(camera_id: int, *rows: tuple[str, float]):
+    """Batch of readings of a camera"""
+    return parse_csv(
+        "camera_id,taken_at,contamination\n" +
+        "".join(f"{camera_id},{taken_at},{contamination}\n" for taken_at, contamination in rows),
+        datetime.min,
+        datetime.max
+    )
+
+def store(batch) -> int:
+    """Stores a batch like the import endpoints do"""
+    return ReadingService._store(batch)  # pylint: disable=protected-access
+
+class TestReadingStorage(unittest.TestCase):
+    """
+    Testing storage of contamination readings in the database.
+    """
+    def setUp(self):
+        logger.debug("Creation of the database...")
+        models.create_database()
+        self.camera_id, self.other_camera_id = (Camera.insert(
+            name=f"Storage test camera {number}",
+            contamination=0,
+            date=datetime(2000, 1, 1)
+        ).execute() for number in (1, 2))
+
+    def tearDown(self):
+        Camera.delete().where(Camera.id.in_([self.camera_id, self.other_camera_id])).execute()
+
+    def test_partitions_are_created(self):
+        """Readings create the partitions of their months"""
+        store(readings(self.camera_id, ("2011-01-31 23:00:00", 0.1), ("2011-02-01", 0.2)))
+
+        partitions = [name for (name,) in db.execute_sql(
+            "SELECT relname FROM pg_class WHERE relname IN (%s, %s)",
+            ("camerareading_p201101", "camerareading_p201102")
+        ).fetchall()]
+        self.assertEqual(sorted(partitions), ["camerareading_p201101", "camerareading_p201102"])
+
+    def test_missing_partition_is_created_again(self):
+        """A partition dropped behind the back of the cache is created on retry"""
+        store(readings(self.camera_id, ("2011-03-01", 0.1)))
+        db.execute_sql('DROP TABLE "camerareading_p201103"')
+
+        self.assertEqual(store(readings(self.camera_id, ("2011-03-02", 0.2))), 1)
+        self.assertEqual(
+            CameraReading.select().where(CameraReading.camera == self.camera_id).count(), 1
+        )
+
+    def test_unknown_camera(self):
+        """Readings of a missing camera are rejected as not found"""
+        with self.assertRaises(HTTPException) as context:
+            store(readings(self.camera_id + 1000, ("2011-04-01", 0.1)))
+        self.assertEqual(context.exception.status_code, 404)
+
+    def test_series_larger_than_page(self):
+        """Series of readings are not limited by the page size of readings"""
+        store(readings(
+            self.camera_id, ("2011-05-01 10:00", 0.1), ("2011-05-01 10:10", 0.2),
+            ("2011-05-01 10:20", 0.3)
+        ))
+        with mock.patch("backend.app.services.reading.READINGS_PAGE_MAX_SIZE", "2"):
+            series = ReadingService.get_series(
+                self.camera_id, datetime(2011, 5, 1, 10), datetime(2011, 5, 1, 11), 5
+            )
+        self.assertEqual(series.resolution, "reading")
+        self.assertEqual([point.mean for point in series.points], [0.1, 0.2, 0.3])
+
+    def test_rollups_of_repeated_ingestion(self):
+        """Ingesting into the same hour twice aggregates all readings of the hour once"""
+        store(readings(self.camera_id, ("2011-06-01 10:00", 0.1), ("2011-06-01 10:30", 0.3)))
+        store(readings(self.camera_id, ("2011-06-01 10:30", 0.5), ("2011-06-01 10:45", 0.2)))
+
+        for model, bucket in ((CameraReadingHourly, datetime(2011, 6, 1, 10)),
+            (CameraReadingDaily, datetime(2011, 6, 1))):
+            with self.subTest(model=model.__name__):
+                rollup = model.get(model.camera == self.camera_id)
+                self.assertEqual(rollup.bucket, bucket)
+                self.assertEqual(rollup.readings, 3)
+                self.assertAlmostEqual(rollup.total, 0.8, places=5)
+                self.assertAlmostEqual(rollup.minimum, 0.1, places=5)
+                self.assertAlmostEqual(rollup.maximum, 0.5, places=5)
+                self.assertEqual(rollup.last_at, datetime(2011, 6, 1, 10, 45))
+                self.assertAlmostEqual(rollup.last, 0.2, places=5)
+
+        start, end = datetime(2011, 6, 1, 10), datetime(2011, 6, 1, 11)
+        series = ReadingService.get_series(self.camera_id, start, end, 3)
+        self.assertEqual(series.resolution, "reading")
+        self.assertEqual(len(series.points), 3)
+
+        series = ReadingService.get_series(self.camera_id, start, end, 2)
+        self.assertEqual(series.resolution, "hour")
+        self.assertEqual(series.points[0].readings, 3)
+        self.assertAlmostEqual(series.points[0].mean, 0.8 / 3, places=5)
+
+    def test_series_resolution(self):
+        """Days are used when the hours of the period do not fit"""
+        store(readings(self.camera_id, ("2011-07-01 10:00", 0.1), ("2011-07-02 10:00", 0.3)))
+
+        series = ReadingService.get_series(
+            self.camera_id, datetime(2011, 7, 1), datetime(2011, 7, 4), 10
+        )
+        self.assertEqual(series.resolution, "day")
+        self.assertEqual([point.start for point in series.points],
+            [datetime(2011, 7, 1), datetime(2011, 7, 2)])
+
+        with self.assertRaises(HTTPException) as context:
+            ReadingService.get_series(
+                self.camera_id, datetime(2011, 7, 1), datetime(2011, 7, 4), 2
+            )
+        self.assertEqual(context.exception.status_code, 400)
+
+    def test_snapshot(self):
+        """Cameras keep their latest reading, older readings leave them untouched"""
+        store(readings(self.camera_id, ("2011-08-02", 0.4)))
+        store(readings(self.camera_id, ("2011-08-01", 0.9)))
+
+        camera = Camera.get_by_id(self.camera_id)
+        self.assertEqual(camera.date, datetime(2011, 8, 2))
+        self.assertAlmostEqual(camera.contamination, 0.4, places=5)
+
+    def test_cameras_are_locked_in_order(self):
+        """Cameras are locked by id whatever the order of the readings"""
+        first, second = sorted((self.camera_id, self.other_camera_id))
+        # Creating the partition would wait for the lock on the cameras as well
+        store(readings(first, ("2011-09-01", 0.1)))
+
+        blocker = psycopg2.connect(database=db.database, **db.connect_params)
+        try:
+            blocker.cursor().execute(
+                'SELECT 1 FROM "camera" WHERE "id" = %s FOR NO KEY UPDATE', (second,)
+            )
+
+            stored = []
+            def ingest():
+                stored.append(store(parse_csv(
+                    "camera_id,taken_at,contamination\n"
+                    f"{second},2011-09-02,0.2\n{first},2011-09-02,0.3\n",
+                    datetime.min, datetime.max
+                )))
+                db.close()
+            thread = threading.Thread(target=ingest)
+            thread.start()
+
+            # The ingestion waits for the second camera holding the lock of the first
+            for _ in range(100):
+                with blocker.cursor() as cursor:
+                    cursor.execute("SELECT 1 FROM pg_locks WHERE NOT granted")
+                    if cursor.fetchone():
+                        break
+                time.sleep(0.05)
+            with self.assertRaises(errors.LockNotAvailable):
+                blocker.cursor().execute(
+                    'SELECT 1 FROM "camera" WHERE "id" = %s FOR NO KEY UPDATE NOWAIT', (first,)
+                )
+        finally:
+            blocker.rollback()
+            blocker.close()
+        thread.join()
+        self.assertEqual(stored, [2])
+
+    def test_late_readings_evict_cached_buckets(self):
+        """Finished buckets cached by analytics are recomputed after late readings"""
+        store(readings(self.camera_id, ("2011-10-01 10:00", 0.1)))
+        start, end = datetime(2011, 10, 1), datetime(2011, 10, 2)
+        for camera_id in (self.camera_id, None):
+            AnalyticsService.get_contamination(start, end, 3600, camera_id)
+
+        store(readings(self.camera_id, ("2011-10-01 10:30", 0.3)))
+        for camera_id in (self.camera_id, None):
+            with self.subTest(camera_id=camera_id):
+                analytics = AnalyticsService.get_contamination(start, end, 3600, camera_id)
+                self.assertEqual(analytics.buckets[10].count, 2)
+
+    def test_bucket_size_is_bounded(self):
+        """Buckets too long to compute their start are rejected"""
+        with self.assertRaises(HTTPException) as context:
+            AnalyticsService.get_contamination(
+                datetime(2011, 1, 1), datetime(2011, 1, 2), 10 ** 15, self.camera_id
+            )
+        self.assertEqual(context.exception.status_code, 400)
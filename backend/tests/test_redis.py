@@ -0,0 +1,33 @@
+"""
+Testing the Redis service.
+"""
+import uuid
+import queue
+import threading
+import unittest
+from unittest import mock
+import redis as redis_client
+from backend.app.services import redis
+from backend.app.services.redis import RedisService
+
+class TestRedisSubscription(unittest.TestCase):
+    """
+    Testing subscriptions to Redis channels.
+    """
+    def test_resubscribes_after_failure(self):
+        """Failed subscriptions are restored and keep delivering messages"""
+        channel = f"test:{uuid.uuid4().hex}"
+        received, reconnected = queue.Queue(), threading.Event()
+
+        failing = mock.Mock()
+        failing.subscribe.side_effect = redis_client.ConnectionError("Connection lost")
+        pubsubs = iter([failing])
+        create_pubsub = redis.client.pubsub
+        with mock.patch.object(redis.client, "pubsub",
+            side_effect=lambda **kwargs: next(pubsubs, None) or create_pubsub(**kwargs)):
+            RedisService.subscribe(channel, received.put, reconnected.set)
+            self.assertTrue(reconnected.wait(5))
+
+        failing.close.assert_called_once()
+        RedisService.publish(channel, "message")
+        self.assertEqual(received.get(timeout=5), "message")
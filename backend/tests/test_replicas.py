@@ -0,0 +1,60 @@
+"""
+Testing routing of read-only queries to replicas.
+"""
+import unittest
+import peewee as pw
+from backend.app.utils.database.replicas import ReplicaRouter, read_only, routing_scope
+
+class Item(pw.Model):
+    """Model stored on both databases"""
+    name = pw.CharField()
+
+class TestReplicaRouter(unittest.TestCase):
+    """
+    Testing routing of read-only queries to replicas.
+    """
+    def setUp(self):
+        self.primary = pw.SqliteDatabase(":memory:")
+        self.replica = pw.SqliteDatabase(":memory:")
+        for database, name in ((self.primary, "primary"), (self.replica, "replica")):
+            with database.bind_ctx([Item]):
+                database.create_tables([Item])
+                Item.create(name=name)
+
+        self.binding = self.primary.bind_ctx([Item])
+        self.binding.__enter__()  # pylint: disable=unnecessary-dunder-call
+        self.router = ReplicaRouter(
+            self.primary, [self.replica],
+            max_lag=5, check_interval=5, metrics_prefix=f"test_{id(self)}"
+        )
+        self.router.install()
+        # sqlite has no replication functions, the replica is trusted as is
+        self.router._healthy = [self.replica]  # pylint: disable=protected-access
+
+    def tearDown(self):
+        self.binding.__exit__(None, None, None)
+
+    @read_only
+    def read_name(self) -> str:
+        """Reads the name from whichever database the query is routed to"""
+        return Item.select(Item.name).scalar()
+
+    def test_read_only_queries_use_replica(self):
+        """Only reads of read_only functions are routed to replicas"""
+        self.assertEqual(self.read_name(), "replica")
+        self.assertEqual(Item.select(Item.name).scalar(), "primary")
+
+    def test_request_is_pinned_after_write(self):
+        """Reads after a write in the same scope go to the primary"""
+        with routing_scope():
+            self.assertEqual(self.read_name(), "replica")
+            Item.update(name="updated").execute()
+            self.assertEqual(self.read_name(), "updated")
+
+        self.assertEqual(self.read_name(), "replica")
+
+    def test_fallback_to_primary(self):
+        """Failing replicas are skipped until they are checked again"""
+        self.replica.execute_sql("DROP TABLE item")
+        self.assertEqual(self.read_name(), "primary")
+        self.assertEqual(self.router._healthy, [])  # pylint: disable=protected-access
@@ -0,0 +1,50 @@
+"""
+Testing lookups of roles kept in memory.
+"""
+import uuid
+import unittest
+from unittest import mock
+from fastapi import HTTPException
+from backend.app import config, models
+from backend.app.models.role import Role
+from backend.app.services.role import RoleService
+
+config.ENVIRONMENT_TYPE = "development"
+config.POSTGRES_DB = "automatic_unittest_database"
+
+class TestRoleService(unittest.TestCase):
+    """
+    Testing lookups of roles kept in memory.
+    """
+    def setUp(self):
+        models.create_database()
+        RoleService.reload()
+        self.reload = mock.patch.object(RoleService, "reload", wraps=RoleService.reload).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_known_roles(self):
+        """Known roles are served from memory"""
+        role_id = RoleService.get_id("user")
+        self.assertEqual(RoleService.get_name(role_id), "user")
+        self.reload.assert_not_called()
+
+    def test_new_role_is_loaded(self):
+        """Roles created after the last reload are loaded on their first lookup"""
+        role = Role.create(name=f"role_{uuid.uuid4().hex[:12]}")
+        self.addCleanup(role.delete_instance)
+
+        self.assertEqual(RoleService.get_id(role.name), role.id)
+        self.assertEqual(RoleService.get_name(role.id), role.name)
+        self.reload.assert_called_once()
+
+    def test_unknown_roles(self):
+        """Unknown roles are rejected as not found and reload the roles only once"""
+        name = f"role_{uuid.uuid4().hex[:12]}"
+        for lookup, key in ((RoleService.get_id, name), (RoleService.get_name, -1)):
+            with self.subTest(lookup=lookup.__name__):
+                self.reload.reset_mock()
+                for _ in range(3):
+                    with self.assertRaises(HTTPException) as context:
+                        lookup(key)
+                    self.assertEqual(context.exception.status_code, 404)
+                self.reload.assert_called_once()
@@ -0,0 +1,35 @@
+"""
+Testing statistics merged from buckets.
+"""
+import unittest
+import numpy as np
+from backend.app.utils.statistics import QUANTILES, BucketStats, merge
+
+def bucket(values: np.ndarray) -> BucketStats:
+    """Statistics of a bucket as Postgres computes them"""
+    return BucketStats(len(values), float(values.sum()), np.quantile(values, QUANTILES))
+
+class TestStatistics(unittest.TestCase):
+    """
+    Testing statistics merged from buckets.
+    """
+    def test_merge(self):
+        """Count, sum and extremes are exact, quantiles are close"""
+        generator = np.random.default_rng(0)
+        parts = [generator.random(1000) * scale for scale in (1, 2, 5)]
+        merged = merge([bucket(part) for part in parts] + [BucketStats()])
+        values = np.concatenate(parts)
+
+        self.assertEqual(merged.count, len(values))
+        self.assertAlmostEqual(merged.mean, values.mean())
+        self.assertEqual(merged.sketch[0], values.min())
+        self.assertEqual(merged.sketch[-1], values.max())
+        for q in (0.5, 0.9, 0.99):
+            self.assertAlmostEqual(merged.quantile(q), np.quantile(values, q), delta=0.05)
+
+    def test_merge_empty(self):
+        """Buckets without values have no statistics"""
+        merged = merge([BucketStats(), BucketStats()])
+        self.assertEqual(merged.count, 0)
+        self.assertIsNone(merged.mean)
+        self.assertIsNone(merged.quantile(0.5))
@@ -0,0 +1,75 @@
+"""
+Testing throttling of login attempts.
+"""
+import uuid
+import unittest
+from unittest import mock
+from fastapi import HTTPException
+from backend.app.services.throttle import ThrottleService
+
+class TestLoginThrottle(unittest.TestCase):
+    """
+    Testing throttling of login attempts.
+    """
+    def setUp(self):
+        self.username = f"test_{uuid.uuid4().hex[:12]}"
+        self.client_ip = f"test-{uuid.uuid4().hex}"
+        self.now = 1_000_000.0
+
+        for name, value in (
+            ("time", mock.Mock(time=lambda: self.now)),
+            ("LOGIN_THROTTLE_WINDOW_SECONDS", "60"),
+            ("LOGIN_THROTTLE_USERNAME_LIMIT", "3"),
+            ("LOGIN_THROTTLE_IP_LIMIT", "5")
+        ):
+            patcher = mock.patch(f"backend.app.services.throttle.{name}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def assert_throttled(self, username: str, retry_after: int):
+        """The next attempt is rejected with the given Retry-After"""
+        with self.assertRaises(HTTPException) as context:
+            ThrottleService.check_login(username, self.client_ip)
+        self.assertEqual(context.exception.status_code, 429)
+        self.assertEqual(context.exception.headers["Retry-After"], str(retry_after))
+
+    def test_username_limit(self):
+        """Attempts over the limit of a username are rejected until the window slides"""
+        for seconds in range(3):
+            self.now += seconds
+            ThrottleService.check_login(self.username, self.client_ip)
+
+        self.now += 10
+        # The oldest attempt leaves the window 60 seconds after it was made
+        self.assert_throttled(self.username, 47)
+
+        self.now += 47
+        ThrottleService.check_login(self.username, self.client_ip)
+        self.assert_throttled(self.username, 1)
+
+    def test_ip_limit(self):
+        """Attempts over the limit of a client IP are rejected whatever the username"""
+        for number in range(5):
+            ThrottleService.check_login(f"{self.username}_{number}", self.client_ip)
+        self.assert_throttled(f"{self.username}_5", 60)
+
+        # Other clients are unaffected
+        ThrottleService.check_login(f"{self.username}_5", f"{self.client_ip}-other")
+
+    def test_rejected_attempts_are_not_recorded(self):
+        """Rejected attempts do not extend the throttling"""
+        for _ in range(3):
+            ThrottleService.check_login(self.username, self.client_ip)
+        for _ in range(3):
+            self.assert_throttled(self.username, 60)
+
+        self.now += 60
+        for _ in range(3):
+            ThrottleService.check_login(self.username, self.client_ip)
+
+    def test_reset(self):
+        """Resetting the username clears its attempts"""
+        for _ in range(3):
+            ThrottleService.check_login(self.username, self.client_ip)
+        ThrottleService.reset_login(self.username)
+        ThrottleService.check_login(self.username, self.client_ip)